@@ -98,9 +98,108 @@ CREATE INDEX IF NOT EXISTS idx_campaigns_creator_id ON campaigns(creator_id);
 CREATE INDEX IF NOT EXISTS idx_campaigns_status ON campaigns(status);
 CREATE INDEX IF NOT EXISTS idx_campaigns_category ON campaigns(category);
 CREATE INDEX IF NOT EXISTS idx_ai_analyses_campaign_id ON ai_analyses(campaign_id);
-CREATE INDEX IF NOT EXISTS idx_comments_campaign_id ON comments(campaign_id);
+CREATE INDEX IF NOT EXISTS idx_ai_analyses_created_at ON ai_analyses(created_at);
+-- Newest-first comment pages for a campaign; also covers campaign_id-only filters
+CREATE INDEX IF NOT EXISTS idx_comments_campaign_created ON comments(campaign_id, created_at DESC);
+DROP INDEX IF EXISTS idx_comments_campaign_id;
 CREATE INDEX IF NOT EXISTS idx_pledges_campaign_id ON pledges(campaign_id);
 CREATE INDEX IF NOT EXISTS idx_pledges_user_id ON pledges(user_id);
+-- Home feed rebuilds read the paid pledges of the last velocity window
+CREATE INDEX IF NOT EXISTS idx_pledges_paid_created ON pledges(created_at DESC) WHERE payment_status = 'paid';
 CREATE INDEX IF NOT EXISTS idx_payment_transactions_campaign_id ON payment_transactions(campaign_id);
 CREATE INDEX IF NOT EXISTS idx_payment_transactions_user_id ON payment_transactions(user_id);
-CREATE INDEX IF NOT EXISTS idx_chat_messages_session_id ON chat_messages(session_id);
+-- Serves chat context lookups (latest N turns of a session); also covers session_id-only filters
+CREATE INDEX IF NOT EXISTS idx_chat_messages_session_created ON chat_messages(session_id, created_at DESC);
+DROP INDEX IF EXISTS idx_chat_messages_session_id;
+
+-- Gemini Usage Rollup Table (one row per day, endpoint and user; '' for anonymous/background calls)
+CREATE TABLE IF NOT EXISTS gemini_usage_daily (
+    day DATE NOT NULL,
+    endpoint VARCHAR(100) NOT NULL,
+    user_id VARCHAR(255) NOT NULL DEFAULT '',
+    calls INTEGER NOT NULL DEFAULT 0,
+    cache_hits INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens BIGINT NOT NULL DEFAULT 0,
+    completion_tokens BIGINT NOT NULL DEFAULT 0,
+    cached_tokens BIGINT NOT NULL DEFAULT 0,
+    latency_ms BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, endpoint, user_id)
+);
+
+-- Adds each worker's deltas to the rollup, so concurrent flushes never overwrite each other
+CREATE OR REPLACE FUNCTION record_gemini_usage(rows JSONB) RETURNS VOID LANGUAGE sql AS $$
+    INSERT INTO gemini_usage_daily AS u
+        (day, endpoint, user_id, calls, cache_hits, errors, prompt_tokens, completion_tokens, cached_tokens, latency_ms)
+    SELECT day, endpoint, user_id, calls, cache_hits, errors, prompt_tokens, completion_tokens, cached_tokens, latency_ms
+    FROM jsonb_to_recordset(rows) AS r(day DATE, endpoint VARCHAR, user_id VARCHAR, calls INTEGER, cache_hits INTEGER,
+        errors INTEGER, prompt_tokens BIGINT, completion_tokens BIGINT, cached_tokens BIGINT, latency_ms BIGINT)
+    ON CONFLICT (day, endpoint, user_id) DO UPDATE SET
+        calls = u.calls + EXCLUDED.calls,
+        cache_hits = u.cache_hits + EXCLUDED.cache_hits,
+        errors = u.errors + EXCLUDED.errors,
+        prompt_tokens = u.prompt_tokens + EXCLUDED.prompt_tokens,
+        completion_tokens = u.completion_tokens + EXCLUDED.completion_tokens,
+        cached_tokens = u.cached_tokens + EXCLUDED.cached_tokens,
+        latency_ms = u.latency_ms + EXCLUDED.latency_ms;
+$$;
+
+-- Totals per endpoint, user_id or day since a date, most expensive first; grouped here so the admin
+-- report never reads raw rollup rows past PostgREST's max-rows
+CREATE OR REPLACE FUNCTION gemini_usage_totals(since DATE, group_key TEXT, input_price DOUBLE PRECISION,
+    output_price DOUBLE PRECISION, max_groups INTEGER)
+RETURNS TABLE (group_value TEXT, calls BIGINT, cache_hits BIGINT, errors BIGINT, prompt_tokens BIGINT,
+    completion_tokens BIGINT, cached_tokens BIGINT, latency_ms BIGINT)
+LANGUAGE sql STABLE AS $$
+    SELECT g.group_value, SUM(u.calls)::BIGINT, SUM(u.cache_hits)::BIGINT, SUM(u.errors)::BIGINT,
+        SUM(u.prompt_tokens)::BIGINT, SUM(u.completion_tokens)::BIGINT, SUM(u.cached_tokens)::BIGINT,
+        SUM(u.latency_ms)::BIGINT
+    FROM gemini_usage_daily AS u
+    CROSS JOIN LATERAL (SELECT CASE group_key WHEN 'endpoint' THEN u.endpoint WHEN 'user_id' THEN u.user_id
+        ELSE u.day::TEXT END AS group_value) AS g
+    WHERE u.day >= since
+    GROUP BY g.group_value
+    ORDER BY SUM(u.prompt_tokens) * input_price + SUM(u.completion_tokens) * output_price DESC,
+        SUM(u.prompt_tokens) + SUM(u.completion_tokens) DESC
+    LIMIT max_groups;
+$$;
+
+-- Listing scores, written in batches by campaign_scores.py; 0 until a campaign's first scoring run
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS funded_ratio DOUBLE PRECISION NOT NULL DEFAULT 0;
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS momentum_score DOUBLE PRECISION NOT NULL DEFAULT 0;
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS success_score DOUBLE PRECISION NOT NULL DEFAULT 0;
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS ends_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS scored_at TIMESTAMP WITH TIME ZONE;
+
+-- ends_at is set on every write, so sort=ending lists a campaign before its first scoring run
+CREATE OR REPLACE FUNCTION set_campaign_ends_at() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.ends_at := NEW.created_at + make_interval(days => COALESCE(NEW.duration_days, 30));
+    RETURN NEW;
+END;
+$$;
+DROP TRIGGER IF EXISTS campaigns_set_ends_at ON campaigns;
+CREATE TRIGGER campaigns_set_ends_at BEFORE INSERT OR UPDATE OF created_at, duration_days ON campaigns
+    FOR EACH ROW EXECUTE FUNCTION set_campaign_ends_at();
+UPDATE campaigns SET ends_at = created_at + make_interval(days => COALESCE(duration_days, 30)) WHERE ends_at IS NULL;
+
+-- One per ?sort= on the active listing, so a sorted page is an index scan instead of a full sort
+CREATE INDEX IF NOT EXISTS idx_campaigns_active_newest ON campaigns(created_at DESC) WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS idx_campaigns_active_funded ON campaigns(funded_ratio DESC) WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS idx_campaigns_active_momentum ON campaigns(momentum_score DESC) WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS idx_campaigns_active_success ON campaigns(success_score DESC) WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS idx_campaigns_active_ending ON campaigns(ends_at) WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS idx_campaigns_active_scored_at ON campaigns(scored_at) WHERE status = 'active';
+
+-- Applies a batch of score rows in one statement; success_score is kept when a batch omits it
+CREATE OR REPLACE FUNCTION apply_campaign_scores(scores JSONB) RETURNS VOID LANGUAGE sql AS $$
+    UPDATE campaigns AS c SET
+        funded_ratio = s.funded_ratio,
+        momentum_score = s.momentum_score,
+        success_score = COALESCE(s.success_score, c.success_score),
+        ends_at = s.ends_at,
+        scored_at = s.scored_at
+    FROM jsonb_to_recordset(scores) AS s(id UUID, funded_ratio DOUBLE PRECISION, momentum_score DOUBLE PRECISION,
+        success_score DOUBLE PRECISION, ends_at TIMESTAMP WITH TIME ZONE, scored_at TIMESTAMP WITH TIME ZONE)
+    WHERE c.id = s.id;
+$$;
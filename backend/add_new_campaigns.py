@@ -5,6 +5,7 @@ import uuid
 from supabase import create_client, Client
 from dotenv import load_dotenv
 from pathlib import Path
+from sb_bulk import insert_many
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -138,10 +139,9 @@ async def add_campaigns():
         except Exception as e:
             print(f"User creation note: {e}")
         
-        # Insert new campaigns
-        created_count = 0
-        for campaign_data in NEW_CAMPAIGNS:
-            campaign = {
+        # Insert new campaigns in one bulk request
+        campaigns = [
+            {
                 "id": str(uuid.uuid4()),
                 "title": campaign_data["title"],
                 "description": campaign_data["description"],
@@ -158,13 +158,17 @@ async def add_campaigns():
                 "reward_tiers": [],
                 "created_at": datetime.now(timezone.utc).isoformat()
             }
-            
-            try:
-                result = supabase.table("campaigns").insert(campaign).execute()
+            for campaign_data in NEW_CAMPAIGNS
+        ]
+        
+        created_count = 0
+        try:
+            insert_many(supabase, "campaigns", campaigns)
+            created_count = len(campaigns)
+            for campaign in campaigns:
                 print(f"✓ Created campaign: {campaign['title']}")
-                created_count += 1
-            except Exception as e:
-                print(f"✗ Error creating campaign '{campaign['title']}': {e}")
+        except Exception as e:
+            print(f"✗ Error creating campaigns: {e}")
         
         print(f"\n{'='*60}")
         print(f"Successfully created {created_count} out of {len(NEW_CAMPAIGNS)} new campaigns!")
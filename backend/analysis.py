@@ -0,0 +1,228 @@
+"""
+AI success analyses for campaigns and the scheduler that keeps them fresh.
+
+An analysis is generated once and then served from ai_analyses, so it goes
+stale as a campaign changes. The scheduler queues a campaign for regeneration
+when something material happens:
+
+- funding crosses one of FUNDING_THRESHOLDS (fraction of the goal)
+- its title, description, category or goal is edited
+- its analysis is older than max_age_days (found by a periodic sweep)
+
+Queued campaigns are regenerated in the background, batch_size per interval
+with `concurrency` Gemini calls at a time. Each call takes a token from the
+shared AI quota and a slot under its in-flight cap, so refreshes back off when
+users need the capacity.
+Readers keep getting the stored row with a single lookup.
+
+The queue lives in the worker that saw the change. Every worker sweeps for
+old analyses, but re-reads a row before regenerating it, so a row another
+worker just refreshed is skipped.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+
+from core import ai_limiter, gemini_generate, sb_find, sb_find_one, sb_insert, sb_update
+from metrics import ANALYSIS_REFRESHES, ANALYSIS_REFRESH_PENDING
+from models import AIAnalysis
+from success_model import success_model
+
+logger = logging.getLogger("analysis")
+
+FUNDING_THRESHOLDS = (0.25, 0.5, 0.75, 1.0, 1.5, 2.0)
+MATERIAL_FIELDS = ("title", "description", "category", "goal_amount")
+DEFAULT_ANALYSIS_TEXT = "This campaign shows moderate potential for success based on its category and goals."
+
+
+def parse_analysis_response(ai_response: str):
+    """Extract (probability, analysis_text) from a 'Percentage: XX / Analysis: ...' reply"""
+    probability = 75.0  # Default
+    analysis_text = DEFAULT_ANALYSIS_TEXT
+
+    try:
+        lines = ai_response.split('\n')
+        for idx, line in enumerate(lines):
+            if 'percentage:' in line.lower():
+                prob_str = ''.join(filter(lambda x: x.isdigit() or x == '.', line))
+                if prob_str:
+                    probability = float(prob_str)
+                    probability = max(0, min(100, probability))
+            elif 'analysis:' in line.lower():
+                # Take the rest of the lines as well
+                analysis_text = ' '.join(lines[idx:]).replace('Analysis:', '').strip()
+                break
+    except Exception as e:
+        logging.error(f"Error parsing AI response: {e}")
+
+    return probability, analysis_text
+
+
+async def generate_analysis(campaign: dict, endpoint: str, user_id: Optional[str] = None):
+    """(probability, analysis_text) for a campaign, from its content and current traction"""
+    details = f"""Title: {campaign.get('title', '')}
+Category: {campaign.get('category', '')}
+Goal Amount: ₹{campaign.get('goal_amount', 0)}
+Current Raised: ₹{campaign.get('raised_amount', 0)}
+Backers Count: {campaign.get('backers_count', 0)}
+Description: {campaign.get('description', '')}"""
+
+    if success_model is not None:
+        # The number comes from the local model; Gemini only explains it
+        probability = success_model.score(campaign)
+        narrative_prompt = f"""Our model, trained on past campaigns, puts this crowdfunding campaign's success probability at {probability:.0f}%.
+
+{details}
+
+In 2-3 sentences, explain what in the category, goal amount, description quality and current traction supports or limits that estimate. Do not state a different percentage.
+Respond ONLY with the analysis text."""
+        response = await gemini_generate(endpoint, narrative_prompt, user_id)
+        analysis_text = response.text.strip().removeprefix("Analysis:").strip()
+        return probability, analysis_text or DEFAULT_ANALYSIS_TEXT
+
+    analysis_prompt = f"""Analyze this crowdfunding campaign and predict its success probability.
+
+{details}
+
+Based on the category, goal amount, description quality, and current traction, provide:
+1. A success probability percentage (between 0-100)
+2. A brief 2-3 sentence analysis
+
+Respond ONLY in this format:
+Percentage: XX
+Analysis: Your 2-3 sentence analysis here."""
+
+    response = await gemini_generate(endpoint, analysis_prompt, user_id)
+    return parse_analysis_response(response.text.strip())
+
+
+def funding_stage(raised: float, goal: float) -> int:
+    """How many FUNDING_THRESHOLDS the campaign has passed"""
+    if not goal or goal <= 0:
+        return 0
+    ratio = (raised or 0) / goal
+    return sum(1 for threshold in FUNDING_THRESHOLDS if ratio >= threshold)
+
+
+class AnalysisRefreshScheduler:
+    def __init__(self, batch_size: int = 10, interval_seconds: float = 60, max_age_days: float = 7,
+                 concurrency: int = 2):
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.max_age = timedelta(days=max_age_days)
+        self.concurrency = concurrency
+        self._pending: Dict[str, str] = {}  # campaign_id -> reason, in arrival order
+        self._sweep_cursor: Optional[str] = None  # created_at of the last row swept
+
+    # ---- change tracking ----
+
+    def mark(self, campaign_id: str, reason: str) -> None:
+        self._pending.setdefault(campaign_id, reason)
+        ANALYSIS_REFRESH_PENDING.set(len(self._pending))
+
+    def note_update(self, campaign_id: str, before: dict, changes: dict) -> None:
+        """Queue a refresh when an edit touched the fields the analysis is based on"""
+        if any(field in changes and changes[field] != before.get(field) for field in MATERIAL_FIELDS):
+            self.mark(campaign_id, "edit")
+
+    def note_funding(self, campaign_id: str, raised_before: float, raised_after: float, goal: float) -> None:
+        """Queue a refresh when a pledge moved the campaign past a funding threshold"""
+        if funding_stage(raised_after, goal) != funding_stage(raised_before, goal):
+            self.mark(campaign_id, "funding")
+
+    # ---- background work ----
+
+    async def sweep_stale(self) -> None:
+        """Queue the next batch_size analyses past max_age, oldest first"""
+        cutoff = (datetime.now(timezone.utc) - self.max_age).isoformat()
+        window = {"$lt": cutoff}
+        if self._sweep_cursor:
+            # Pages through old rows, so ones that stay old (inactive campaigns) don't block the rest
+            window["$gt"] = self._sweep_cursor
+        rows = await sb_find("ai_analyses", {"created_at": window}, self.batch_size,
+                             columns="campaign_id,created_at", order_by="created_at")
+        self._sweep_cursor = rows[-1]["created_at"] if len(rows) == self.batch_size else None
+        for row in rows:
+            self.mark(row["campaign_id"], "age")
+
+    async def run_once(self) -> int:
+        """Refresh up to batch_size queued campaigns; returns how many were regenerated"""
+        await self.sweep_stale()
+        batch = [(campaign_id, self._pending.pop(campaign_id)) for campaign_id in list(self._pending)[:self.batch_size]]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def refresh_limited(campaign_id: str, reason: str):
+            async with semaphore:
+                return await self.refresh(campaign_id, reason)
+
+        results = await asyncio.gather(*(refresh_limited(cid, reason) for cid, reason in batch))
+        ANALYSIS_REFRESH_PENDING.set(len(self._pending))
+        return sum(1 for outcome in results if outcome == "refreshed")
+
+    async def refresh(self, campaign_id: str, reason: str) -> str:
+        try:
+            campaign = await sb_find_one("campaigns", {"id": campaign_id})
+            if not campaign or campaign.get("status") != "active":
+                outcome = "skipped"
+            else:
+                existing = await sb_find_one("ai_analyses", {"campaign_id": campaign_id})
+                if reason == "age" and existing and not self._is_stale(existing):
+                    outcome = "skipped"  # another worker got there first
+                else:
+                    await ai_limiter.admit("analysis-refresh")
+                    # Waits behind user requests for the in-flight cap; a timeout defers like a 429
+                    async with ai_limiter.slot():
+                        probability, analysis_text = await generate_analysis(campaign, "analysis_refresh")
+                    await self._store(campaign_id, existing, probability, analysis_text)
+                    outcome = "refreshed"
+        except HTTPException as e:
+            if e.status_code != 429:
+                raise
+            # Out of AI quota; back in the queue for the next run
+            self.mark(campaign_id, reason)
+            outcome = "deferred"
+        except Exception as e:
+            logger.error(f"Refreshing analysis for {campaign_id} failed: {e}")
+            outcome = "failed"
+        ANALYSIS_REFRESHES.inc(reason=reason, outcome=outcome)
+        return outcome
+
+    async def run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Analysis refresh run failed: {e}")
+
+    def _is_stale(self, analysis: dict) -> bool:
+        created_at = analysis.get("created_at")
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        return created_at is None or datetime.now(timezone.utc) - created_at >= self.max_age
+
+    async def _store(self, campaign_id: str, existing: Optional[dict], probability: float, analysis_text: str):
+        generated_at = datetime.now(timezone.utc).isoformat()
+        if existing:
+            await sb_update("ai_analyses", {"campaign_id": campaign_id}, {
+                "success_probability": probability,
+                "analysis_text": analysis_text,
+                "created_at": generated_at,
+            })
+            return
+        ai_dict = AIAnalysis(campaign_id=campaign_id, success_probability=probability,
+                             analysis_text=analysis_text).model_dump()
+        ai_dict['created_at'] = generated_at
+        await sb_insert("ai_analyses", ai_dict)
+
+
+analysis_refresher = AnalysisRefreshScheduler(
+    batch_size=int(os.environ.get('ANALYSIS_REFRESH_BATCH', '10')),
+    interval_seconds=float(os.environ.get('ANALYSIS_REFRESH_INTERVAL_SECONDS', '60')),
+    max_age_days=float(os.environ.get('ANALYSIS_MAX_AGE_DAYS', '7')),
+    concurrency=int(os.environ.get('ANALYSIS_REFRESH_CONCURRENCY', '2')),
+)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark response compression: bytes on the wire and CPU cost per encoding
+
+Usage: python benchmarks/bench_compression.py [--repeat 20]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from compression import brotli, compress  # noqa: E402
+from payloads import (  # noqa: E402
+    make_campaign_rows,
+    make_competitor_analysis,
+    make_strategic_recommendations,
+)
+
+PAYLOADS = {
+    "campaigns x100": lambda: make_campaign_rows(100),
+    "campaigns x1000": lambda: make_campaign_rows(1000),
+    "competitor_analysis": make_competitor_analysis,
+    "strategic_recommendations": make_strategic_recommendations,
+}
+
+
+def settings():
+    yield "gzip-1", "gzip", {"gzip_level": 1}
+    yield "gzip-6", "gzip", {"gzip_level": 6}
+    yield "gzip-9", "gzip", {"gzip_level": 9}
+    if brotli is not None:
+        yield "br-4", "br", {"brotli_quality": 4}
+        yield "br-11", "br", {"brotli_quality": 11}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("brotli not installed, only gzip levels are measured")
+
+    print(f"{'payload':<28} {'encoding':<8} {'bytes':>10} {'ratio':>7} {'cpu (ms)':>9}")
+    for name, factory in PAYLOADS.items():
+        body = json.dumps(factory()).encode("utf-8")
+        print(f"{name:<28} {'identity':<8} {len(body):>10} {1.0:>7.2f} {0.0:>9.3f}")
+        for label, encoding, options in settings():
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.process_time()
+                compressed = compress(body, encoding, **options)
+                best = min(best, time.process_time() - start)
+            ratio = len(body) / len(compressed)
+            print(f"{'':<28} {label:<8} {len(compressed):>10} {ratio:>7.2f} {best * 1000:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
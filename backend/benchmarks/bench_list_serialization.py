@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark the campaign listing response path
+
+Compares the old path (parse created_at per row, validate against
+List[Campaign], encode with the stdlib JSON encoder) against the
+FastJSONResponse path that serializes Supabase rows as-is.
+
+Usage: python benchmarks/bench_list_serialization.py [--rows 1000] [--repeat 20]
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from fast_json import FastJSONResponse, orjson  # noqa: E402
+from models import Campaign  # noqa: E402
+from payloads import make_campaign_rows  # noqa: E402
+
+LIST_ADAPTER = TypeAdapter(List[Campaign])
+
+
+def old_path(rows: list) -> bytes:
+    for campaign in rows:
+        if isinstance(campaign['created_at'], str):
+            campaign['created_at'] = datetime.fromisoformat(campaign['created_at'])
+    validated = LIST_ADAPTER.validate_python(rows)
+    content = LIST_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def new_path(rows: list) -> bytes:
+    return FastJSONResponse(rows).body
+
+
+def timeit(fn, rows_factory, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        rows = rows_factory()
+        start = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Encoder: {'orjson ' + orjson.__version__ if orjson else 'stdlib json (orjson not installed)'}")
+    print(f"{'rows':>8} {'old (ms)':>10} {'new (ms)':>10} {'speedup':>8}")
+    for count in args.rows:
+        template = make_campaign_rows(count)
+        factory = lambda: [dict(row) for row in template]  # noqa: E731
+        old = timeit(old_path, factory, args.repeat)
+        new = timeit(new_path, factory, args.repeat)
+        print(f"{count:>8} {old * 1000:>10.2f} {new * 1000:>10.2f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for server.py
+
+`imports` runs `import server` under `python -X importtime` in a fresh
+interpreter and prints the slowest top-level packages. `sdks` times importing
+each heavy SDK on its own, i.e. what lazy loading keeps off the startup path.
+`ready` spawns uvicorn and measures time from process start to the first 200
+from /api/health, failing when the median exceeds --target-ms.
+
+With --fakes the app runs against benchmarks/fakes.py (no SDKs or network
+needed), which isolates our own import and startup cost. Without it the real
+SDKs are imported; Supabase points at a closed local port so the initial
+home-feed build fails fast instead of waiting on the network.
+
+Usage:
+    python benchmarks/bench_startup.py imports --top 15
+    python benchmarks/bench_startup.py sdks
+    python benchmarks/bench_startup.py ready --runs 5 --target-ms 1500
+    python benchmarks/bench_startup.py ready --fakes --env LAZY_IMPORT_WARMUP=startup
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCH_DIR.parent
+
+SDKS = ["google.generativeai", "stripe", "supabase", "numpy", "pandas"]
+
+FAKE_BOOT = (
+    "import sys; sys.path[:0] = [{bench!r}, {backend!r}]\n"
+    "from fakes import FakeConfig, install\n"
+    "install(FakeConfig(db_latency_ms=0, gemini_latency_ms=0, stripe_latency_ms=0))\n"
+)
+
+
+def base_env(args) -> dict:
+    env = dict(os.environ)
+    env.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+    env.setdefault("SUPABASE_KEY", "bench.bench.bench")
+    for item in args.env or []:
+        key, _, value = item.partition("=")
+        env[key] = value
+    return env
+
+
+def python_code(args, body: str) -> str:
+    prefix = FAKE_BOOT.format(bench=str(BENCH_DIR), backend=str(BACKEND_DIR)) if args.fakes else ""
+    return prefix + body
+
+
+# ============ IMPORTS ============
+
+def command_imports(args):
+    code = python_code(args, "import server\n")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BACKEND_DIR,
+                          env=base_env(args), capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        sys.exit(proc.returncode)
+
+    # Lines look like "import time:      self [us] |  cumulative | imported package"
+    totals = defaultdict(int)
+    server_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        if name == "server":
+            server_us = int(cumulative)
+        elif depth <= 1:
+            totals[name.split(".")[0]] += int(cumulative)
+
+    print(f"import server: {server_us / 1000:.1f} ms total\n")
+    print(f"{'package':<32} {'cumulative ms':>14}")
+    for name, us in sorted(totals.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{name:<32} {us / 1000:>14.1f}")
+
+
+def command_sdks(args):
+    print(f"{'module':<24} {'import ms':>10}")
+    for module in SDKS:
+        code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"{module:<24} {'not installed':>10}")
+            continue
+        print(f"{module:<24} {float(proc.stdout.strip()) * 1000:>10.1f}")
+
+
+# ============ TIME TO FIRST 200 ============
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_200(args) -> float:
+    port = free_port()
+    code = python_code(args, f"import uvicorn\nuvicorn.run('server:app', port={port}, log_level='warning')\n")
+    url = f"http://127.0.0.1:{port}{args.path}"
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", code], cwd=BACKEND_DIR, env=base_env(args),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < args.timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with code {proc.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(0.005)
+        raise RuntimeError(f"no 200 from {url} within {args.timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def command_ready(args):
+    samples = []
+    for i in range(args.runs):
+        ms = time_to_first_200(args)
+        samples.append(ms)
+        print(f"run {i + 1}: {ms:.0f} ms")
+    median = statistics.median(samples)
+    print(f"\ntime to first 200: median {median:.0f} ms, min {min(samples):.0f} ms, max {max(samples):.0f} ms")
+    if args.target_ms and median > args.target_ms:
+        print(f"Cold start over target ({args.target_ms:.0f} ms)")
+        sys.exit(1)
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--fakes", action="store_true", help="run against benchmarks/fakes.py instead of real SDKs")
+    common.add_argument("--env", action="append", metavar="KEY=VALUE", help="extra environment for the server")
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    imports_parser = commands.add_parser("imports", parents=[common])
+    imports_parser.add_argument("--top", type=int, default=15)
+
+    commands.add_parser("sdks", parents=[common])
+
+    ready_parser = commands.add_parser("ready", parents=[common])
+    ready_parser.add_argument("--runs", type=int, default=5)
+    ready_parser.add_argument("--path", default="/api/health")
+    ready_parser.add_argument("--timeout", type=float, default=30.0)
+    ready_parser.add_argument("--target-ms", type=float, help="exit 1 when the median is above this")
+
+    args = parser.parse_args()
+    {"imports": command_imports, "sdks": command_sdks, "ready": command_ready}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,529 @@
+"""
+Local stand-ins for Supabase, Gemini and Stripe used by the load-test and
+benchmark scripts.
+
+install() registers fake `supabase`, `google.generativeai` and `stripe`
+modules in sys.modules, so it must run before server.py is imported. The
+fakes only implement the surface server.py and sb_bulk use:
+
+- FakeSupabase: in-memory, PostgREST-style query builder (select/eq/ilike/
+  in_/order/limit, insert/upsert/update/delete) with lazily built equality
+  indexes, a configurable per-query latency, and token based auth.
+- Gemini stub: generate_content() returns canned text shaped like what each
+  prompt asks for, after a base latency plus output_tokens / tokens_per_sec.
+- Stripe stub: checkout.Session.create/retrieve with configurable latency.
+"""
+import itertools
+import json
+import sys
+import threading
+import time
+import types
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class FakeConfig:
+    db_latency_ms: float = 2.0
+    gemini_latency_ms: float = 300.0
+    gemini_tokens_per_sec: float = 200.0
+    stripe_latency_ms: float = 150.0
+    stripe_paid_ratio: float = 0.9
+
+
+def _sleep_ms(ms: float):
+    if ms > 0:
+        time.sleep(ms / 1000.0)
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+# ============ SUPABASE ============
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeStore:
+    """Tables of dict rows with equality indexes built on first use"""
+
+    def __init__(self, config: FakeConfig):
+        self.config = config
+        self.lock = threading.RLock()
+        self.tables: Dict[str, List[dict]] = defaultdict(list)
+        self.indexes: Dict[str, Dict[str, Dict[Any, List[dict]]]] = defaultdict(dict)
+
+    def load(self, table: str, rows: List[dict]):
+        with self.lock:
+            self.tables[table].extend(rows)
+            self.indexes[table].clear()
+
+    def index(self, table: str, column: str) -> Dict[Any, List[dict]]:
+        idx = self.indexes[table].get(column)
+        if idx is None:
+            idx = defaultdict(list)
+            for row in self.tables[table]:
+                idx[row.get(column)].append(row)
+            self.indexes[table][column] = idx
+        return idx
+
+    def add(self, table: str, row: dict):
+        self.tables[table].append(row)
+        for column, idx in self.indexes[table].items():
+            idx[row.get(column)].append(row)
+
+
+def _matches(row: dict, filters) -> bool:
+    for op, column, value in filters:
+        current = row.get(column)
+        if op == "eq" and current != value:
+            return False
+        if op == "in" and current not in value:
+            return False
+        if op == "ilike" and value.strip("%").lower() not in str(current or "").lower():
+            return False
+        if op in ("gt", "gte", "lt", "lte"):
+            if current is None:
+                return False
+            if op == "gt" and not current > value:
+                return False
+            if op == "gte" and not current >= value:
+                return False
+            if op == "lt" and not current < value:
+                return False
+            if op == "lte" and not current <= value:
+                return False
+    return True
+
+
+class FakeQuery:
+    def __init__(self, store: FakeStore, table: str):
+        self.store = store
+        self.table = table
+        self.action = "select"
+        self.columns = "*"
+        self.payload = None
+        self.filters = []
+        self.orders = []
+        self.limit_count = None
+        self.offset = 0
+        self.on_conflict = None
+        self.ignore_duplicates = False
+        self.count = None
+
+    # ---- actions ----
+
+    def select(self, columns: str = "*", count=None, **kwargs):
+        self.action, self.columns, self.count = "select", columns, count
+        return self
+
+    def insert(self, data, returning=None, upsert=False, **kwargs):
+        self.action, self.payload = ("upsert" if upsert else "insert"), data
+        return self
+
+    def upsert(self, data, on_conflict: str = "", ignore_duplicates: bool = False, returning=None, **kwargs):
+        self.action, self.payload = "upsert", data
+        self.on_conflict, self.ignore_duplicates = on_conflict or "id", ignore_duplicates
+        return self
+
+    def update(self, data, **kwargs):
+        self.action, self.payload = "update", data
+        return self
+
+    def delete(self, **kwargs):
+        self.action = "delete"
+        return self
+
+    # ---- filters/modifiers ----
+
+    def eq(self, column, value):
+        self.filters.append(("eq", column, value))
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(("in", column, set(values)))
+        return self
+
+    def ilike(self, column, pattern):
+        self.filters.append(("ilike", column, pattern))
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(("gt", column, value))
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(("gte", column, value))
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(("lt", column, value))
+        return self
+
+    def lte(self, column, value):
+        self.filters.append(("lte", column, value))
+        return self
+
+    def order(self, column, desc: bool = False, **kwargs):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, size: int, **kwargs):
+        self.limit_count = size
+        return self
+
+    def range(self, start: int, end: int, **kwargs):
+        self.offset, self.limit_count = start, end - start + 1
+        return self
+
+    # ---- execution ----
+
+    def _candidates(self) -> List[dict]:
+        for op, column, value in self.filters:
+            if op == "eq":
+                return self.store.index(self.table, column).get(value, [])
+        return self.store.tables[self.table]
+
+    def _matching(self) -> List[dict]:
+        return [row for row in self._candidates() if _matches(row, self.filters)]
+
+    def _project(self, row: dict) -> dict:
+        if self.columns == "*":
+            return dict(row)
+        return {c: row.get(c) for c in self.columns.split(",")}
+
+    def execute(self) -> FakeResponse:
+        _sleep_ms(self.store.config.db_latency_ms)
+        with self.store.lock:
+            return getattr(self, f"_execute_{self.action}")()
+
+    def _execute_select(self):
+        rows = self._matching()
+        total = len(rows)
+        for column, desc in reversed(self.orders):
+            rows.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+        end = None if self.limit_count is None else self.offset + self.limit_count
+        rows = rows[self.offset:end]
+        return FakeResponse([self._project(r) for r in rows], total if self.count else None)
+
+    def _prepare(self, row: dict) -> dict:
+        row = dict(row)
+        row.setdefault("id", str(uuid.uuid4()))
+        row.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        return row
+
+    def _execute_insert(self):
+        rows = self.payload if isinstance(self.payload, list) else [self.payload]
+        inserted = [self._prepare(r) for r in rows]
+        for row in inserted:
+            self.store.add(self.table, row)
+        return FakeResponse([dict(r) for r in inserted])
+
+    def _execute_upsert(self):
+        rows = self.payload if isinstance(self.payload, list) else [self.payload]
+        keys = (self.on_conflict or "id").split(",")
+        written = []
+        for row in rows:
+            existing = [r for r in self.store.tables[self.table] if all(r.get(k) == row.get(k) for k in keys)]
+            if existing:
+                if not self.ignore_duplicates:
+                    existing[0].update(row)
+                    self.store.indexes[self.table].clear()
+                    written.append(dict(existing[0]))
+            else:
+                new_row = self._prepare(row)
+                self.store.add(self.table, new_row)
+                written.append(dict(new_row))
+        return FakeResponse(written)
+
+    def _execute_update(self):
+        rows = self._matching()
+        for row in rows:
+            row.update(self.payload)
+        if rows:
+            self.store.indexes[self.table].clear()
+        return FakeResponse([dict(r) for r in rows])
+
+    def _execute_delete(self):
+        doomed = {id(r) for r in self._matching()}
+        removed = [r for r in self.store.tables[self.table] if id(r) in doomed]
+        self.store.tables[self.table] = [r for r in self.store.tables[self.table] if id(r) not in doomed]
+        self.store.indexes[self.table].clear()
+        return FakeResponse(removed)
+
+
+class FakeAuthUser:
+    def __init__(self, row: dict):
+        self.id = row["id"]
+        self.email = row["email"]
+        self.user_metadata = {"name": row.get("name")}
+        self.app_metadata = {"is_admin": row.get("is_admin", False)}
+        self.created_at = row.get("created_at")
+
+
+class FakeAuth:
+    def __init__(self, store: FakeStore):
+        self.store = store
+        self.tokens: Dict[str, dict] = {}
+
+    def register(self, token: str, user_row: dict):
+        self.tokens[token] = user_row
+
+    def get_user(self, token: str):
+        _sleep_ms(self.store.config.db_latency_ms)
+        row = self.tokens.get(token)
+        if row is None:
+            raise Exception("invalid JWT: unable to parse or verify signature")
+        return types.SimpleNamespace(user=FakeAuthUser(row))
+
+    def sign_in_with_oauth(self, options):
+        return types.SimpleNamespace(url="http://localhost/fake-oauth")
+
+    def reset_password_email(self, email, options=None):
+        return None
+
+
+class FakeSupabase:
+    def __init__(self, config: FakeConfig):
+        self.store = FakeStore(config)
+        self.auth = FakeAuth(self.store)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self.store, name)
+
+    def rpc(self, name: str, params: dict):
+        return FakeRpc(self.store, name, params)
+
+
+class FakeRpc:
+    """The database functions from EXECUTE_THIS_SQL_IN_SUPABASE.sql that the app calls"""
+
+    def __init__(self, store: FakeStore, name: str, params: dict):
+        self.store, self.name, self.params = store, name, params
+
+    def execute(self) -> FakeResponse:
+        _sleep_ms(self.store.config.db_latency_ms)
+        if self.name == "apply_campaign_scores":
+            return self._apply_campaign_scores()
+        if self.name == "gemini_usage_totals":
+            return self._gemini_usage_totals()
+        if self.name != "record_gemini_usage":
+            raise ValueError(f"fake has no function {self.name}")
+        keys = ("day", "endpoint", "user_id")
+        with self.store.lock:
+            for row in self.params["rows"]:
+                existing = next((r for r in self.store.tables["gemini_usage_daily"]
+                                 if all(r[k] == row[k] for k in keys)), None)
+                if existing is None:
+                    self.store.add("gemini_usage_daily", dict(row))
+                else:
+                    for column, value in row.items():
+                        if column not in keys:
+                            existing[column] += value
+        return FakeResponse(None)
+
+    def _apply_campaign_scores(self) -> FakeResponse:
+        with self.store.lock:
+            campaigns = self.store.index("campaigns", "id")
+            for score in self.params["scores"]:
+                for row in campaigns.get(score["id"], ()):
+                    row.update({column: value for column, value in score.items() if column != "id"})
+            self.store.indexes["campaigns"].clear()
+        return FakeResponse(None)
+
+    def _gemini_usage_totals(self) -> FakeResponse:
+        p = self.params
+        counters = ("calls", "cache_hits", "errors", "prompt_tokens", "completion_tokens", "cached_tokens",
+                    "latency_ms")
+        groups = {}
+        with self.store.lock:
+            for row in self.store.tables["gemini_usage_daily"]:
+                if str(row["day"]) < p["since"]:
+                    continue
+                key = str(row[p["group_key"]]) if p["group_key"] in ("endpoint", "user_id") else str(row["day"])
+                totals = groups.setdefault(key, dict.fromkeys(counters, 0))
+                for counter in counters:
+                    totals[counter] += row.get(counter) or 0
+        ranked = sorted(groups.items(), reverse=True, key=lambda item: (
+            item[1]["prompt_tokens"] * p["input_price"] + item[1]["completion_tokens"] * p["output_price"],
+            item[1]["prompt_tokens"] + item[1]["completion_tokens"]))
+        return FakeResponse([{"group_value": key, **totals} for key, totals in ranked[:p["max_groups"]]])
+
+
+# ============ GEMINI ============
+
+TITLES = ["Make It Real", "Back the Future", "Built Together", "Join the Movement", "Shape What's Next"]
+
+
+def canned_gemini_text(prompt: str) -> str:
+    """Return text in the shape the prompt asks for"""
+    if '"titles"' in prompt:
+        return json.dumps({"titles": [f"{t} #{i}" for i, t in enumerate(TITLES)]})
+    if "Percentage:" in prompt:
+        return "Percentage: 72\nAnalysis: The goal is realistic for the category and early traction is solid. Stronger visuals would help conversion."
+    if "ONLY a number" in prompt:
+        return "72"
+    if "success_percentage" in prompt:
+        return json.dumps({
+            "success_percentage": 72,
+            "confidence_level": "Medium",
+            "analysis": "Realistic goal with a clear audience.",
+            "recommendations": ["Add a video", "Offer early-bird tiers", "Post weekly updates",
+                                "Engage communities", "Show a budget breakdown"],
+        })
+    if "market_overview" in prompt:
+        return json.dumps({
+            "market_overview": {"category_performance": "Steady growth.", "average_success_rate": "62.00%",
+                                "typical_funding_min": 50000, "typical_funding_max": 1000000},
+            "key_trends": ["Sustainability", "Community ownership", "Creator-led brands"],
+            "top_competitors": [{"name": f"Competitor {i}", "funding": 500000 - i * 100000,
+                                 "description": "A comparable project.", "success_factors": "Strong community"}
+                                for i in range(3)],
+        })
+    if "success_prediction" in prompt:
+        return json.dumps({
+            "success_prediction": {"percentage": 78, "level": "High", "category_average": "65% success rate",
+                                   "similar_campaigns": "Comparable campaigns perform well."},
+            "success_factors": ["Clear value", "Good visuals", "Fair goal"],
+            "risk_factors": ["Competition", "Seasonality", "Shipping costs"],
+            "action_recommendations": [{"title": "Post updates", "description": "Keep backers engaged", "priority": "High"}],
+            "strategic_recommendations": [{"category": "Marketing Tactics", "priority": "Medium", "description": "Partner with creators"}],
+        })
+    if "target_audience" in prompt:
+        return json.dumps({
+            "overview": "Community-first launch with paid amplification.",
+            "target_audience": {"primary": "Early adopters", "secondary": "Gift buyers"},
+            "channels": [{"name": "Instagram", "strategy": "Reels and stories", "priority": "High"}],
+            "timeline": [{"phase": "Pre-Launch", "duration": "2 weeks", "actions": ["Collect emails"]}],
+            "key_messages": ["Built with you", "Limited first run", "Sustainably made"],
+            "budget_allocation": {"social_media": "40%", "content_creation": "25%",
+                                  "influencer_partnerships": "20%", "paid_advertising": "15%"},
+        })
+    return ("Thanks for asking! Start by defining a realistic goal, prepare a short video, and line up "
+            "your first backers among friends and community groups before launch. ") * 3
+
+
+class FakeGeminiResponse:
+    def __init__(self, text: str, prompt: str):
+        self.text = text
+        prompt_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(text)
+        self.usage_metadata = types.SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens,
+        )
+
+
+def make_fake_genai(config: FakeConfig) -> types.ModuleType:
+    module = types.ModuleType("google.generativeai")
+    module.calls = itertools.count()
+
+    def configure(**kwargs):
+        return None
+
+    class GenerativeModel:
+        def __init__(self, model_name: str = "", **kwargs):
+            self.model_name = model_name
+
+        def generate_content(self, contents, stream: bool = False, **kwargs):
+            next(module.calls)
+            prompt = contents if isinstance(contents, str) else json.dumps(contents, default=str)
+            text = canned_gemini_text(prompt)
+            latency = config.gemini_latency_ms + 1000.0 * estimate_tokens(text) / config.gemini_tokens_per_sec
+            if not stream:
+                _sleep_ms(latency)
+                return FakeGeminiResponse(text, prompt)
+            return self._stream(text, prompt, latency)
+
+        def _stream(self, text: str, prompt: str, latency: float):
+            chunks = [text[i:i + 80] for i in range(0, len(text), 80)] or [""]
+            _sleep_ms(config.gemini_latency_ms)
+            for chunk in chunks:
+                _sleep_ms((latency - config.gemini_latency_ms) / len(chunks))
+                yield FakeGeminiResponse(chunk, prompt)
+
+    module.configure = configure
+    module.GenerativeModel = GenerativeModel
+    module.GenerationConfig = lambda **kwargs: kwargs
+    return module
+
+
+# ============ STRIPE ============
+
+def make_fake_stripe(config: FakeConfig) -> types.ModuleType:
+    module = types.ModuleType("stripe")
+    module.api_key = None
+    sessions: Dict[str, types.SimpleNamespace] = {}
+    counter = itertools.count()
+
+    class Session:
+        @staticmethod
+        def create(**kwargs):
+            _sleep_ms(config.stripe_latency_ms)
+            n = next(counter)
+            session_id = f"cs_test_fake_{n:012d}"
+            amount = sum(item["price_data"]["unit_amount"] * item.get("quantity", 1)
+                         for item in kwargs.get("line_items", []))
+            paid = (n % 100) < config.stripe_paid_ratio * 100
+            session = types.SimpleNamespace(
+                id=session_id,
+                url=f"https://checkout.stripe.test/pay/{session_id}",
+                status="complete" if paid else "open",
+                payment_status="paid" if paid else "unpaid",
+                amount_total=amount,
+                currency=kwargs.get("line_items", [{}])[0].get("price_data", {}).get("currency", "inr"),
+                metadata=kwargs.get("metadata", {}),
+            )
+            sessions[session_id] = session
+            return session
+
+        @staticmethod
+        def retrieve(session_id: str, **kwargs):
+            _sleep_ms(config.stripe_latency_ms)
+            if session_id not in sessions:
+                raise Exception(f"No such checkout.session: {session_id}")
+            return sessions[session_id]
+
+    class Webhook:
+        @staticmethod
+        def construct_event(payload, sig_header, secret):
+            return json.loads(payload)
+
+    module.checkout = types.SimpleNamespace(Session=Session)
+    module.Webhook = Webhook
+    return module
+
+
+# ============ INSTALL ============
+
+def install(config: Optional[FakeConfig] = None) -> FakeSupabase:
+    """Register the fake SDK modules; returns the shared FakeSupabase client"""
+    config = config or FakeConfig()
+    client = FakeSupabase(config)
+
+    supabase_module = types.ModuleType("supabase")
+    supabase_module.Client = FakeSupabase
+    supabase_module.create_client = lambda url, key, *args, **kwargs: client
+    sys.modules["supabase"] = supabase_module
+
+    genai = make_fake_genai(config)
+    try:
+        import google
+    except ImportError:
+        google = types.ModuleType("google")
+        google.__path__ = []
+        sys.modules["google"] = google
+    google.generativeai = genai
+    sys.modules["google.generativeai"] = genai
+
+    sys.modules["stripe"] = make_fake_stripe(config)
+    return client
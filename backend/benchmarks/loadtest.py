@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test for server.py against local fakes
+
+`run` boots the app in a subprocess (`serve`) with in-memory Supabase, Gemini
+and Stripe stand-ins seeded from generate_dataset.py, then drives a weighted
+mix of user scenarios with N concurrent virtual users and reports
+p50/p95/p99 latency and throughput per route. Use --target to drive an
+already running server instead (it must be serving the same seeded fakes).
+
+Usage:
+    python benchmarks/loadtest.py run --vus 50 --duration 60
+    python benchmarks/loadtest.py run --mix browse=60,detail=30,chat=10 --gemini-latency-ms 800
+    python benchmarks/loadtest.py serve --port 8765       # fakes only, drive it yourself
+    python benchmarks/loadtest.py run --workers 4          # through launcher.py, for throughput per core
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+DEFAULT_MIX = "browse=45,detail=30,pledge=5,chat=10,admin=5,create=5"
+CATEGORIES = ["Technology", "Games", "Design", "Health", "Food", "Education"]
+
+
+def token_for(user_index: int) -> str:
+    return f"loadtest-token-{user_index}"
+
+
+def dataset_args(args) -> argparse.Namespace:
+    return argparse.Namespace(
+        campaigns=args.campaigns,
+        users=args.campaigns * 5,
+        pledges_per_campaign=args.pledges_per_campaign,
+        max_pledges=500,
+        comments_per_campaign=4.0,
+        chat_sessions=args.campaigns // 10,
+        turns_per_session=6.0,
+        seed=args.seed,
+        fixed_now=False,
+    )
+
+
+# ============ SERVER SIDE ============
+
+def serve(args):
+    from fakes import FakeConfig, install
+
+    client = install(FakeConfig(
+        db_latency_ms=args.db_latency_ms,
+        gemini_latency_ms=args.gemini_latency_ms,
+        gemini_tokens_per_sec=args.gemini_tokens_per_sec,
+        stripe_latency_ms=args.stripe_latency_ms,
+    ))
+    os.environ.setdefault("SUPABASE_URL", "http://fake-supabase.local")
+    os.environ.setdefault("SUPABASE_KEY", "fake.fake.fake")
+    os.chdir(BACKEND_DIR)
+
+    from generate_dataset import Generator
+
+    started = time.time()
+    tables = defaultdict(list)
+    generator = Generator(dataset_args(args))
+    for table, row in generator.rows():
+        tables[table].append(row)
+    for table, rows in tables.items():
+        client.store.load(table, rows)
+    for i, user in enumerate(tables["users"][:args.auth_users]):
+        client.auth.register(token_for(i), user)
+    print(f"Seeded {sum(len(r) for r in tables.values()):,} rows in {time.time() - started:.1f}s", file=sys.stderr)
+
+    if args.workers:
+        # Production launcher; preload forks workers from this already-seeded process,
+        # so each worker starts with the same data (writes then diverge per worker)
+        import launcher
+
+        launcher.main(["--bind", f"127.0.0.1:{args.port}", "--workers", str(args.workers), "--log-level", "warning"])
+        return
+
+    import uvicorn
+    import server
+
+    uvicorn.run(server.app, host="127.0.0.1", port=args.port, log_level="warning", access_log=False)
+
+
+# ============ CLIENT SIDE ============
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.recording = False
+
+    def add(self, route: str, seconds: float, ok: bool):
+        if not self.recording:
+            return
+        self.latencies[route].append(seconds)
+        if not ok:
+            self.errors[route] += 1
+
+
+class VirtualUser:
+    def __init__(self, client, recorder: Recorder, index: int, campaign_ids, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.user_index = index
+        self.headers = {"Authorization": f"Bearer {token_for(index)}"}
+        self.admin_headers = {"Authorization": f"Bearer {token_for(0)}"}
+        self.campaign_ids = campaign_ids
+        self.rng = rng
+        self.chat_session = None
+
+    async def request(self, method: str, route: str, path: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, **kwargs)
+            ok = response.status_code < 400
+        except Exception:
+            response, ok = None, False
+        self.recorder.add(f"{method} {route}", time.perf_counter() - start, ok)
+        return response
+
+    def campaign(self) -> str:
+        # Popular campaigns get most of the traffic
+        return self.campaign_ids[int(len(self.campaign_ids) * self.rng.random() ** 2)]
+
+    async def browse(self):
+        await self.request("GET", "/api/feed/home", "/api/feed/home")
+        await self.request("GET", "/api/campaigns", "/api/campaigns")
+        await self.request("GET", "/api/campaigns?category", "/api/campaigns",
+                           params={"category": self.rng.choice(CATEGORIES)})
+
+    async def detail(self):
+        campaign_id = self.campaign()
+        await self.request("GET", "/api/campaigns/{id}/page", f"/api/campaigns/{campaign_id}/page",
+                           headers=self.headers)
+        await self.request("GET", "/api/campaigns/{id}/analysis", f"/api/campaigns/{campaign_id}/analysis")
+
+    async def pledge(self):
+        response = await self.request("POST", "/api/payments/create-checkout", "/api/payments/create-checkout",
+                                      headers=self.headers,
+                                      json={"campaign_id": self.campaign(), "origin_url": "http://localhost:3000"})
+        if response is not None and response.status_code == 200:
+            session_id = response.json()["session_id"]
+            await self.request("GET", "/api/payments/status/{session_id}", f"/api/payments/status/{session_id}",
+                               headers=self.headers)
+
+    async def chat(self):
+        response = await self.request("POST", "/api/ai/chat", "/api/ai/chat", headers=self.headers,
+                                      json={"message": "How should I price my reward tiers?",
+                                            "session_id": self.chat_session})
+        if response is not None and response.status_code == 200:
+            self.chat_session = response.json().get("session_id")
+
+    async def admin(self):
+        await self.request("GET", "/api/admin/stats", "/api/admin/stats", headers=self.admin_headers)
+        await self.request("GET", "/api/admin/campaigns", "/api/admin/campaigns", headers=self.admin_headers)
+
+    async def create(self):
+        body = {"title": "Load Test Lamp", "description": "A modular desk lamp built for load testing.",
+                "category": self.rng.choice(CATEGORIES), "goal_amount": 50000}
+        await self.request("POST", "/api/ai/optimize-title", "/api/ai/optimize-title", headers=self.headers, json=body)
+        await self.request("POST", "/api/campaigns/extended", "/api/campaigns/extended", headers=self.headers,
+                           json=dict(body, reward_tiers=[{"amount": 500, "description": "Early bird"}]))
+
+    async def loop(self, mix, deadline: float, think_ms: float):
+        names, weights = zip(*mix.items())
+        while time.perf_counter() < deadline:
+            scenario = self.rng.choices(names, weights)[0]
+            await getattr(self, scenario)()
+            if think_ms:
+                await asyncio.sleep(self.rng.expovariate(1000.0 / think_ms))
+
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if not hasattr(VirtualUser, name.strip()):
+            raise SystemExit(f"Unknown scenario: {name}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    report = {}
+    for route, values in sorted(recorder.latencies.items()):
+        values.sort()
+        report[route] = {
+            "count": len(values),
+            "errors": recorder.errors[route],
+            "rps": len(values) / elapsed,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": values[-1] * 1000,
+        }
+    return report
+
+
+def print_report(report: dict, elapsed: float):
+    print(f"\n{'route':<42} {'count':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for route, r in report.items():
+        print(f"{route:<42} {r['count']:>7} {r['errors']:>5} {r['rps']:>8.1f} "
+              f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}")
+    total = sum(r["count"] for r in report.values())
+    errors = sum(r["errors"] for r in report.values())
+    print(f"\nTotal: {total} requests, {errors} errors, {total / elapsed:.1f} req/s over {elapsed:.1f}s (ms)")
+
+
+async def wait_ready(client, timeout: float = 120.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            response = await client.get("/api/feed/home")
+            if response.status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.5)
+    raise SystemExit("Server did not become ready")
+
+
+async def drive(args, base_url: str) -> dict:
+    import httpx
+    from generate_dataset import Generator
+
+    generator = Generator(dataset_args(args))
+    campaign_ids = [generator.stable_uuid("campaign", i) for i in range(args.campaigns)]
+    mix = parse_mix(args.mix)
+    recorder = Recorder()
+
+    limits = httpx.Limits(max_connections=args.vus, max_keepalive_connections=args.vus)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        await wait_ready(client)
+        rng = random.Random(args.seed)
+        users = [VirtualUser(client, recorder, 1 + i % max(1, args.auth_users - 1), campaign_ids,
+                             random.Random(rng.random())) for i in range(args.vus)]
+
+        if args.warmup:
+            await asyncio.gather(*(u.loop(mix, time.perf_counter() + args.warmup, args.think_ms) for u in users))
+        recorder.recording = True
+        started = time.perf_counter()
+        await asyncio.gather(*(u.loop(mix, started + args.duration, args.think_ms) for u in users))
+        elapsed = time.perf_counter() - started
+
+    report = summarize(recorder, elapsed)
+    print_report(report, elapsed)
+    return {"elapsed": elapsed, "vus": args.vus, "mix": mix, "routes": report}
+
+
+def run(args):
+    process = None
+    base_url = args.target
+    if not base_url:
+        base_url = f"http://127.0.0.1:{args.port}"
+        command = [sys.executable, __file__, "serve", "--port", str(args.port)] + fake_flags(args)
+        process = subprocess.Popen(command)
+    try:
+        result = asyncio.run(drive(args, base_url))
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=30)
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+        print(f"Wrote {args.json}")
+
+
+def fake_flags(args) -> list:
+    return [
+        "--campaigns", str(args.campaigns), "--seed", str(args.seed),
+        "--pledges-per-campaign", str(args.pledges_per_campaign), "--auth-users", str(args.auth_users),
+        "--db-latency-ms", str(args.db_latency_ms), "--gemini-latency-ms", str(args.gemini_latency_ms),
+        "--gemini-tokens-per-sec", str(args.gemini_tokens_per_sec),
+        "--stripe-latency-ms", str(args.stripe_latency_ms), "--workers", str(args.workers),
+    ]
+
+
+def add_fake_options(parser):
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--campaigns", type=int, default=2000)
+    parser.add_argument("--pledges-per-campaign", type=float, default=10.0)
+    parser.add_argument("--auth-users", type=int, default=200, help="users that get a bearer token")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-latency-ms", type=float, default=2.0)
+    parser.add_argument("--gemini-latency-ms", type=float, default=300.0)
+    parser.add_argument("--gemini-tokens-per-sec", type=float, default=200.0)
+    parser.add_argument("--stripe-latency-ms", type=float, default=150.0)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="serve through launcher.py with N workers (0 = single in-process uvicorn)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run server.py against seeded fakes")
+    add_fake_options(serve_parser)
+
+    run_parser = commands.add_parser("run", help="boot the fake-backed server and drive load")
+    add_fake_options(run_parser)
+    run_parser.add_argument("--target", help="base URL of an already running server")
+    run_parser.add_argument("--vus", type=int, default=20, help="concurrent virtual users")
+    run_parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    run_parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds")
+    run_parser.add_argument("--think-ms", type=float, default=0.0, help="mean think time between scenarios")
+    run_parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights (default {DEFAULT_MIX})")
+    run_parser.add_argument("--json", help="also write the report to this file")
+
+    args = parser.parse_args()
+    serve(args) if args.command == "serve" else run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for CPU-bound server hot paths, with stored baselines
+
+Each benchmark is calibrated to run enough iterations per round for stable
+timings; the median per-call time over all rounds is what gets compared.
+The app modules are imported against the zero-latency fakes from fakes.py, so only
+in-process cost is measured.
+
+Usage:
+    python benchmarks/microbench.py run                        # print results
+    python benchmarks/microbench.py run --save main            # write baselines/main.json
+    python benchmarks/microbench.py compare main --threshold 10  # exit 1 on >10% regression
+    python benchmarks/microbench.py run -k parse               # only matching benchmarks
+
+baselines/main.json is the committed reference (its machine and Python version
+are recorded in the file). Timings only compare on like hardware, so on another
+machine save your own baseline from a clean checkout before making changes.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+BASELINE_DIR = BENCH_DIR / "baselines"
+
+from fakes import FakeConfig, install  # noqa: E402
+
+FAKE_CLIENT = install(FakeConfig(db_latency_ms=0, gemini_latency_ms=0, stripe_latency_ms=0,
+                                 gemini_tokens_per_sec=1e12))
+os.environ.setdefault("SUPABASE_URL", "http://fake-supabase.local")
+os.environ.setdefault("SUPABASE_KEY", "fake.fake.fake")
+
+import analysis  # noqa: E402
+import core  # noqa: E402
+import models  # noqa: E402
+from fast_json import FastJSONResponse  # noqa: E402
+from routers import analytics  # noqa: E402
+from payloads import make_campaign_rows  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+    return register
+
+
+def make_request(headers: dict = None, cookies: str = None) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    if cookies:
+        raw.append((b"cookie", cookies.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw, "query_string": b""})
+
+
+def run_async(coro_factory):
+    loop = asyncio.new_event_loop()
+    return lambda: loop.run_until_complete(coro_factory())
+
+
+# ============ BENCHMARKS ============
+# Each factory does its setup and returns the zero-argument callable to time.
+
+@benchmark("auth.get_current_user.jwt")
+def bench_auth_jwt():
+    user = {"id": "u-1", "email": "bench@example.com", "name": "Bench", "is_admin": False,
+            "created_at": "2025-01-01T00:00:00+00:00"}
+    FAKE_CLIENT.auth.register("bench-jwt", user)
+    request = make_request({"Authorization": "Bearer bench-jwt"})
+    # get_current_user caches on request.state, so time the uncached resolution it wraps
+    return run_async(lambda: core.resolve_current_user(request))
+
+
+@benchmark("auth.get_current_user.session_cookie")
+def bench_auth_session():
+    user = {"id": "u-2", "email": "cookie@example.com", "name": "Cookie", "is_admin": False,
+            "created_at": "2025-01-01T00:00:00+00:00"}
+    FAKE_CLIENT.store.load("users", [user])
+    FAKE_CLIENT.store.load("user_sessions", [{"session_token": "bench-session", "user_id": "u-2",
+                                              "expires_at": "2999-01-01T00:00:00+00:00"}])
+    request = make_request(cookies="session_token=bench-session")
+    return run_async(lambda: core.resolve_current_user(request))
+
+
+@benchmark("models.campaign_create_dump")
+def bench_campaign_model():
+    tiers = [models.RewardTier(amount=500, description="Early bird"),
+             models.RewardTier(amount=2500, description="Supporter")]
+
+    def create():
+        campaign = models.Campaign(
+            title="Smart Garden", description="Automated plant care " * 20, category="Technology",
+            goal_amount=25000, creator_id="u-1", creator_name="Bench", status="active",
+            duration_days=30, tags=["garden"], reward_tiers=[t.model_dump() for t in tiers],
+        )
+        campaign_dict = campaign.model_dump()
+        campaign_dict['created_at'] = campaign_dict['created_at'].isoformat()
+        return campaign_dict
+    return create
+
+
+@benchmark("models.session_create_dump")
+def bench_session_model():
+    def create():
+        session = models.UserSession(user_id="u-1", expires_at=datetime.now(timezone.utc))
+        session_dict = session.model_dump()
+        session_dict['created_at'] = session_dict['created_at'].isoformat()
+        session_dict['expires_at'] = session_dict['expires_at'].isoformat()
+        return session_dict
+    return create
+
+
+@benchmark("listing.serialize_1000")
+def bench_listing():
+    rows = make_campaign_rows(1000)
+    return lambda: FastJSONResponse(rows).body
+
+
+@benchmark("ai.parse_analysis_response")
+def bench_parse_analysis():
+    text = ("Percentage: 72\nAnalysis: The goal is realistic for the category and early traction is solid.\n"
+            "Stronger visuals and a clearer reward ladder would improve conversion.")
+    return lambda: analysis.parse_analysis_response(text)
+
+
+@benchmark("analytics.simulate_funding")
+def bench_monte_carlo():
+    return lambda: analytics.simulate_funding(100000.0, 35000.0, days_remaining=25)
+
+
+@benchmark("auth.bcrypt_verify")
+def bench_bcrypt():
+    hashed = core.hash_password("correct horse battery staple")
+    return lambda: core.verify_password("correct horse battery staple", hashed)
+
+
+# ============ RUNNER ============
+
+def measure(fn, rounds: int, min_round_time: float) -> dict:
+    fn()  # warm up caches, imports and lazy indexes
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_round_time or loops >= 1_000_000:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_round_time / elapsed * 1.2))
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+    return {
+        "median_us": statistics.median(samples) * 1e6,
+        "min_us": min(samples) * 1e6,
+        "stdev_us": (statistics.stdev(samples) if len(samples) > 1 else 0.0) * 1e6,
+        "loops": loops,
+        "rounds": rounds,
+    }
+
+
+def run_all(args) -> dict:
+    results = {}
+    for name, factory in BENCHMARKS.items():
+        if args.k and args.k not in name:
+            continue
+        results[name] = measure(factory(), args.rounds, args.min_round_time)
+        r = results[name]
+        print(f"{name:<40} {r['median_us']:>12.2f} us  (min {r['min_us']:.2f}, sd {r['stdev_us']:.2f}, "
+              f"{r['loops']} loops x {r['rounds']})")
+    return results
+
+
+def baseline_path(name: str) -> Path:
+    path = Path(name)
+    return path if path.suffix == ".json" else BASELINE_DIR / f"{name}.json"
+
+
+def command_run(args):
+    results = run_all(args)
+    if args.save:
+        path = baseline_path(args.save)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpus": os.cpu_count(),
+            "benchmarks": results,
+        }, indent=2))
+        print(f"\nSaved baseline to {path}")
+
+
+def command_compare(args):
+    path = baseline_path(args.baseline)
+    if not path.exists():
+        sys.exit(f"No baseline at {path}. Create one on this machine, from the revision to compare against, with:\n"
+                 f"    python benchmarks/microbench.py run --save {args.baseline}")
+    stored = json.loads(path.read_text())
+    baseline = stored["benchmarks"]
+    print(f"Baseline {path.name}: Python {stored.get('python')} on {stored.get('machine')}, "
+          f"{stored.get('platform', 'unknown platform')}, saved {stored.get('created_at')}")
+    if (stored.get("python"), stored.get("machine")) != (platform.python_version(), platform.machine()):
+        print(f"Warning: running Python {platform.python_version()} on {platform.machine()}; "
+              f"timings from another setup are not comparable")
+    results = run_all(args)
+    regressions = []
+    print(f"\n{'benchmark':<40} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, current in results.items():
+        if name not in baseline:
+            print(f"{name:<40} {'-':>12} {current['median_us']:>12.2f}      new")
+            continue
+        before = baseline[name]["median_us"]
+        change = (current["median_us"] - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > args.threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40} {before:>12.2f} {current['median_us']:>12.2f} {change:>+8.1f}%{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold}%")
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-k", help="only run benchmarks whose name contains this string")
+    common.add_argument("--rounds", type=int, default=15)
+    common.add_argument("--min-round-time", type=float, default=0.05, help="seconds per round")
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", parents=[common])
+    run_parser.add_argument("--save", help="baseline name (stored in benchmarks/baselines) or .json path")
+
+    compare_parser = commands.add_parser("compare", parents=[common])
+    compare_parser.add_argument("baseline", help="baseline name or .json path")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent")
+
+    args = parser.parse_args()
+    command_run(args) if args.command == "run" else command_compare(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Representative response payloads shared by the benchmark scripts
+"""
+import uuid
+from datetime import datetime, timezone, timedelta
+
+CATEGORIES = ["Technology", "Health", "Food", "Environment", "Education", "Art"]
+
+
+def make_campaign_rows(count: int) -> list:
+    """Build rows shaped like the Supabase `campaigns` table"""
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "title": f"Campaign {i}: Smart Product for Everyday Life",
+            "description": "A long-form campaign description. " * 20,
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "goal_amount": 25000.0 + i,
+            "raised_amount": 1250.0 * (i % 20),
+            "creator_id": str(uuid.uuid4()),
+            "creator_name": "Platform Admin",
+            "image_url": "https://images.unsplash.com/photo-1466692476868-aef1dfb1e735?w=800&h=600&fit=crop",
+            "status": "active",
+            "backers_count": i % 500,
+            "duration_days": 30,
+            "tags": ["featured", "new"],
+            "reward_tiers": [{"amount": 500.0, "description": "Early bird"}],
+            "created_at": (now - timedelta(minutes=i)).isoformat(),
+        })
+    return rows
+
+
+def make_competitor_analysis() -> dict:
+    """Shape of the /analytics/competitor-analysis response"""
+    return {
+        "market_overview": {
+            "category_performance": "The Food crowdfunding category has seen significant success, with campaigns raising substantial amounts. For instance, campaigns in this category have shown strong community engagement and innovative product offerings.",
+            "average_success_rate": "80.00%",
+            "typical_funding_min": 50000,
+            "typical_funding_max": 1000000,
+        },
+        "key_trends": [
+            "Growing interest in culinary experiences and heritage recipes",
+            "Increased support for self-published cookbooks",
+            "Rising demand for culturally diverse and authentic cooking content",
+        ],
+        "top_competitors": [
+            {
+                "name": f"Competitor {i}: Smart Pellet Grill with Unlimited Flavor",
+                "funding": 1064708 - i * 1000,
+                "description": "Combines traditional grilling with modern technology, offering precise temperature control and app integration.",
+                "success_factors": "Innovative product offering, Strong community engagement, Effective use of social media marketing",
+            }
+            for i in range(3)
+        ],
+    }
+
+
+def make_strategic_recommendations() -> dict:
+    """Shape of the /analytics/strategic-recommendations response"""
+    return {
+        "success_prediction": {
+            "percentage": 85,
+            "level": "High",
+            "category_average": "65% success rate",
+            "similar_campaigns": "Typically, Food-related campaigns with a personal touch have shown to succeed well.",
+        },
+        "success_factors": ["Strong initial backing", "Well-defined niche", "Professional presentation"],
+        "risk_factors": ["Market saturation", "Seasonality", "High competition"],
+        "action_recommendations": [
+            {
+                "title": "Promote on social media platforms to maintain momentum",
+                "description": "Increased visibility and potential backers",
+                "priority": "High",
+            }
+            for _ in range(4)
+        ],
+        "strategic_recommendations": [
+            {
+                "category": category,
+                "priority": "High",
+                "description": "Implement tiered pricing with early bird discounts to encourage prompt support and reward higher pledges with exclusive content.",
+                "reward_tiers": [
+                    {"amount": 25, "description": "Digital copy of the cookbook"},
+                    {"amount": 50, "description": "Physical copy of the cookbook"},
+                    {"amount": 100, "description": "Signed copy with exclusive recipes"},
+                ],
+            }
+            for category in ("Product Offering", "Pricing Strategy", "Marketing Tactics", "Community Engagement")
+        ],
+    }
@@ -0,0 +1,157 @@
+"""
+Batch scores that rank and sort campaign listings.
+
+Every CAMPAIGN_SCORE_INTERVAL_SECONDS all active campaigns are read in id
+order and scored together as NumPy arrays:
+
+- funded_ratio: raised / goal
+- momentum_score: funding pace (the fraction of its goal a campaign will reach
+  at its current rate) and backers per day, each relative to the average of
+  its category, combined as a geometric mean; 1.0 is typical for the category
+- success_score: the local success model's probability, when it is loaded
+- ends_at: created_at + duration_days, for "ending soon"; a trigger also sets
+  it on insert, so new campaigns do not wait for a run to have one
+
+The scores are written back to the campaigns table through the
+apply_campaign_scores function, and listings sort on them with
+`?sort=` (see LISTING_SORTS) using the partial indexes on active campaigns;
+sort=ending only lists campaigns whose end date has not passed.
+Score columns default to 0, so campaigns created since the last run sort last.
+
+Each worker runs the loop, but a run is skipped when another worker scored
+within the last half interval.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from core import sb_execute, sb_find, sb_find_all, supabase
+from lazy import lazy_module
+from metrics import CAMPAIGNS_SCORED
+from success_model import success_model
+
+np = lazy_module("numpy")
+
+logger = logging.getLogger("campaign_scores")
+
+CAMPAIGN_SCORE_INTERVAL_SECONDS = float(os.environ.get('CAMPAIGN_SCORE_INTERVAL_SECONDS', '300'))
+SCORE_COLUMNS = ("funded_ratio", "momentum_score", "success_score", "ends_at")
+SCORING_COLUMNS = ("id,category,goal_amount,raised_amount,backers_count,duration_days,created_at,"
+                   "description,reward_tiers,image_url")
+PAGE_SIZE = 1000
+
+# sort= value -> (column, descending)
+LISTING_SORTS = {
+    "newest": ("created_at", True),
+    "funded": ("funded_ratio", True),
+    "momentum": ("momentum_score", True),
+    "success": ("success_score", True),
+    "ending": ("ends_at", False),
+}
+
+
+def listing_order(sort: Optional[str]) -> Tuple[Optional[str], bool, dict]:
+    """(order_by, desc, extra filters) for sb_find from a listing's sort= parameter"""
+    if not sort:
+        return None, False, {}
+    if sort not in LISTING_SORTS:
+        raise HTTPException(400, f"Unknown sort '{sort}', expected one of: {', '.join(LISTING_SORTS)}")
+    if sort == "success" and success_model is None:
+        sort = "momentum"  # no success scores are written without the model
+    filters = {}
+    if sort == "ending":
+        # Nothing closes a campaign at its end date, so "ending soon" has to skip the ones already over
+        filters["ends_at"] = {"$gte": datetime.now(timezone.utc).isoformat()}
+    return (*LISTING_SORTS[sort], filters)
+
+
+def _timestamp(value) -> float:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return 0.0
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return 0.0
+
+
+def score_campaigns(campaigns: List[dict], now: datetime, model=None) -> List[dict]:
+    """Score rows ({"id", *SCORE_COLUMNS}) for a batch of campaign rows, computed in one vectorized pass"""
+    n = len(campaigns)
+    if not n:
+        return []
+    goal = np.maximum(np.fromiter((c.get("goal_amount") or 0 for c in campaigns), float, n), 1.0)
+    raised = np.fromiter((c.get("raised_amount") or 0 for c in campaigns), float, n)
+    backers = np.fromiter((c.get("backers_count") or 0 for c in campaigns), float, n)
+    duration = np.maximum(np.fromiter((c.get("duration_days") or 30 for c in campaigns), float, n), 1.0)
+    started = np.fromiter((_timestamp(c.get("created_at")) for c in campaigns), float, n)
+    _, category = np.unique(np.array([c.get("category") or "" for c in campaigns]), return_inverse=True)
+
+    elapsed_days = np.clip((now.timestamp() - started) / 86400, 0.0, duration)
+    funded = raised / goal
+    pace = funded / np.maximum(elapsed_days / duration, 1.0 / duration)
+    backers_per_day = backers / np.maximum(elapsed_days, 1.0)
+
+    # Category baselines: mean pace and backer rate of the category's active campaigns
+    per_category = np.bincount(category)
+    pace_baseline = np.bincount(category, weights=pace) / per_category
+    backers_baseline = np.bincount(category, weights=backers_per_day) / per_category
+    momentum = np.sqrt(pace / np.maximum(pace_baseline[category], 1e-6)
+                       * backers_per_day / np.maximum(backers_baseline[category], 1e-6))
+
+    success = model.score_many(campaigns, now) if model is not None else None
+    ends_at = started + duration * 86400
+
+    rows = []
+    for i, campaign in enumerate(campaigns):
+        row = {
+            "id": campaign["id"],
+            "funded_ratio": round(float(funded[i]), 4),
+            "momentum_score": round(float(momentum[i]), 4),
+            "ends_at": datetime.fromtimestamp(ends_at[i], timezone.utc).isoformat() if started[i] else None,
+        }
+        if success is not None:
+            row["success_score"] = float(success[i])
+        rows.append(row)
+    return rows
+
+
+async def fetch_active_campaigns() -> List[dict]:
+    """Every active campaign's scoring columns, paged by id"""
+    return await sb_find_all("campaigns", {"status": "active"}, columns=SCORING_COLUMNS, page_size=PAGE_SIZE)
+
+
+async def refresh_campaign_scores(force: bool = False) -> int:
+    """Score all active campaigns and persist the scores; returns how many were scored"""
+    now = datetime.now(timezone.utc)
+    if not force:
+        recent = (now - timedelta(seconds=CAMPAIGN_SCORE_INTERVAL_SECONDS / 2)).isoformat()
+        if await sb_find("campaigns", {"status": "active", "scored_at": {"$gte": recent}}, 1, columns="id"):
+            return 0  # another worker just did it
+
+    campaigns = await fetch_active_campaigns()
+    rows = await asyncio.to_thread(score_campaigns, campaigns, now, success_model)
+    for row in rows:
+        row["scored_at"] = now.isoformat()
+    for start in range(0, len(rows), PAGE_SIZE):
+        chunk = rows[start:start + PAGE_SIZE]
+        await sb_execute("campaigns", "rpc", supabase.rpc("apply_campaign_scores", {"scores": chunk}).execute,
+                         payload=chunk)
+    CAMPAIGNS_SCORED.set(len(rows))
+    return len(rows)
+
+
+async def campaign_scorer():
+    while True:
+        try:
+            await refresh_campaign_scores()
+        except Exception as e:
+            logger.error(f"Campaign scoring failed: {e}")
+        await asyncio.sleep(CAMPAIGN_SCORE_INTERVAL_SECONDS)
@@ -0,0 +1,191 @@
+"""
+Per-session AI chat context held in memory.
+
+Each session keeps a ring buffer of its most recent turns plus a rolling
+summary of everything older. Sessions live in an LRU bounded by count and
+expire after a period of inactivity; a session seen for the first time in this
+process is seeded once from chat_messages, after which a chat turn needs no
+database read.
+
+When the recent turns exceed the token budget, all but the newest few are
+handed to a summarizer (see ai_chat) and folded into the summary, so the
+prompt sent to Gemini stays bounded however long the conversation runs.
+Summaries are not persisted; a session reloaded after eviction or a restart
+starts again from its latest turns.
+
+Each worker has its own store, and without sticky sessions consecutive turns
+of a conversation can land on different workers. Every session therefore
+remembers the created_at of the newest chat_messages row it has seen and the
+ids of its recent turns; before answering from a cached session, ai_chat reads
+the rows from sync_overlap_seconds before that point (an indexed lookup that
+is normally empty) and merges the ones it does not know. The overlap covers
+turns another worker was still holding in its write-behind buffer.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from metrics import CHAT_CONTEXT_EVENTS
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting; Gemini averages about 4 characters per token"""
+    return (len(text or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _turn_tokens(turn: Tuple[str, str]) -> int:
+    return estimate_tokens(turn[0]) + estimate_tokens(turn[1])
+
+
+def _created_at(value) -> Optional[datetime]:
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return value if isinstance(value, datetime) else None
+
+
+class ChatSession:
+    __slots__ = ("turns", "summary", "last_used", "compacting", "message_ids", "synced_at")
+
+    def __init__(self, max_turns: int):
+        self.turns = deque(maxlen=max_turns)  # (message, response), oldest first
+        self.summary = ""
+        self.last_used = time.monotonic()
+        self.compacting = False
+        self.message_ids = deque(maxlen=max_turns * 2)  # chat_messages ids already in turns or the summary
+        self.synced_at: Optional[datetime] = None  # created_at of the newest row seen
+
+    def record_row(self, message_id: Optional[str], created_at) -> None:
+        if message_id:
+            self.message_ids.append(message_id)
+        created_at = _created_at(created_at)
+        if created_at and (self.synced_at is None or created_at > self.synced_at):
+            self.synced_at = created_at
+
+    def tokens(self) -> int:
+        return estimate_tokens(self.summary) + sum(_turn_tokens(turn) for turn in self.turns)
+
+
+class ChatContextStore:
+    def __init__(self, max_sessions: int = 10000, ttl_seconds: float = 1800, max_turns: int = 50,
+                 token_budget: int = 2000, keep_recent_turns: int = 4, sync_overlap_seconds: float = 5.0):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.keep_recent_turns = keep_recent_turns
+        self.sync_overlap = timedelta(seconds=sync_overlap_seconds)
+
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+
+    # ---- reads ----
+
+    def get(self, session_id: str) -> Optional[Tuple[str, List[Tuple[str, str]]]]:
+        """(summary, recent turns) for a live session, or None when it must be loaded"""
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or now - session.last_used > self.ttl_seconds:
+                if session is not None:
+                    del self._sessions[session_id]
+                CHAT_CONTEXT_EVENTS.inc(event="miss")
+                return None
+            session.last_used = now
+            self._sessions.move_to_end(session_id)
+            CHAT_CONTEXT_EVENTS.inc(event="hit")
+            return session.summary, list(session.turns)
+
+    def sync_since(self, session_id: str) -> Optional[str]:
+        """created_at from which to look for turns other workers stored, or None to skip the check"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.synced_at is None:
+                return None
+            return (session.synced_at - self.sync_overlap).isoformat()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    # ---- writes ----
+
+    def load(self, session_id: str, messages: Iterable[dict]) -> Tuple[str, List[Tuple[str, str]]]:
+        """Seed a session from chat_messages rows (oldest first) and return its context"""
+        with self._lock:
+            session = self._session_locked(session_id)
+            session.turns.clear()
+            for row in messages:
+                session.turns.append((row.get("message") or "", row.get("response") or ""))
+                session.record_row(row.get("id"), row.get("created_at"))
+            return session.summary, list(session.turns)
+
+    def merge(self, session_id: str, messages: Iterable[dict]) -> Tuple[str, List[Tuple[str, str]]]:
+        """Add chat_messages rows (oldest first) this worker has not seen and return the context"""
+        with self._lock:
+            session = self._session_locked(session_id)
+            merged = 0
+            for row in messages:
+                if row.get("id") in session.message_ids:
+                    continue
+                session.turns.append((row.get("message") or "", row.get("response") or ""))
+                session.record_row(row.get("id"), row.get("created_at"))
+                merged += 1
+            if merged:
+                CHAT_CONTEXT_EVENTS.inc(merged, event="merged")
+            return session.summary, list(session.turns)
+
+    def append(self, session_id: str, message: str, response: str, message_id: Optional[str] = None,
+               created_at=None) -> bool:
+        """Record a turn; True when the session is over budget and should be compacted"""
+        with self._lock:
+            session = self._session_locked(session_id)
+            session.turns.append((message, response))
+            session.record_row(message_id, created_at)
+            return self._needs_compaction_locked(session)
+
+    def begin_compaction(self, session_id: str) -> Optional[Tuple[str, List[Tuple[str, str]]]]:
+        """Claim the turns to fold into the summary: (current summary, oldest turns)"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.compacting or not self._needs_compaction_locked(session):
+                return None
+            session.compacting = True
+            return session.summary, list(session.turns)[:len(session.turns) - self.keep_recent_turns]
+
+    def finish_compaction(self, session_id: str, compacted: List[Tuple[str, str]],
+                          summary: Optional[str]) -> None:
+        """Replace the compacted turns with the new summary; None abandons the attempt"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            session.compacting = False
+            if summary is None:
+                return
+            # Turns appended meanwhile sit after the compacted ones; the ring may also have
+            # dropped some of them already, so remove only what is still at the front
+            for turn in compacted:
+                if session.turns and session.turns[0] is turn:
+                    session.turns.popleft()
+            session.summary = summary
+            CHAT_CONTEXT_EVENTS.inc(event="compaction")
+
+    def _session_locked(self, session_id: str) -> ChatSession:
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = ChatSession(self.max_turns)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                CHAT_CONTEXT_EVENTS.inc(event="eviction")
+        session.last_used = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _needs_compaction_locked(self, session: ChatSession) -> bool:
+        return len(session.turns) > self.keep_recent_turns and session.tokens() > self.token_budget
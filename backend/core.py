@@ -0,0 +1,381 @@
+"""
+Shared state and helpers for the API routers: configuration, the lazily
+created SDK clients, Supabase/Gemini/Stripe call helpers and authentication
+"""
+from fastapi import Request
+from pydantic import BaseModel
+from dotenv import load_dotenv
+import os
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import List, Optional, Type, TypeVar
+from datetime import datetime, timezone
+import bcrypt
+from home_feed import HomeFeed
+from chat_context import ChatContextStore
+from write_behind import WriteBehindBuffer
+from rate_limit import QuotaLimiter, make_backend
+from token_usage import TokenUsageLedger, usage_tokens
+from structured_output import StructuredOutputError, parse_structured, repair_prompt
+from sb_bulk import insert_many, upsert_many
+from metrics import DB_LATENCY, GEMINI_LATENCY, GEMINI_TOKENS, STRIPE_LATENCY, STRUCTURED_OUTPUTS
+from tracing import tracer
+from profiler import RequestProfiler
+from slow_calls import SlowCallLog, parse_thresholds
+from lazy import Lazy, lazy_module
+from models import User
+
+T = TypeVar("T", bound=BaseModel)
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+# Heavy SDKs are imported on first use so workers become ready quickly;
+# LAZY_IMPORT_WARMUP (off | background | startup) controls the warm-up hook.
+genai = lazy_module("google.generativeai")
+stripe = lazy_module("stripe")
+
+def create_supabase_client():
+    from supabase import create_client
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+# Supabase connection
+SUPABASE_URL = os.environ['SUPABASE_URL']
+SUPABASE_KEY = os.environ['SUPABASE_KEY']
+supabase = Lazy("supabase client", create_supabase_client)
+LAZY_IMPORT_WARMUP = os.environ.get('LAZY_IMPORT_WARMUP', 'background')
+
+# Slow-call log for Supabase, Gemini and Stripe; thresholds are per call kind
+slow_calls = SlowCallLog(
+    thresholds_ms=parse_thresholds(os.environ.get('SLOW_CALL_THRESHOLDS_MS', 'db=250,gemini=8000,stripe=2000')),
+    sample_rate=float(os.environ.get('SLOW_CALL_SAMPLE_RATE', '0.01')),
+    window_seconds=int(os.environ.get('SLOW_CALL_WINDOW_MINUTES', '15')) * 60,
+)
+
+# Helper functions for Supabase
+# The Supabase client is synchronous, so queries run in a worker thread to keep
+# the event loop free and let independent lookups proceed concurrently.
+def handle_supabase_response(response):
+    """Extract data from Supabase response"""
+    if hasattr(response, 'data'):
+        return response.data
+    return response
+
+async def sb_execute(table: str, operation: str, fn, *args, filters: dict = None, payload=None):
+    """Run a blocking Supabase call in a worker thread, timed by table and operation"""
+    attributes = {"db.system": "supabase", "db.sql.table": table, "db.operation": operation}
+    with tracer.span(f"supabase {operation} {table}", kind="client", attributes=attributes), \
+            DB_LATENCY.time(table=table, operation=operation), \
+            slow_calls.track("db", table, operation, filters=filters, payload=payload) as call:
+        call.result = await asyncio.to_thread(fn, *args)
+        return call.result
+
+async def sb_find_one(table: str, filters: dict):
+    """Find one record from Supabase table"""
+    query = supabase.table(table).select("*")
+    for key, value in filters.items():
+        query = query.eq(key, value)
+    result = await sb_execute(table, "select", query.limit(1).execute, filters=filters)
+    data = handle_supabase_response(result)
+    return data[0] if data else None
+
+async def sb_find(table: str, filters: dict = None, limit: int = 1000, columns: str = "*",
+                  order_by: str = None, desc: bool = False):
+    """Find multiple records from Supabase table, optionally ordered server-side before the limit"""
+    query = supabase.table(table).select(columns)
+    if filters:
+        for key, value in filters.items():
+            if isinstance(value, dict):
+                # Handle special queries
+                if "$regex" in value:
+                    # Supabase uses ilike for pattern matching
+                    search_term = value["$regex"]
+                    query = query.ilike(key, f"%{search_term}%")
+                if "$in" in value:
+                    query = query.in_(key, value["$in"])
+                for op in ("gt", "gte", "lt", "lte"):
+                    if f"${op}" in value:
+                        query = getattr(query, op)(key, value[f"${op}"])
+            else:
+                query = query.eq(key, value)
+    if order_by:
+        query = query.order(order_by, desc=desc)
+    result = await sb_execute(table, "select", query.limit(limit).execute, filters=filters)
+    return handle_supabase_response(result) or []
+
+async def sb_find_all(table: str, filters: dict = None, columns: str = "*", page_size: int = 1000):
+    """Every matching record, read in id order one page at a time (PostgREST caps a response at max-rows)"""
+    rows, last_id = [], None
+    while True:
+        page_filters = dict(filters or {})
+        if last_id is not None:
+            page_filters["id"] = {"$gt": last_id}
+        page = await sb_find(table, page_filters, page_size, columns=columns, order_by="id")
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        last_id = page[-1]["id"]
+
+async def sb_insert(table: str, data: dict):
+    """Insert a record into Supabase table"""
+    clean_data = {k: v for k, v in data.items() if k != '_id' and v is not None}
+    result = await sb_execute(table, "insert", supabase.table(table).insert(clean_data).execute, payload=clean_data)
+    inserted = handle_supabase_response(result)
+    return inserted[0] if inserted else None
+
+async def sb_insert_many(table: str, rows: List[dict], chunk_size: int = 500, returning_minimal: bool = True):
+    """Insert many records into Supabase table, one request per chunk"""
+    return await sb_execute(
+        table, "insert_many", insert_many, supabase, table, rows, chunk_size, returning_minimal, payload=rows
+    )
+
+async def sb_upsert_many(table: str, rows: List[dict], on_conflict: str = "id", ignore_duplicates: bool = False,
+                         chunk_size: int = 500, returning_minimal: bool = True):
+    """Insert or update many records in Supabase table, matching on the on_conflict columns"""
+    return await sb_execute(
+        table, "upsert_many", upsert_many, supabase, table, rows, on_conflict, ignore_duplicates, chunk_size,
+        returning_minimal, payload=rows
+    )
+
+async def sb_update(table: str, filters: dict, update_data: dict):
+    """Update records in Supabase table"""
+    # Remove $set wrapper if present
+    if "$set" in update_data:
+        update_data = update_data["$set"]
+    
+    query = supabase.table(table).update(update_data)
+    for key, value in filters.items():
+        query = query.eq(key, value)
+    result = await sb_execute(table, "update", query.execute, filters=filters, payload=update_data)
+    return handle_supabase_response(result)
+
+async def sb_delete(table: str, filters: dict):
+    """Delete records from Supabase table"""
+    query = supabase.table(table).delete()
+    for key, value in filters.items():
+        query = query.eq(key, value)
+    result = await sb_execute(table, "delete", query.execute, filters=filters)
+    return handle_supabase_response(result)
+
+# Helpers for Gemini and Stripe
+# Both SDKs are blocking as well; calls run in a worker thread, are timed per
+# endpoint/operation for /metrics, traced as client spans and fed to the slow-call log.
+GEMINI_MODEL = 'gemini-2.0-flash-exp'
+
+def gemini_model():
+    genai.configure(api_key=os.environ.get('GEMINI_API_KEY'))
+    return genai.GenerativeModel(GEMINI_MODEL)
+
+# Token usage per day, endpoint and user; flushed to gemini_usage_daily by server.py
+token_usage = TokenUsageLedger()
+TOKEN_USAGE_FLUSH_SECONDS = int(os.environ.get('TOKEN_USAGE_FLUSH_SECONDS', '60'))
+
+async def gemini_generate(endpoint: str, prompt: str, user_id: Optional[str] = None,
+                          generation_config: Optional[dict] = None):
+    """Generate content with Gemini, timed and token-counted under the calling endpoint's name"""
+    model = gemini_model()
+    attributes = {"gen_ai.system": "gemini", "gen_ai.request.model": GEMINI_MODEL, "endpoint": endpoint,
+                  "prompt.chars": len(prompt)}
+    start = time.perf_counter()
+    with tracer.span(f"gemini generate_content {endpoint}", kind="client", attributes=attributes) as span, \
+            GEMINI_LATENCY.time(endpoint=endpoint), \
+            slow_calls.track("gemini", endpoint, "generate_content", payload=prompt):
+        try:
+            if generation_config:
+                response = await asyncio.to_thread(model.generate_content, prompt, generation_config=generation_config)
+            else:
+                response = await asyncio.to_thread(model.generate_content, prompt)
+        except Exception:
+            token_usage.record(endpoint, user_id, latency_ms=(time.perf_counter() - start) * 1000, error=True)
+            raise
+        prompt_tokens, completion_tokens, cached_tokens = usage_tokens(response)
+        # Context-cached tokens are still a billed call; cache_hit is only for answers served from storage
+        token_usage.record(endpoint, user_id, prompt_tokens, completion_tokens, cached_tokens,
+                           latency_ms=(time.perf_counter() - start) * 1000)
+        GEMINI_TOKENS.inc(prompt_tokens, endpoint=endpoint, kind="prompt")
+        GEMINI_TOKENS.inc(completion_tokens, endpoint=endpoint, kind="completion")
+        span.set_attribute("gen_ai.usage.input_tokens", prompt_tokens)
+        span.set_attribute("gen_ai.usage.output_tokens", completion_tokens)
+        return response
+
+JSON_MODE = {"response_mime_type": "application/json"}
+STRUCTURED_OUTPUT_RETRIES = int(os.environ.get('STRUCTURED_OUTPUT_RETRIES', '1'))
+
+async def gemini_structured(endpoint: str, prompt: str, schema: Type[T], user_id: Optional[str] = None,
+                            retries: int = STRUCTURED_OUTPUT_RETRIES) -> T:
+    """Generate JSON in JSON mode and validate it against `schema`, asking Gemini to repair invalid output"""
+    response = await gemini_generate(endpoint, prompt, user_id, generation_config=JSON_MODE)
+    text = response.text
+    for attempt in range(retries + 1):
+        try:
+            result = parse_structured(text, schema)
+            STRUCTURED_OUTPUTS.inc(endpoint=endpoint, outcome="repaired" if attempt else "valid")
+            return result
+        except StructuredOutputError as e:
+            logging.warning(f"{endpoint}: invalid structured output (attempt {attempt + 1}): {e}")
+            if attempt == retries:
+                STRUCTURED_OUTPUTS.inc(endpoint=endpoint, outcome="failed")
+                raise
+            response = await gemini_generate(f"{endpoint}_repair", repair_prompt(text, schema, e), user_id,
+                                             generation_config=JSON_MODE)
+            text = response.text
+
+def record_cached_answer(endpoint: str, user_id: Optional[str] = None):
+    """Count an answer served from our stored results instead of a Gemini call"""
+    token_usage.record(endpoint, user_id, cache_hit=True)
+
+async def flush_token_usage():
+    """Add this worker's token usage deltas to gemini_usage_daily"""
+    rows = token_usage.drain()
+    if not rows:
+        return
+    try:
+        await sb_execute("gemini_usage_daily", "rpc", supabase.rpc("record_gemini_usage", {"rows": rows}).execute,
+                         payload=rows)
+    except Exception:
+        token_usage.restore(rows)
+        raise
+
+async def stripe_call(operation: str, fn, *args, **kwargs):
+    """Call a Stripe API function, timed under the given operation name"""
+    stripe.api_key = os.environ.get('STRIPE_API_KEY')
+    with tracer.span(f"stripe {operation}", kind="client", attributes={"stripe.operation": operation}), \
+            STRIPE_LATENCY.time(operation=operation), \
+            slow_calls.track("stripe", "stripe", operation, payload=kwargs or None):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+# In-memory landing page feed, kept current by campaign and pledge writes
+home_feed = HomeFeed(
+    section_size=int(os.environ.get('HOME_FEED_SECTION_SIZE', '6')),
+    velocity_window_hours=float(os.environ.get('HOME_FEED_VELOCITY_HOURS', '72')),
+)
+HOME_FEED_REFRESH_SECONDS = int(os.environ.get('HOME_FEED_REFRESH_SECONDS', '300'))
+
+# Recent turns and rolling summaries per AI chat session, so a turn needs no history read
+chat_contexts = ChatContextStore(
+    max_sessions=int(os.environ.get('CHAT_CONTEXT_MAX_SESSIONS', '10000')),
+    ttl_seconds=int(os.environ.get('CHAT_CONTEXT_TTL_MINUTES', '30')) * 60,
+    token_budget=int(os.environ.get('CHAT_CONTEXT_TOKEN_BUDGET', '2000')),
+    keep_recent_turns=int(os.environ.get('CHAT_CONTEXT_KEEP_TURNS', '4')),
+    sync_overlap_seconds=float(os.environ.get('CHAT_CONTEXT_SYNC_OVERLAP_SECONDS', '5')),
+)
+
+# Chat turns are written in batches after the reply; see write_behind.py for the loss window
+chat_message_writer = WriteBehindBuffer(
+    "chat_messages",
+    lambda rows: sb_insert_many("chat_messages", rows),
+    max_batch=int(os.environ.get('CHAT_WRITE_BATCH_SIZE', '200')),
+    flush_interval=int(os.environ.get('CHAT_WRITE_FLUSH_MS', '250')) / 1000,
+    max_pending=int(os.environ.get('CHAT_WRITE_MAX_PENDING', '5000')),
+)
+
+# Fire-and-forget work started by request handlers; awaited on shutdown
+background_tasks = set()
+
+def spawn_background(coro, name: str):
+    """Run a coroutine after the response, logging its failure instead of losing it"""
+    async def runner():
+        try:
+            await coro
+        except Exception as e:
+            logging.error(f"Background task {name} failed: {e}")
+    task = asyncio.create_task(runner(), name=name)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+# Quotas for the Gemini-backed routers (ai, analytics); see rate_limit.py
+ai_limiter = QuotaLimiter(
+    "ai",
+    make_backend(os.environ.get('RATE_LIMIT_BACKEND')),
+    user_burst=float(os.environ.get('AI_USER_BURST', '10')),
+    user_per_minute=float(os.environ.get('AI_USER_PER_MINUTE', '20')),
+    global_burst=float(os.environ.get('AI_GLOBAL_BURST', '100')),
+    global_per_minute=float(os.environ.get('AI_GLOBAL_PER_MINUTE', '600')),
+    max_in_flight=int(os.environ.get('AI_MAX_IN_FLIGHT', '32')),
+    queue_timeout=int(os.environ.get('AI_QUEUE_TIMEOUT_MS', '1000')) / 1000,
+)
+
+# Per-request profiling; the middleware lives in server.py, the controls in routers/admin.py
+request_profiler = RequestProfiler()
+
+# ============ HELPER FUNCTIONS ============
+
+async def get_supabase_user(request: Request):
+    """Get user from Supabase JWT token"""
+    auth_header = request.headers.get("authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        return None
+    
+    token = auth_header.split(" ")[1]
+    
+    try:
+        # Verify token and get user from Supabase
+        user_response = await sb_execute("auth", "get_user", supabase.auth.get_user, token)
+        if user_response and user_response.user:
+            supabase_user = user_response.user
+            # Create User object from Supabase user
+            return User(
+                id=supabase_user.id,
+                email=supabase_user.email,
+                name=supabase_user.user_metadata.get('name', supabase_user.email.split('@')[0]),
+                is_admin=supabase_user.app_metadata.get('is_admin', False),
+                created_at=datetime.fromisoformat(supabase_user.created_at) if isinstance(supabase_user.created_at, str) else supabase_user.created_at
+            )
+    except Exception as e:
+        print(f"Error verifying Supabase token: {e}")
+        return None
+
+async def get_current_user(request: Request) -> Optional[User]:
+    # Resolved once per request; the rate-limit dependency and the handler both ask
+    if not hasattr(request.state, "user"):
+        request.state.user = await resolve_current_user(request)
+    return request.state.user
+
+def quota_caller(request: Request, user: Optional[User]) -> str:
+    return f"user:{user.id}" if user else f"ip:{request.client.host if request.client else 'unknown'}"
+
+async def ai_quota(request: Request):
+    """Router dependency: per-user and global Gemini quotas plus the in-flight cap"""
+    user = await get_current_user(request)
+    async with ai_limiter.limit(quota_caller(request, user)):
+        yield
+
+async def resolve_current_user(request: Request) -> Optional[User]:
+    # First try to get user from Supabase JWT token (for frontend auth)
+    supabase_user = await get_supabase_user(request)
+    if supabase_user:
+        return supabase_user
+    
+    # Fallback to session_token for backend auth
+    session_token = request.cookies.get("session_token")
+    
+    if not session_token:
+        auth_header = request.headers.get("authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            session_token = auth_header.split(" ")[1]
+    
+    if not session_token:
+        return None
+    
+    session = await sb_find_one("user_sessions", {"session_token": session_token})
+    if not session or datetime.fromisoformat(session["expires_at"]) < datetime.now(timezone.utc):
+        return None
+    
+    user_doc = await sb_find_one("users", {"id": session["user_id"]})
+    if not user_doc:
+        return None
+    
+    if isinstance(user_doc['created_at'], str):
+        user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
+    
+    return User(**user_doc)
+
+def hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+def verify_password(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
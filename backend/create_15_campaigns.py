@@ -5,6 +5,7 @@ import uuid
 from supabase import create_client, Client
 from dotenv import load_dotenv
 from pathlib import Path
+from sb_bulk import chunked, insert_many
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -188,43 +189,45 @@ async def create_campaigns():
         try:
             existing = supabase.table("campaigns").select("id").execute()
             if existing.data:
-                for camp in existing.data:
-                    supabase.table("campaigns").delete().eq("id", camp["id"]).execute()
+                for chunk in chunked(existing.data, 200):
+                    supabase.table("campaigns").delete().in_("id", [camp["id"] for camp in chunk]).execute()
                 print(f"✅ Deleted {len(existing.data)} existing campaigns")
         except Exception as e:
             print(f"⚠️  Deletion note: {e}")
         
         # Insert 15 new campaigns
         print("\n📝 Creating 15 new campaigns...")
+        campaigns = [
+            {
+                "id": str(uuid.uuid4()),
+                "title": campaign_data["title"],
+                "description": campaign_data["description"],
+                "category": campaign_data["category"],
+                "goal_amount": campaign_data["goal_amount"],
+                "raised_amount": campaign_data["raised_amount"],
+                "backers_count": campaign_data["backers_count"],
+                "creator_id": creator_user_id,
+                "creator_name": "Demo Campaign Creator",
+                "image_url": campaign_data["image_url"],
+                "status": "active",
+                "duration_days": 30,
+                "tags": [campaign_data["category"].lower()],
+                "reward_tiers": [],
+                "created_at": datetime.now(timezone.utc).isoformat()
+            }
+            for campaign_data in CAMPAIGNS
+        ]
+        
         created_count = 0
-        for campaign_data in CAMPAIGNS:
-            try:
-                campaign = {
-                    "id": str(uuid.uuid4()),
-                    "title": campaign_data["title"],
-                    "description": campaign_data["description"],
-                    "category": campaign_data["category"],
-                    "goal_amount": campaign_data["goal_amount"],
-                    "raised_amount": campaign_data["raised_amount"],
-                    "backers_count": campaign_data["backers_count"],
-                    "creator_id": creator_user_id,
-                    "creator_name": "Demo Campaign Creator",
-                    "image_url": campaign_data["image_url"],
-                    "status": "active",
-                    "duration_days": 30,
-                    "tags": [campaign_data["category"].lower()],
-                    "reward_tiers": [],
-                    "created_at": datetime.now(timezone.utc).isoformat()
-                }
-                
-                result = supabase.table("campaigns").insert(campaign).execute()
-                if result.data:
-                    created_count += 1
-                    funded_pct = (campaign_data["raised_amount"] / campaign_data["goal_amount"]) * 100
-                    status = "✅ FULLY FUNDED" if funded_pct >= 100 else f"📊 {funded_pct:.0f}% funded"
-                    print(f"  ✓ {campaign_data['category']:15} - {campaign_data['title'][:40]:40} {status}")
-            except Exception as e:
-                print(f"  ✗ Error creating {campaign_data['title']}: {e}")
+        try:
+            inserted = insert_many(supabase, "campaigns", campaigns, returning_minimal=False)
+            created_count = len(inserted)
+            for campaign_data in CAMPAIGNS:
+                funded_pct = (campaign_data["raised_amount"] / campaign_data["goal_amount"]) * 100
+                status = "✅ FULLY FUNDED" if funded_pct >= 100 else f"📊 {funded_pct:.0f}% funded"
+                print(f"  ✓ {campaign_data['category']:15} - {campaign_data['title'][:40]:40} {status}")
+        except Exception as e:
+            print(f"  ✗ Error creating campaigns: {e}")
         
         print(f"\n✅ Successfully created {created_count} campaigns!")
         print(f"📊 Categories covered: {len(set(c['category'] for c in CAMPAIGNS))}")
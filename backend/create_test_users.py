@@ -8,6 +8,7 @@ from dotenv import load_dotenv
 import bcrypt
 import uuid
 from datetime import datetime, timezone
+from sb_bulk import upsert_many
 
 # Load environment variables
 load_dotenv('.env')
@@ -19,47 +20,36 @@ def hash_password(password: str) -> str:
     """Hash password using bcrypt"""
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
-def create_or_update_user(email: str, password: str, name: str, is_admin: bool = False):
-    """Create or update a user with known password"""
+def create_or_update_users(users: list) -> int:
+    """Create or update users with known passwords in one bulk upsert on email"""
+    emails = [user['email'] for user in users]
     try:
-        # Check if user already exists
-        existing = supabase.table('users').select('*').eq('email', email).execute()
+        # Reuse ids of existing users so upserting on email never rewrites a primary key
+        existing = supabase.table('users').select('id,email,created_at').in_('email', emails).execute()
+        existing_by_email = {row['email']: row for row in existing.data or []}
         
-        password_hash = hash_password(password)
+        rows = []
+        for user in users:
+            current = existing_by_email.get(user['email'], {})
+            rows.append({
+                'id': current.get('id', str(uuid.uuid4())),
+                'email': user['email'],
+                'name': user['name'],
+                'password_hash': hash_password(user['password']),
+                'is_admin': user['is_admin'],
+                'created_at': current.get('created_at', datetime.now(timezone.utc).isoformat())
+            })
         
-        if existing.data:
-            # Update existing user
-            result = supabase.table('users').update({
-                'password_hash': password_hash,
-                'name': name,
-                'is_admin': is_admin
-            }).eq('email', email).execute()
-            
-            if result.data:
-                print(f"✅ Updated user: {email}")
-                return True
-        else:
-            # Create new user
-            user_data = {
-                'id': str(uuid.uuid4()),
-                'email': email,
-                'name': name,
-                'password_hash': password_hash,
-                'is_admin': is_admin,
-                'created_at': datetime.now(timezone.utc).isoformat()
-            }
-            
-            result = supabase.table('users').insert(user_data).execute()
-            
-            if result.data:
-                print(f"✅ Created user: {email}")
-                return True
+        upsert_many(supabase, 'users', rows, on_conflict='email')
         
-        return False
-            
+        for user in users:
+            action = "Updated" if user['email'] in existing_by_email else "Created"
+            print(f"✅ {action} user: {user['email']}")
+        return len(rows)
+    
     except Exception as e:
-        print(f"❌ Error with {email}: {str(e)}")
-        return False
+        print(f"❌ Error creating test users: {str(e)}")
+        return 0
 
 print("🔧 Setting up Test Users for FundAI/CampaignIQ\n")
 print("=" * 80)
@@ -107,13 +97,7 @@ test_users = [
 ]
 
 # Create/update all test users
-for user in test_users:
-    create_or_update_user(
-        email=user['email'],
-        password=user['password'],
-        name=user['name'],
-        is_admin=user['is_admin']
-    )
+create_or_update_users(test_users)
 
 print("\n" + "=" * 80)
 print("\n📋 USER CREDENTIALS LIST")
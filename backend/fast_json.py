@@ -0,0 +1,46 @@
+"""
+Fast JSON encoding for API responses.
+
+Supabase already hands back rows as JSON-compatible dicts (timestamps are ISO
+strings), so listing endpoints can serialize them directly instead of parsing
+every timestamp, validating against a pydantic model and re-encoding.
+"""
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib encoder
+    orjson = None
+
+
+def _default(value: Any):
+    """Encode the few non-JSON types that can show up in response payloads"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that skips FastAPI's jsonable_encoder/validation round trip"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
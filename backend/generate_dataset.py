@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Generate a large synthetic dataset for load testing.
+
+Produces users, campaigns, pledges, payment transactions, comments and chat
+messages with production-like distributions (skewed creators, heavy-tailed
+backer counts, log-normal goals). Output is fully deterministic for a given
+--seed. Rows are streamed, so 10M campaigns never sit in memory at once.
+
+Examples:
+    # CSV files + load.sql for psql \\copy
+    python generate_dataset.py --campaigns 1000000 --out ./dataset
+
+    # Write straight into the Supabase project from .env in bulk
+    python generate_dataset.py --campaigns 100000 --direct
+"""
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+COLUMNS = {
+    "users": ["id", "email", "name", "picture", "password_hash", "is_admin", "created_at"],
+    "campaigns": [
+        "id", "title", "description", "category", "goal_amount", "raised_amount", "creator_id",
+        "creator_name", "image_url", "status", "backers_count", "duration_days", "tags",
+        "reward_tiers", "created_at",
+    ],
+    "pledges": ["id", "campaign_id", "user_id", "amount", "session_id", "payment_status", "created_at"],
+    "payment_transactions": [
+        "id", "session_id", "amount", "currency", "campaign_id", "user_id", "metadata",
+        "payment_status", "created_at",
+    ],
+    "comments": ["id", "campaign_id", "user_id", "user_name", "content", "created_at"],
+    "chat_messages": ["id", "user_id", "session_id", "message", "response", "created_at"],
+}
+# Load order respecting foreign keys
+TABLES = list(COLUMNS)
+PARENTS = {
+    "campaigns": ["users"],
+    "pledges": ["campaigns"],
+    "payment_transactions": ["campaigns"],
+    "comments": ["campaigns"],
+    "chat_messages": ["users"],
+}
+
+CATEGORIES = [
+    ("Technology", 18), ("Games", 10), ("Design", 9), ("Health", 8), ("Food", 8),
+    ("Education", 7), ("Environment", 6), ("Art", 6), ("Music", 6), ("Film", 5),
+    ("Fashion", 5), ("Publishing", 4), ("Community", 3), ("Sports", 3), ("Travel", 2),
+]
+PLEDGE_AMOUNTS = [(500.0, 70), (2500.0, 22), (5000.0, 8)]
+STATUSES = [("active", 85), ("completed", 10), ("draft", 5)]
+
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Meera", "Arjun", "Kavya", "Ishaan", "Diya",
+               "Liam", "Emma", "Noah", "Olivia", "Mateo", "Sofia", "Kenji", "Yuki", "Omar", "Layla"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Reddy", "Gupta", "Nair", "Singh", "Das", "Mehta", "Rao",
+              "Smith", "Garcia", "Tanaka", "Hassan", "Kim", "Silva", "Muller", "Rossi", "Cohen", "Novak"]
+ADJECTIVES = ["Smart", "Eco", "Portable", "Handmade", "Solar", "Modular", "Open", "Urban", "Minimal",
+              "Heritage", "Wireless", "Community", "Zero-Waste", "Interactive", "Adaptive"]
+NOUNS = ["Garden", "Backpack", "Cookbook", "Keyboard", "Water Bottle", "Board Game", "Documentary",
+         "Bike Light", "Album", "Learning Kit", "Coffee Roaster", "Sneakers", "Telescope", "Library",
+         "Planter", "Speaker", "Notebook", "Desk Lamp"]
+SENTENCES = [
+    "We have spent two years prototyping and testing with early users.",
+    "Every pledge goes directly into manufacturing the first production run.",
+    "Our team combines engineers, designers and community organisers.",
+    "The product is built from sustainable, locally sourced materials.",
+    "Backers get exclusive early access and behind-the-scenes updates.",
+    "We partnered with local workshops to keep production ethical.",
+    "Stretch goals unlock new colours, accessories and translations.",
+    "Shipping is planned for three months after the campaign closes.",
+    "All designs will be released under an open licence.",
+    "A portion of the proceeds supports education programmes in our city.",
+]
+COMMENTS = [
+    "Just backed this, can't wait!", "Will this ship internationally?", "Love the design.",
+    "Any update on the timeline?", "Shared with my friends, good luck!", "Is there a student discount?",
+    "The prototype video looks great.", "Backed at the top tier!", "How durable is it?",
+]
+CHAT_MESSAGES = [
+    ("How do I start a campaign?", "Click 'Start Your Campaign' on the home page and follow the wizard."),
+    ("What goal amount should I set?", "Pick the minimum you need to deliver; campaigns under target goals succeed more often."),
+    ("How do reward tiers work?", "Backers choose a tier when pledging; each tier lists what they receive."),
+    ("Can I edit my campaign after launch?", "Yes, you can update the title, description and image from My Campaigns."),
+    ("When do I receive the funds?", "Funds are released after the campaign ends and payments settle."),
+]
+
+
+def weighted(choices):
+    values = [value for value, _ in choices]
+    weights = [weight for _, weight in choices]
+    return values, weights
+
+
+class Generator:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.now = datetime(2025, 1, 1, tzinfo=timezone.utc) if args.fixed_now else datetime.now(timezone.utc)
+        self.categories = weighted(CATEGORIES)
+        self.pledge_amounts = weighted(PLEDGE_AMOUNTS)
+        self.statuses = weighted(STATUSES)
+
+    def stable_uuid(self, kind: str, index: int) -> str:
+        """UUID derived from (seed, kind, index) so rows can reference each other without lookups"""
+        digest = hashlib.blake2b(f"{self.args.seed}:{kind}:{index}".encode(), digest_size=16).digest()
+        return str(uuid.UUID(bytes=digest, version=4))
+
+    def random_uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def user_name(self, index: int) -> str:
+        first = FIRST_NAMES[index % len(FIRST_NAMES)]
+        last = LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        return f"{first} {last}"
+
+    def skewed_user(self) -> int:
+        # Power-law: a small share of users creates/backs most campaigns
+        return min(self.args.users - 1, int(self.args.users * self.rng.random() ** 3))
+
+    def timestamp_before(self, end: datetime, max_days: float) -> datetime:
+        return end - timedelta(seconds=self.rng.random() * max_days * 86400)
+
+    def heavy_tail_count(self, mean: float) -> int:
+        """Pareto-distributed count with the requested mean (alpha=1.5)"""
+        if mean <= 0:
+            return 0
+        alpha = 1.5
+        scale = mean * (alpha - 1) / alpha
+        return int(scale * self.rng.paretovariate(alpha))
+
+    # ---- tables ----
+
+    def users(self):
+        for i in range(self.args.users):
+            yield {
+                "id": self.stable_uuid("user", i),
+                "email": f"user{i}@loadtest.example.com",
+                "name": self.user_name(i),
+                "picture": None,
+                "password_hash": None,
+                "is_admin": i == 0,
+                "created_at": self.timestamp_before(self.now, 730).isoformat(),
+            }
+
+    def campaign_with_activity(self, index: int):
+        """Yield (table, row) for one campaign and its pledges, transactions and comments"""
+        rng = self.rng
+        campaign_id = self.stable_uuid("campaign", index)
+        creator = self.skewed_user()
+        category = rng.choices(*self.categories)[0]
+        status = rng.choices(*self.statuses)[0]
+        created_at = self.timestamp_before(self.now, 365)
+        duration = rng.choice([15, 30, 30, 30, 45, 60])
+        goal = max(5000.0, round(math.exp(rng.gauss(math.log(60000), 1.0)) / 500) * 500)
+
+        raised = 0.0
+        backers = 0
+        activity = []
+        if status != "draft":
+            for _ in range(min(self.heavy_tail_count(self.args.pledges_per_campaign), self.args.max_pledges)):
+                backer = self.skewed_user()
+                amount = rng.choices(*self.pledge_amounts)[0]
+                pledged_at = min(self.now, created_at + timedelta(seconds=rng.random() * duration * 86400))
+                session_id = f"cs_test_{rng.getrandbits(96):024x}"
+                paid = rng.random() < 0.9
+                tx_status = "paid" if paid else rng.choice(["expired", "open", "initiated"])
+                activity.append(("payment_transactions", {
+                    "id": self.random_uuid(),
+                    "session_id": session_id,
+                    "amount": amount,
+                    "currency": "inr",
+                    "campaign_id": campaign_id,
+                    "user_id": self.stable_uuid("user", backer),
+                    "metadata": json.dumps({"campaign_id": campaign_id, "user_id": self.stable_uuid("user", backer)}),
+                    "payment_status": tx_status,
+                    "created_at": pledged_at.isoformat(),
+                }))
+                if paid:
+                    raised += amount
+                    backers += 1
+                    activity.append(("pledges", {
+                        "id": self.random_uuid(),
+                        "campaign_id": campaign_id,
+                        "user_id": self.stable_uuid("user", backer),
+                        "amount": amount,
+                        "session_id": session_id,
+                        "payment_status": "paid",
+                        "created_at": pledged_at.isoformat(),
+                    }))
+
+        title = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} #{index}"
+        tiers = sorted(rng.sample([500, 1000, 2500, 5000, 10000], rng.randint(0, 4)))
+        # Pledges are generated first so raised/backers match them, but the campaign
+        # row is emitted before them so bulk inserts never reference a missing parent
+        yield "campaigns", {
+            "id": campaign_id,
+            "title": title,
+            "description": " ".join(rng.sample(SENTENCES, rng.randint(2, len(SENTENCES)))),
+            "category": category,
+            "goal_amount": goal,
+            "raised_amount": raised,
+            "creator_id": self.stable_uuid("user", creator),
+            "creator_name": self.user_name(creator),
+            "image_url": f"https://picsum.photos/seed/{index}/800/600",
+            "status": status,
+            "backers_count": backers,
+            "duration_days": duration,
+            "tags": [category.lower()] + (["featured"] if rng.random() < 0.05 else []),
+            "reward_tiers": [{"amount": float(t), "description": f"Tier {n + 1} reward"} for n, t in enumerate(tiers)],
+            "created_at": created_at.isoformat(),
+        }
+        yield from activity
+
+        for _ in range(self.heavy_tail_count(self.args.comments_per_campaign)):
+            commenter = self.skewed_user()
+            yield "comments", {
+                "id": self.random_uuid(),
+                "campaign_id": campaign_id,
+                "user_id": self.stable_uuid("user", commenter),
+                "user_name": self.user_name(commenter),
+                "content": rng.choice(COMMENTS),
+                "created_at": self.timestamp_before(self.now, (self.now - created_at).days + 1).isoformat(),
+            }
+
+    def chat_messages(self):
+        rng = self.rng
+        for s in range(self.args.chat_sessions):
+            session_id = self.stable_uuid("chat", s)
+            user_id = self.stable_uuid("user", self.skewed_user()) if rng.random() < 0.7 else None
+            started = self.timestamp_before(self.now, 90)
+            for turn in range(max(1, self.heavy_tail_count(self.args.turns_per_session))):
+                message, response = rng.choice(CHAT_MESSAGES)
+                yield {
+                    "id": self.random_uuid(),
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "message": message,
+                    "response": response,
+                    "created_at": (started + timedelta(seconds=turn * 45)).isoformat(),
+                }
+
+    def rows(self):
+        """All (table, row) pairs in an order that respects foreign keys"""
+        for row in self.users():
+            yield "users", row
+        for i in range(self.args.campaigns):
+            yield from self.campaign_with_activity(i)
+        for row in self.chat_messages():
+            yield "chat_messages", row
+
+
+# ---- writers ----
+
+JSON_COLUMNS = {"reward_tiers", "metadata"}
+
+
+def pg_value(column: str, value):
+    """Format a value for COPY ... CSV (None becomes an unquoted empty field = NULL)"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if column in JSON_COLUMNS:
+        return value if isinstance(value, str) else json.dumps(value)
+    if isinstance(value, list):
+        return "{" + ",".join('"' + v.replace('"', '\\"') + '"' for v in value) + "}"
+    return value
+
+
+class CSVWriter:
+    def __init__(self, out_dir: Path):
+        self.out_dir = out_dir
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.files = {}
+        self.writers = {}
+        for table, columns in COLUMNS.items():
+            handle = open(out_dir / f"{table}.csv", "w", newline="", encoding="utf-8")
+            writer = csv.writer(handle)
+            writer.writerow(columns)
+            self.files[table] = handle
+            self.writers[table] = writer
+
+    def write(self, table: str, row: dict):
+        self.writers[table].writerow([pg_value(c, row[c]) for c in COLUMNS[table]])
+
+    def close(self):
+        for handle in self.files.values():
+            handle.close()
+        with open(self.out_dir / "load.sql", "w", encoding="utf-8") as f:
+            f.write("-- Load with: psql \"$DATABASE_URL\" -f load.sql (run from this directory)\n")
+            f.write("BEGIN;\n")
+            for table in TABLES:
+                f.write(f"\\copy {table} ({', '.join(COLUMNS[table])}) FROM '{table}.csv' WITH (FORMAT csv, HEADER true)\n")
+            f.write("COMMIT;\nANALYZE;\n")
+
+
+class DirectWriter:
+    """Buffers rows per table and bulk inserts them, flushing parent tables first"""
+
+    def __init__(self, chunk_size: int):
+        from supabase import create_client
+        from sb_bulk import insert_many
+
+        self.client = create_client(os.environ['SUPABASE_URL'], os.environ['SUPABASE_KEY'])
+        self.insert_many = insert_many
+        self.chunk_size = chunk_size
+        self.buffers = {table: [] for table in TABLES}
+
+    def flush(self, table: str):
+        for parent in PARENTS.get(table, []):
+            self.flush(parent)
+        if self.buffers[table]:
+            self.insert_many(self.client, table, self.buffers[table], self.chunk_size)
+            self.buffers[table] = []
+
+    def write(self, table: str, row: dict):
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.chunk_size:
+            self.flush(table)
+
+    def close(self):
+        for table in TABLES:
+            self.flush(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--campaigns", type=int, default=100_000)
+    parser.add_argument("--users", type=int, help="default: 5 per campaign")
+    parser.add_argument("--pledges-per-campaign", type=float, default=20.0, help="mean, heavy-tailed")
+    parser.add_argument("--max-pledges", type=int, default=5000, help="cap per campaign")
+    parser.add_argument("--comments-per-campaign", type=float, default=4.0, help="mean, heavy-tailed")
+    parser.add_argument("--chat-sessions", type=int, help="default: 1 per 2 campaigns")
+    parser.add_argument("--turns-per-session", type=float, default=6.0, help="mean, heavy-tailed")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--fixed-now", action="store_true",
+                        help="anchor timestamps at 2025-01-01 so output is byte-identical across runs")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", type=Path, help="write <table>.csv files and load.sql here")
+    target.add_argument("--direct", action="store_true", help="bulk insert into Supabase")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    args.users = args.users or max(1, args.campaigns * 5)
+    args.chat_sessions = args.chat_sessions if args.chat_sessions is not None else args.campaigns // 2
+
+    writer = DirectWriter(args.chunk_size) if args.direct else CSVWriter(args.out)
+    counts = {table: 0 for table in TABLES}
+    started = time.time()
+    try:
+        for table, row in Generator(args).rows():
+            writer.write(table, row)
+            counts[table] += 1
+            total = sum(counts.values())
+            if total % 1_000_000 == 0:
+                print(f"  {total:,} rows ({total / (time.time() - started):,.0f} rows/s)", file=sys.stderr)
+    finally:
+        writer.close()
+
+    elapsed = time.time() - started
+    for table in TABLES:
+        print(f"{table:22} {counts[table]:>12,}")
+    print(f"{'total':22} {sum(counts.values()):>12,}  in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
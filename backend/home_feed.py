@@ -0,0 +1,182 @@
+"""
+Precomputed home-page feed held in memory.
+
+The feed keeps a compact card per active campaign plus a sliding window of
+recent pledges, and is updated incrementally as campaigns and pledges are
+written. Sections (trending, nearly funded, newest, per category) are only
+recomputed when something changed, and the serialized payload is cached so
+serving the landing page costs a dictionary lookup regardless of catalog size.
+"""
+import hashlib
+import heapq
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+from fast_json import dumps
+
+CARD_FIELDS = (
+    "id", "title", "category", "goal_amount", "raised_amount", "backers_count",
+    "image_url", "creator_name", "created_at", "status",
+)
+DESCRIPTION_PREVIEW_CHARS = 200
+# Campaign columns a rebuild reads; cards are built from these alone
+SOURCE_COLUMNS = ",".join(CARD_FIELDS + ("description",))
+
+
+def _timestamp(value) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return 0.0
+    return float(value or 0)
+
+
+def _to_card(campaign: dict) -> dict:
+    card = {field: campaign.get(field) for field in CARD_FIELDS}
+    if isinstance(card["created_at"], datetime):
+        card["created_at"] = card["created_at"].isoformat()
+    description = campaign.get("description") or ""
+    card["description"] = description[:DESCRIPTION_PREVIEW_CHARS]
+    return card
+
+
+def _funded_ratio(card: dict) -> float:
+    goal = card.get("goal_amount") or 0
+    return (card.get("raised_amount") or 0) / goal if goal > 0 else 0.0
+
+
+class HomeFeed:
+    def __init__(self, section_size: int = 6, velocity_window_hours: float = 72.0,
+                 nearly_funded_min: float = 0.7):
+        self.section_size = section_size
+        self.velocity_window = velocity_window_hours * 3600
+        self.nearly_funded_min = nearly_funded_min
+
+        self._lock = threading.Lock()
+        self._cards: Dict[str, dict] = {}
+        self._created_ts: Dict[str, float] = {}
+        self._pledges: Dict[str, deque] = defaultdict(deque)  # campaign_id -> (ts, amount)
+        self._velocity: Dict[str, float] = defaultdict(float)
+        self._dirty = True
+        self._body: Optional[bytes] = None
+        self._etag: Optional[str] = None
+        self.built_at: Optional[float] = None
+
+    # ---- writes ----
+
+    def rebuild(self, campaigns: Iterable[dict], pledges: Iterable[dict] = ()) -> None:
+        """Replace all state from a full read of campaigns and recent paid pledges"""
+        with self._lock:
+            self._cards.clear()
+            self._created_ts.clear()
+            self._pledges.clear()
+            self._velocity.clear()
+            for campaign in campaigns:
+                self._upsert_locked(campaign)
+            for pledge in sorted(pledges, key=lambda p: _timestamp(p.get("created_at"))):
+                self._add_pledge_locked(pledge["campaign_id"], pledge.get("amount") or 0,
+                                        _timestamp(pledge.get("created_at")))
+            self._dirty = True
+
+    def upsert_campaign(self, campaign: dict) -> None:
+        with self._lock:
+            self._upsert_locked(campaign)
+            self._dirty = True
+
+    def remove_campaign(self, campaign_id: str) -> None:
+        with self._lock:
+            self._remove_locked(campaign_id)
+            self._dirty = True
+
+    def record_pledge(self, campaign_id: str, amount: float, at: Optional[float] = None) -> None:
+        """Count a paid pledge towards velocity and bump the card's totals"""
+        with self._lock:
+            self._add_pledge_locked(campaign_id, amount, at or time.time())
+            card = self._cards.get(campaign_id)
+            if card is not None:
+                card["raised_amount"] = (card.get("raised_amount") or 0) + amount
+                card["backers_count"] = (card.get("backers_count") or 0) + 1
+            self._dirty = True
+
+    def _upsert_locked(self, campaign: dict) -> None:
+        campaign_id = campaign["id"]
+        if campaign.get("status", "active") != "active":
+            self._remove_locked(campaign_id)
+            return
+        self._cards[campaign_id] = _to_card(campaign)
+        self._created_ts[campaign_id] = _timestamp(campaign.get("created_at"))
+
+    def _remove_locked(self, campaign_id: str) -> None:
+        self._cards.pop(campaign_id, None)
+        self._created_ts.pop(campaign_id, None)
+        self._pledges.pop(campaign_id, None)
+        self._velocity.pop(campaign_id, None)
+
+    def _add_pledge_locked(self, campaign_id: str, amount: float, at: float) -> None:
+        self._pledges[campaign_id].append((at, amount))
+        self._velocity[campaign_id] += amount
+
+    def _expire_locked(self, now: float) -> None:
+        cutoff = now - self.velocity_window
+        for campaign_id in list(self._pledges):
+            window = self._pledges[campaign_id]
+            while window and window[0][0] < cutoff:
+                _, amount = window.popleft()
+                self._velocity[campaign_id] -= amount
+                self._dirty = True
+            if not window:
+                del self._pledges[campaign_id]
+                self._velocity.pop(campaign_id, None)
+
+    # ---- reads ----
+
+    def _build_locked(self, now: float) -> dict:
+        size = self.section_size
+        cards = self._cards
+
+        def trending_key(campaign_id):
+            return (self._velocity.get(campaign_id, 0.0), cards[campaign_id].get("backers_count") or 0)
+
+        trending = heapq.nlargest(size, cards, key=trending_key)
+        newest = heapq.nlargest(size, cards, key=lambda cid: self._created_ts.get(cid, 0.0))
+        nearly_funded = heapq.nlargest(
+            size,
+            (cid for cid in cards if self.nearly_funded_min <= _funded_ratio(cards[cid]) < 1.0),
+            key=lambda cid: _funded_ratio(cards[cid]),
+        )
+
+        by_category = defaultdict(list)
+        for campaign_id in cards:
+            by_category[cards[campaign_id].get("category") or "Other"].append(campaign_id)
+        categories = {
+            category: [cards[cid] for cid in heapq.nlargest(size, ids, key=trending_key)]
+            for category, ids in sorted(by_category.items())
+        }
+
+        return {
+            "trending": [dict(cards[cid], pledge_velocity=self._velocity.get(cid, 0.0)) for cid in trending],
+            "nearly_funded": [cards[cid] for cid in nearly_funded],
+            "newest": [cards[cid] for cid in newest],
+            "categories": categories,
+            "total_active": len(cards),
+            "generated_at": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+        }
+
+    def render(self) -> tuple:
+        """Return the cached (body, etag), recomputing sections only if dirty"""
+        now = time.time()
+        with self._lock:
+            self._expire_locked(now)
+            if self._dirty or self._body is None:
+                self._body = dumps(self._build_locked(now))
+                # Weak: CompressionMiddleware re-encodes the body, so the bytes differ per Accept-Encoding
+                self._etag = 'W/"' + hashlib.blake2b(self._body, digest_size=12).hexdigest() + '"'
+                self._dirty = False
+                self.built_at = now
+            return self._body, self._etag
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Production entry point: a gunicorn master supervising uvicorn workers.
+
+Worker count defaults to WEB_CONCURRENCY or the CPUs this process may use
+(affinity and cgroup quota aware), one worker per core: request handling is
+async and blocking SDK calls already run in each worker's thread pool. uvloop
+and httptools are used when installed.
+
+With --preload (the default) the master imports the app and the SDK modules
+its routers need before forking, then freezes the GC so those pages stay shared
+copy-on-write across workers. Clients and connections are still created per
+worker after the fork.
+
+Signals to the master:
+    HUP        graceful reload: new workers start, old ones finish in-flight
+               requests (picks up code changes only with --no-preload)
+    USR2+WINCH zero-downtime upgrade with --preload: USR2 starts a new master
+               on the new code, WINCH then TERM retire the old one
+    TTIN/TTOU  add/remove one worker
+    TERM       graceful shutdown within --graceful-timeout
+
+Usage:
+    python launcher.py                              # 0.0.0.0:8001, one worker per core
+    python launcher.py --workers 4 --keepalive 75   # behind a LB with a 60s idle timeout
+    python launcher.py --dev                        # single process with auto-reload
+
+Throughput per core, measured with benchmarks/loadtest.py run --workers N
+--duration 30 (default mix; fakes with 2ms DB / 300ms Gemini / 150ms Stripe
+latency; 2,000 campaigns; uvloop + httptools; load generator on the same core):
+
+    1 core, plain uvicorn, default 5-thread pool, 20 VUs     45 req/s
+    1 core, 1 worker, THREAD_POOL_SIZE=64, 20 VUs           110 req/s
+    1 core, 2 workers, 20 VUs                               105 req/s
+    1 core, 1 worker, 50 VUs                                 98 req/s  (saturated, p95 1-2s)
+
+A worker is CPU-bound at roughly 100 req/s for this mix once its thread pool
+is large enough for the SDK calls it has in flight, so extra workers per core
+do not help; scale by cores. Rerun on the target instance type when sizing.
+"""
+import argparse
+import gc
+import importlib
+import logging
+import math
+import os
+from pathlib import Path
+
+logger = logging.getLogger("launcher")
+
+
+def available_cpus() -> int:
+    """CPUs usable by this process, honouring affinity and cgroup v1/v2 quotas"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = period = None
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+    except (OSError, ValueError):
+        try:
+            quota = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text().strip()
+            period = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text().strip()
+        except OSError:
+            pass
+    if quota and quota not in ("max", "-1"):
+        cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    return max(1, cpus)
+
+
+def default_workers() -> int:
+    if os.environ.get("WEB_CONCURRENCY"):
+        return int(os.environ["WEB_CONCURRENCY"])
+    return available_cpus()
+
+
+def resolve_loop(choice: str) -> str:
+    if choice != "auto":
+        return choice
+    try:
+        import uvloop  # noqa: F401
+        return "uvloop"
+    except ImportError:
+        return "asyncio"
+
+
+def resolve_http(choice: str) -> str:
+    if choice != "auto":
+        return choice
+    try:
+        import httptools  # noqa: F401
+        return "httptools"
+    except ImportError:
+        return "h11"
+
+
+def preload_shared_state(app_path: str):
+    """Import the app and its routers' SDK modules in the master, then freeze the GC"""
+    module_name, _, attr = app_path.partition(":")
+    module = importlib.import_module(module_name)
+    app = getattr(module, attr or "app")
+
+    from core import supabase
+    from lazy import warm_up
+
+    for target in getattr(module, "warm_up_targets", ()):
+        if target is supabase:
+            # Import the package only; the client (and its HTTP pool) is built per worker
+            try:
+                importlib.import_module("supabase")
+            except ImportError as e:
+                logger.error(f"Preloading supabase failed: {e}")
+        else:
+            warm_up(target)
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+try:
+    from uvicorn.workers import UvicornWorker
+
+    class TunedUvicornWorker(UvicornWorker):
+        # Set by main() before gunicorn forks, so each worker sees the resolved choice
+        CONFIG_KWARGS = {
+            "loop": os.environ.get("LAUNCHER_LOOP", "auto"),
+            "http": os.environ.get("LAUNCHER_HTTP", "auto"),
+            "lifespan": "on",
+        }
+except ImportError:  # uvicorn without gunicorn support; --dev still works
+    TunedUvicornWorker = None
+
+
+def run_gunicorn(options: dict, app_path: str, preload: bool):
+    from gunicorn.app.base import BaseApplication
+
+    class Launcher(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            if preload:
+                return preload_shared_state(app_path)
+            module_name, _, attr = app_path.partition(":")
+            return getattr(importlib.import_module(module_name), attr or "app")
+
+    Launcher().run()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default="server:app", help="ASGI app import path")
+    parser.add_argument("--bind", default=os.environ.get("BIND", "0.0.0.0:8001"))
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--loop", choices=["auto", "uvloop", "asyncio"], default="auto")
+    parser.add_argument("--http", choices=["auto", "httptools", "h11"], default="auto")
+    parser.add_argument("--backlog", type=int, default=2048, help="listen queue length")
+    parser.add_argument("--keepalive", type=int, default=int(os.environ.get("KEEPALIVE", "5")),
+                        help="seconds; keep above the load balancer's idle timeout")
+    parser.add_argument("--timeout", type=int, default=120,
+                        help="seconds a worker may go without heartbeating before it is restarted")
+    parser.add_argument("--graceful-timeout", type=int, default=30)
+    parser.add_argument("--max-requests", type=int, default=0, help="recycle workers after N requests (0 = never)")
+    parser.add_argument("--max-requests-jitter", type=int, default=0)
+    parser.add_argument("--preload", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--dev", action="store_true", help="single uvicorn process with auto-reload")
+    parser.add_argument("--log-level", default="info")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper())
+    loop, http = resolve_loop(args.loop), resolve_http(args.http)
+    os.environ["LAUNCHER_LOOP"], os.environ["LAUNCHER_HTTP"] = loop, http
+    if TunedUvicornWorker is not None:
+        TunedUvicornWorker.CONFIG_KWARGS.update(loop=loop, http=http)
+    os.chdir(Path(__file__).resolve().parent)
+
+    if args.dev:
+        import uvicorn
+        host, _, port = args.bind.rpartition(":")
+        uvicorn.run(args.app, host=host or "127.0.0.1", port=int(port), loop=loop, http=http,
+                    reload=True, log_level=args.log_level)
+        return
+
+    logger.info(f"Starting {args.workers} worker(s) on {args.bind} (loop={loop}, http={http}, "
+                f"preload={args.preload}, cpus={available_cpus()})")
+    run_gunicorn({
+        "bind": args.bind,
+        "workers": args.workers,
+        "worker_class": "launcher.TunedUvicornWorker",
+        "backlog": args.backlog,
+        "keepalive": args.keepalive,
+        "timeout": args.timeout,
+        "graceful_timeout": args.graceful_timeout,
+        "max_requests": args.max_requests,
+        "max_requests_jitter": args.max_requests_jitter,
+        "preload_app": args.preload,
+        "loglevel": args.log_level,
+        "accesslog": None,
+    }, args.app, args.preload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Deferred imports and clients for heavy SDKs.
+
+`lazy_module("stripe")` returns a stand-in that imports the real module on
+first attribute access (reads and writes both go through), so call sites keep
+using `stripe.checkout.Session.create(...)` unchanged while workers become
+ready without paying for grpc/protobuf or the HTTP client stacks up front.
+"""
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class Lazy:
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    @property
+    def loaded(self) -> bool:
+        return self._target is not None
+
+    def resolve(self) -> Any:
+        target = self._target
+        if target is None:
+            with self._lock:
+                target = self._target
+                if target is None:
+                    start = time.perf_counter()
+                    target = self._factory()
+                    object.__setattr__(self, "_target", target)
+                    logger.info(f"Loaded {self._name} in {(time.perf_counter() - start) * 1000:.0f}ms")
+        return target
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.resolve(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self.resolve(), attr, value)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._name} ({'loaded' if self.loaded else 'not loaded'})>"
+
+
+def lazy_module(name: str) -> Lazy:
+    return Lazy(name, lambda: importlib.import_module(name))
+
+
+def warm_up(*lazies: Lazy) -> None:
+    """Resolve every given stand-in now; failures are logged, not raised"""
+    for item in lazies:
+        try:
+            item.resolve()
+        except Exception as e:
+            logger.error(f"Warm-up of {item._name} failed: {e}")
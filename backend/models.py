@@ -0,0 +1,274 @@
+"""Database and request/response models shared by the routers"""
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Optional, Dict, Any
+import uuid
+from datetime import datetime, timezone, timedelta
+
+# ============ MODELS ============
+
+class User(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    email: str
+    name: str
+    picture: Optional[str] = None
+    password_hash: Optional[str] = None
+    is_admin: bool = False
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class UserSession(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    session_token: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    expires_at: datetime
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class EmailVerification(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    email: str
+    verification_token: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    expires_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc) + timedelta(hours=24))
+    verified: bool = False
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class Campaign(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    title: str
+    description: str
+    category: str
+    goal_amount: float
+    raised_amount: float = 0.0
+    creator_id: str
+    creator_name: Optional[str] = None
+    image_url: Optional[str] = None
+    status: str = "active"
+    backers_count: int = 0
+    duration_days: int = 30
+    tags: List[str] = []
+    reward_tiers: List[Dict[str, Any]] = []
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+# Only select the columns the Campaign model exposes, since listings skip response_model filtering
+CAMPAIGN_COLUMNS = ",".join(Campaign.model_fields)
+
+class AIAnalysis(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    campaign_id: str
+    success_probability: float
+    analysis_text: str
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class Comment(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    campaign_id: str
+    user_id: str
+    user_name: str
+    content: str
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class Pledge(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    campaign_id: str
+    user_id: str
+    amount: float
+    session_id: Optional[str] = None
+    payment_status: str = "pending"
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class PaymentTransaction(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    session_id: str
+    amount: float
+    currency: str
+    campaign_id: str
+    user_id: str
+    metadata: Optional[Dict[str, str]] = None
+    payment_status: str = "initiated"
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class ChatMessage(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: Optional[str] = None
+    session_id: str
+    message: str
+    response: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+# ============ REQUEST MODELS ============
+
+class RegisterRequest(BaseModel):
+    email: str
+    password: str
+    name: str
+
+class LoginRequest(BaseModel):
+    email: str
+    password: str
+
+class CampaignCreate(BaseModel):
+    title: str
+    description: str
+    category: str
+    goal_amount: float
+    image_url: Optional[str] = None
+
+class CampaignUpdate(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    category: Optional[str] = None
+    goal_amount: Optional[float] = None
+    image_url: Optional[str] = None
+    status: Optional[str] = None
+
+class CommentCreate(BaseModel):
+    content: str
+
+class ChatRequest(BaseModel):
+    message: str
+    session_id: Optional[str] = None
+
+class PledgeRequest(BaseModel):
+    campaign_id: str
+    origin_url: str
+
+class RewardTier(BaseModel):
+    amount: float
+    description: str
+
+class CampaignCreateExtended(BaseModel):
+    title: str
+    description: str
+    category: str
+    goal_amount: float
+    duration_days: int = 30
+    status: str = "active"
+    tags: List[str] = []
+    reward_tiers: List[RewardTier] = []
+    image_url: Optional[str] = None
+
+class OptimizeTitleRequest(BaseModel):
+    title: str
+    description: str
+    category: str
+
+class EnhanceDescriptionRequest(BaseModel):
+    description: str
+    title: str
+    category: str
+    goal_amount: float
+
+class SuccessPredictionRequest(BaseModel):
+    title: str
+    description: str
+    category: str
+    goal_amount: float
+    reward_tiers: List[RewardTier] = []
+
+class MarketingStrategyRequest(BaseModel):
+    title: str
+    description: str
+    category: str
+    goal_amount: float
+
+# ============ AI STRUCTURED OUTPUT SCHEMAS ============
+# What the Gemini-backed endpoints ask for in JSON mode; validated by core.gemini_structured
+
+class TitleSuggestions(BaseModel):
+    titles: List[str] = Field(min_length=1)
+
+class SuccessPredictionOutput(BaseModel):
+    success_percentage: float = Field(ge=0, le=100)
+    confidence_level: str
+    analysis: str
+    recommendations: List[str]
+
+class TargetAudience(BaseModel):
+    primary: str
+    secondary: str
+
+class MarketingChannel(BaseModel):
+    name: str
+    strategy: str
+    priority: str
+
+class MarketingPhase(BaseModel):
+    phase: str
+    duration: str
+    actions: List[str]
+
+class MarketingStrategyOutput(BaseModel):
+    overview: str
+    target_audience: TargetAudience
+    channels: List[MarketingChannel]
+    timeline: List[MarketingPhase]
+    key_messages: List[str]
+    budget_allocation: Dict[str, str]
+
+class MarketOverview(BaseModel):
+    category_performance: str
+    average_success_rate: str
+    typical_funding_min: float
+    typical_funding_max: float
+
+class Competitor(BaseModel):
+    name: str
+    funding: float
+    description: str
+    success_factors: str
+
+class CompetitorAnalysisOutput(BaseModel):
+    market_overview: MarketOverview
+    key_trends: List[str]
+    top_competitors: List[Competitor]
+
+class SuccessOutlook(BaseModel):
+    percentage: float = Field(ge=0, le=100)
+    level: str
+    category_average: str
+    similar_campaigns: str
+
+class ActionRecommendation(BaseModel):
+    title: str
+    description: str
+    priority: str
+
+class StrategicRecommendation(BaseModel):
+    category: str
+    priority: str
+    description: str
+    reward_tiers: Optional[List[RewardTier]] = None
+
+class StrategicRecommendationsOutput(BaseModel):
+    success_prediction: SuccessOutlook
+    success_factors: List[str]
+    risk_factors: List[str]
+    action_recommendations: List[ActionRecommendation]
+    strategic_recommendations: List[StrategicRecommendation]
+
+OPTIMIZE_SECTIONS = ("title", "description", "success_prediction", "marketing_strategy")
+
+class OptimizeAllRequest(BaseModel):
+    title: str
+    description: str
+    category: str
+    goal_amount: float
+    reward_tiers: List[RewardTier] = []
+    sections: List[str] = list(OPTIMIZE_SECTIONS)
+
+class ProfileStartRequest(BaseModel):
+    duration_seconds: float = 30.0
+    interval_ms: float = 5.0
+
+class RequestProfileArmRequest(BaseModel):
+    route: Optional[str] = None  # route template, e.g. /api/campaigns/{campaign_id}/analysis
+    header: Optional[str] = None
+    header_value: Optional[str] = None
+    max_requests: int = 1
+    interval_ms: float = 1.0
@@ -0,0 +1,174 @@
+"""
+In-process sampling profiler for live workers.
+
+A background thread snapshots every thread's stack with sys._current_frames()
+at a fixed interval and counts identical stacks. Output is the collapsed-stack
+format ("thread;outer;...;inner count") that flamegraph.pl and speedscope read.
+
+Profiles are per worker process; the pid is reported with each result.
+"""
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from typing import Optional
+
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}"
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005, max_depth: int = 128):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: Optional[float] = None):
+        """Sample until stop() is called or `duration` seconds have passed"""
+        self._stop.clear()
+        self.started_at = time.time()
+        self.stopped_at = None
+        self._thread = threading.Thread(target=self._run, args=(duration,), name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self, duration: Optional[float]):
+        deadline = time.monotonic() + duration if duration else None
+        own_ident = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+        self.stopped_at = time.time()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self) -> dict:
+        end = self.stopped_at or time.time()
+        return {
+            "pid": os.getpid(),
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "unique_stacks": len(self.stacks),
+            "started_at": self.started_at,
+            "duration_seconds": round(end - self.started_at, 3) if self.started_at else 0.0,
+        }
+
+
+class RequestProfiler:
+    """
+    Profiles individual requests whose path matches a route template or that
+    carry a given header value, up to `remaining` requests.
+
+    The sampler sees the whole process, so stacks from requests running
+    concurrently on the event loop are included as well.
+    """
+
+    def __init__(self, keep: int = 20):
+        self.route: Optional[str] = None
+        self.header: Optional[bytes] = None
+        self.header_value: Optional[bytes] = None
+        self.remaining = 0
+        self.interval = 0.001
+        self.results = deque(maxlen=keep)
+        self._route_regex = None
+        self._lock = threading.Lock()
+
+    def arm(self, route: Optional[str] = None, header: Optional[str] = None, header_value: Optional[str] = None,
+            max_requests: int = 1, interval: float = 0.001):
+        with self._lock:
+            self.route = route
+            self._route_regex = compile_path(route)[0] if route else None
+            self.header = header.lower().encode() if header else None
+            self.header_value = header_value.encode() if header_value else None
+            self.remaining = max_requests
+            self.interval = interval
+
+    def disarm(self):
+        with self._lock:
+            self.remaining = 0
+
+    def status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "route": self.route,
+            "header": self.header.decode() if self.header else None,
+            "remaining": self.remaining,
+            "results": [{k: v for k, v in r.items() if k != "collapsed"} for r in self.results],
+        }
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        return next((r for r in self.results if r["id"] == profile_id), None)
+
+    def claim(self, scope: Scope) -> bool:
+        """True if this request should be profiled; consumes one of the remaining slots"""
+        if self.remaining <= 0:
+            return False
+        if self._route_regex is not None and not self._route_regex.match(scope["path"]):
+            return False
+        if self.header is not None:
+            value = dict(scope["headers"]).get(self.header)
+            if value is None or (self.header_value is not None and value != self.header_value):
+                return False
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+class RequestProfilerMiddleware:
+    def __init__(self, app: ASGIApp, request_profiler: RequestProfiler) -> None:
+        self.app = app
+        self.request_profiler = request_profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.request_profiler.claim(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = SamplingProfiler(interval=self.request_profiler.interval)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.stop()
+            result = profiler.summary()
+            result.update(id=uuid.uuid4().hex, method=scope["method"], path=scope["path"],
+                          collapsed=profiler.collapsed())
+            self.request_profiler.results.append(result)
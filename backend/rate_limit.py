@@ -0,0 +1,116 @@
+"""
+Token-bucket quotas and a concurrency cap for expensive endpoints.
+
+A request must take a token from its caller's bucket and from the global
+bucket, then a slot from the in-flight semaphore. Buckets refill continuously
+(capacity = allowed burst, rate = sustained requests per second). A refused
+request gets a 429 with Retry-After set to when a token will be available.
+
+Buckets live in a backend chosen by RATE_LIMIT_BACKEND: "memory" (default,
+per worker process) or "module:Class" for a shared store. A backend implements
+`async take(key, capacity, rate, cost) -> float`, returning 0 when the tokens
+were taken and otherwise the seconds until they would be; a negative cost
+returns tokens. The semaphore is always per process.
+"""
+import asyncio
+import importlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import HTTPException
+
+from metrics import RATE_LIMITED
+
+
+class InMemoryRateLimitBackend:
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()  # key -> [tokens, updated]
+
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [capacity, now]
+                # Forgetting the least recently used key only resets it to a full bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens >= cost:
+                bucket[0] = min(capacity, tokens - cost)
+                return 0.0
+            bucket[0] = tokens
+            return (cost - tokens) / rate if rate > 0 else math.inf
+
+
+def make_backend(spec: Optional[str]):
+    """Build a backend from a RATE_LIMIT_BACKEND value"""
+    spec = (spec or "memory").strip()
+    if spec == "memory":
+        return InMemoryRateLimitBackend()
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+def too_many_requests(retry_after: float, detail: str) -> HTTPException:
+    return HTTPException(429, detail, headers={"Retry-After": str(max(1, math.ceil(retry_after)))})
+
+
+class QuotaLimiter:
+    def __init__(self, name: str, backend, user_burst: float, user_per_minute: float,
+                 global_burst: float, global_per_minute: float, max_in_flight: int,
+                 queue_timeout: float = 1.0):
+        self.name = name
+        self.backend = backend
+        self.user_burst = user_burst
+        self.user_rate = user_per_minute / 60
+        self.global_burst = global_burst
+        self.global_rate = global_per_minute / 60
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def admit(self, caller: str, cost: float = 1.0) -> None:
+        """Take `cost` tokens from the caller's and the global bucket, or raise a 429"""
+        user_key, global_key = f"{self.name}:{caller}", f"{self.name}:*"
+        wait = await self.backend.take(user_key, self.user_burst, self.user_rate, cost)
+        if wait:
+            RATE_LIMITED.inc(limiter=self.name, scope="user")
+            raise too_many_requests(wait, "Too many AI requests, please slow down")
+        wait = await self.backend.take(global_key, self.global_burst, self.global_rate, cost)
+        if wait:
+            # Not the caller's fault; give their tokens back
+            await self.backend.take(user_key, self.user_burst, self.user_rate, -cost)
+            RATE_LIMITED.inc(limiter=self.name, scope="global")
+            raise too_many_requests(wait, "AI service is busy, please retry shortly")
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one in-flight slot, waiting at most queue_timeout for it, or raise a 429"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            RATE_LIMITED.inc(limiter=self.name, scope="in_flight")
+            raise too_many_requests(self.queue_timeout, "AI service is busy, please retry shortly")
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+    @asynccontextmanager
+    async def limit(self, caller: str, cost: float = 1.0):
+        """Admit `caller` and hold an in-flight slot for the duration of the block"""
+        await self.admit(caller, cost)
+        async with self.slot():
+            yield
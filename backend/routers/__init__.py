@@ -0,0 +1,8 @@
+"""
+Feature routers. server.py imports only the ones named in ENABLED_ROUTERS, so a
+worker loads (and exposes) just the features its deployment serves.
+
+Each module defines `router` and, when it calls a lazily imported SDK,
+`WARM_UP`: the stand-ins to resolve during the startup warm-up hook.
+"""
+ALL_ROUTERS = ("auth", "campaigns", "comments", "ai", "payments", "analytics", "admin")
@@ -0,0 +1,227 @@
+"""Admin-only listings, stats, slow-call and Gemini usage reports and on-demand profiling"""
+from fastapi import APIRouter, HTTPException, Request, Response
+import os
+import asyncio
+from typing import Optional
+from fast_json import FastJSONResponse
+from profiler import SamplingProfiler
+from datetime import datetime, timedelta, timezone
+from core import (supabase, sb_execute, sb_find, get_current_user, handle_supabase_response, slow_calls,
+                  request_profiler, TOKEN_USAGE_FLUSH_SECONDS)
+from token_usage import summarize
+from campaign_scores import listing_order, refresh_campaign_scores
+from models import ProfileStartRequest, RequestProfileArmRequest
+
+router = APIRouter(prefix="/api", tags=["admin"])
+
+# On-demand profiling, driven from the admin profiling endpoints
+process_profiler: Optional[SamplingProfiler] = None
+PROFILER_MAX_SECONDS = float(os.environ.get('PROFILER_MAX_SECONDS', '300'))
+
+# USD per million tokens for the cost estimate in /admin/gemini-usage
+GEMINI_INPUT_PRICE_PER_M = float(os.environ.get('GEMINI_INPUT_PRICE_PER_M', '0.10'))
+GEMINI_OUTPUT_PRICE_PER_M = float(os.environ.get('GEMINI_OUTPUT_PRICE_PER_M', '0.40'))
+
+# ============ ADMIN ENDPOINTS ============
+
+@router.get("/admin/campaigns")
+async def admin_get_all_campaigns(request: Request, sort: Optional[str] = None):
+    user = await get_current_user(request)
+    if not user or not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    
+    order_by, desc, sort_filters = listing_order(sort)
+    campaigns = await sb_find("campaigns", sort_filters, 1000, order_by=order_by, desc=desc)
+    return FastJSONResponse(campaigns)
+
+@router.post("/admin/campaign-scores/refresh")
+async def admin_refresh_campaign_scores(request: Request):
+    """Rescore all active campaigns now, e.g. after deploying a retrained success model"""
+    user = await get_current_user(request)
+    if not user or not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    
+    scored = await refresh_campaign_scores(force=True)
+    return {"scored": scored}
+
+@router.get("/admin/stats")
+async def admin_stats(request: Request):
+    user = await get_current_user(request)
+    if not user or not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    
+    # Get counts using Supabase
+    all_campaigns = await sb_find("campaigns", {}, 10000)
+    total_campaigns = len(all_campaigns)
+    active_campaigns = len([c for c in all_campaigns if c.get('status') == 'active'])
+    
+    all_users = await sb_find("users", {}, 10000)
+    total_users = len(all_users)
+    
+    # Calculate total raised
+    total_raised = sum(c.get('raised_amount', 0) for c in all_campaigns)
+    
+    return {
+        "total_campaigns": total_campaigns,
+        "active_campaigns": active_campaigns,
+        "total_users": total_users,
+        "total_raised": total_raised
+    }
+
+@router.get("/admin/users")
+async def admin_get_all_users(request: Request):
+    user = await get_current_user(request)
+    if not user or not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    
+    users = await sb_find("users", {}, 10000)
+    return FastJSONResponse(users)
+
+@router.get("/admin/slow-calls")
+async def admin_slow_calls(request: Request, limit: int = 20, window_minutes: int = 15, sort: str = "total_ms"):
+    user = await get_current_user(request)
+    if not user or not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    
+    if sort not in ("total_ms", "max_ms", "avg_ms", "count", "slow_count", "max_rows"):
+        raise HTTPException(400, "Invalid sort")
+    return {
+        "pid": os.getpid(),
+        "window_minutes": window_minutes,
+        "thresholds_ms": slow_calls.thresholds_ms,
+        "signatures": slow_calls.top(limit, window_minutes * 60, sort),
+    }
+
+async def usage_totals(since: str, group_by: str, limit: int) -> list:
+    """summarize() rows per group_by, grouped and ranked by gemini_usage_totals in the database"""
+    params = {"since": since, "group_key": group_by, "input_price": GEMINI_INPUT_PRICE_PER_M,
+              "output_price": GEMINI_OUTPUT_PRICE_PER_M, "max_groups": limit}
+    result = await sb_execute("gemini_usage_daily", "rpc", supabase.rpc("gemini_usage_totals", params).execute,
+                              filters=params)
+    rows = [{group_by: row.pop("group_value"), **row} for row in handle_supabase_response(result) or []]
+    return summarize(rows, group_by, GEMINI_INPUT_PRICE_PER_M, GEMINI_OUTPUT_PRICE_PER_M, limit)
+
+@router.get("/admin/gemini-usage")
+async def admin_gemini_usage(request: Request, days: int = 7, group_by: str = "endpoint", limit: int = 50):
+    user = await get_current_user(request)
+    if not user or not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    
+    if group_by not in ("endpoint", "user_id", "day"):
+        raise HTTPException(400, "Invalid group_by")
+    # Read-only: totals include every worker's calls up to its last flush, at most
+    # TOKEN_USAGE_FLUSH_SECONDS behind
+    since = (datetime.now(timezone.utc) - timedelta(days=max(1, days) - 1)).date().isoformat()
+    daily, groups = await asyncio.gather(usage_totals(since, "day", days), usage_totals(since, group_by, limit))
+    return {
+        "since": since,
+        "group_by": group_by,
+        "flush_interval_seconds": TOKEN_USAGE_FLUSH_SECONDS,
+        "prices_per_million_tokens": {"input": GEMINI_INPUT_PRICE_PER_M, "output": GEMINI_OUTPUT_PRICE_PER_M},
+        "daily": sorted(daily, key=lambda item: item["day"]),
+        "groups": groups,
+    }
+
+# ============ ADMIN PROFILING ENDPOINTS ============
+# Profiles cover the worker process that serves the request; with several
+# workers, repeat the call until the reported pid is the one you want.
+
+@router.post("/admin/profile/start")
+async def start_profile(data: ProfileStartRequest, request: Request):
+    global process_profiler
+    user = await get_current_user(request)
+    if not user or not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    
+    if process_profiler and process_profiler.running:
+        raise HTTPException(409, "Profiler already running")
+    if not 0 < data.duration_seconds <= PROFILER_MAX_SECONDS:
+        raise HTTPException(400, f"duration_seconds must be between 0 and {PROFILER_MAX_SECONDS}")
+    
+    process_profiler = SamplingProfiler(interval=max(data.interval_ms, 1.0) / 1000)
+    process_profiler.start(duration=data.duration_seconds)
+    return process_profiler.summary()
+
+@router.post("/admin/profile/stop")
+async def stop_profile(request: Request):
+    user = await get_current_user(request)
+    if not user or not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    
+    if not process_profiler:
+        raise HTTPException(404, "No profile recorded")
+    await asyncio.to_thread(process_profiler.stop)
+    return process_profiler.summary()
+
+@router.get("/admin/profile")
+async def get_profile(request: Request):
+    user = await get_current_user(request)
+    if not user or not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    
+    if not process_profiler:
+        raise HTTPException(404, "No profile recorded")
+    return process_profiler.summary()
+
+@router.get("/admin/profile/collapsed")
+async def download_profile(request: Request):
+    user = await get_current_user(request)
+    if not user or not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    
+    if not process_profiler:
+        raise HTTPException(404, "No profile recorded")
+    return Response(
+        process_profiler.collapsed(),
+        media_type="text/plain",
+        headers={"Content-Disposition": f'attachment; filename="profile-{os.getpid()}.collapsed"'},
+    )
+
+@router.post("/admin/profile/requests")
+async def arm_request_profiler(data: RequestProfileArmRequest, request: Request):
+    user = await get_current_user(request)
+    if not user or not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    
+    if not data.route and not data.header:
+        raise HTTPException(400, "Provide a route or a header to match")
+    request_profiler.arm(
+        route=data.route,
+        header=data.header,
+        header_value=data.header_value,
+        max_requests=max(1, min(data.max_requests, 100)),
+        interval=max(data.interval_ms, 0.5) / 1000,
+    )
+    return request_profiler.status()
+
+@router.delete("/admin/profile/requests")
+async def disarm_request_profiler(request: Request):
+    user = await get_current_user(request)
+    if not user or not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    
+    request_profiler.disarm()
+    return request_profiler.status()
+
+@router.get("/admin/profile/requests")
+async def list_request_profiles(request: Request):
+    user = await get_current_user(request)
+    if not user or not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    
+    return request_profiler.status()
+
+@router.get("/admin/profile/requests/{profile_id}")
+async def download_request_profile(profile_id: str, request: Request):
+    user = await get_current_user(request)
+    if not user or not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    
+    result = request_profiler.get(profile_id)
+    if not result:
+        raise HTTPException(404, "Profile not found")
+    return Response(
+        result["collapsed"],
+        media_type="text/plain",
+        headers={"Content-Disposition": f'attachment; filename="request-{profile_id}.collapsed"'},
+    )
@@ -0,0 +1,380 @@
+"""Gemini-backed chat and campaign optimization endpoints"""
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+import asyncio
+import logging
+import os
+import uuid
+from core import (genai, sb_find, gemini_generate, gemini_structured, get_current_user, ai_quota, ai_limiter, quota_caller,
+                  chat_contexts, chat_message_writer, spawn_background)
+from fast_json import dumps
+from success_model import success_model
+from models import (ChatMessage, ChatRequest, OptimizeTitleRequest, EnhanceDescriptionRequest,
+                    SuccessPredictionRequest, MarketingStrategyRequest, OptimizeAllRequest, OPTIMIZE_SECTIONS,
+                    TitleSuggestions, SuccessPredictionOutput, MarketingStrategyOutput)
+
+router = APIRouter(prefix="/api", tags=["ai"], dependencies=[Depends(ai_quota)])
+WARM_UP = (genai,)
+
+# Turns loaded from chat_messages when a session is not in this worker's context store
+CHAT_CONTEXT_MESSAGES = int(os.environ.get('CHAT_CONTEXT_MESSAGES', '5'))
+
+CHAT_SYSTEM_PROMPT = "You are a helpful AI assistant for a crowdfunding platform. Help users with campaign-related queries, funding advice, and platform navigation.\n"
+
+def format_turns(turns) -> list:
+    lines = []
+    for message, response in turns:
+        lines.append(f"User: {message}")
+        if response:
+            lines.append(f"Assistant: {response}")
+    return lines
+
+async def compact_chat_context(session_id: str):
+    """Fold a session's older turns into its rolling summary"""
+    claimed = chat_contexts.begin_compaction(session_id)
+    if not claimed:
+        return
+    summary, turns = claimed
+    new_summary = None
+    try:
+        parts = ["Summarize this conversation between a user and a crowdfunding assistant in at most 120 words. "
+                 "Keep names, campaign details, numbers and open questions; drop pleasantries.\n"]
+        if summary:
+            parts.append(f"Summary so far: {summary}")
+        parts.extend(format_turns(turns))
+        response = await gemini_generate("chat_summary", "\n".join(parts))
+        new_summary = response.text.strip()
+    finally:
+        chat_contexts.finish_compaction(session_id, turns, new_summary)
+
+# ============ AI CHAT ENDPOINTS ============
+
+@router.post("/ai/chat")
+async def ai_chat(data: ChatRequest, request: Request):
+    user = await get_current_user(request)
+    session_id = data.session_id or str(uuid.uuid4())
+    
+    try:
+        # Context comes from this worker's store; an unknown session is loaded from Supabase, and a
+        # known one picks up any turns other workers answered since this one last saw it
+        context = chat_contexts.get(session_id)
+        if context is None:
+            recent = []
+            if data.session_id:
+                recent = await sb_find("chat_messages", {"session_id": session_id}, CHAT_CONTEXT_MESSAGES,
+                                       order_by="created_at", desc=True)
+            context = chat_contexts.load(session_id, recent[::-1])
+        else:
+            since = chat_contexts.sync_since(session_id)
+            if since:
+                newer = await sb_find("chat_messages", {"session_id": session_id, "created_at": {"$gte": since}},
+                                      CHAT_CONTEXT_MESSAGES, order_by="created_at", desc=True)
+                if newer:
+                    context = chat_contexts.merge(session_id, newer[::-1])
+        summary, turns = context
+        
+        # Build conversation context
+        conversation_parts = [CHAT_SYSTEM_PROMPT]
+        if summary:
+            conversation_parts.append(f"Summary of the earlier conversation: {summary}\n")
+        conversation_parts.extend(format_turns(turns))
+        conversation_parts.append(f"User: {data.message}")
+        
+        # Generate response
+        full_prompt = "\n".join(conversation_parts)
+        response = await gemini_generate("ai_chat", full_prompt, user.id if user else None)
+        response_text = response.text.strip()
+        
+        # Queued for a batched insert; the context store already has the turn
+        chat_msg = ChatMessage(
+            user_id=user.id if user else None,
+            session_id=session_id,
+            message=data.message,
+            response=response_text
+        )
+        msg_dict = chat_msg.model_dump()
+        msg_dict['created_at'] = msg_dict['created_at'].isoformat()
+        await chat_message_writer.put(msg_dict)
+        
+        if chat_contexts.append(session_id, data.message, response_text, msg_dict['id'], msg_dict['created_at']):
+            spawn_background(compact_chat_context(session_id), "compact chat context")
+        
+        return {"response": response_text, "session_id": session_id}
+    except Exception as e:
+        logging.error(f"AI chat error: {e}")
+        raise HTTPException(500, f"AI service error: {str(e)}")
+
+# ============ AI CAMPAIGN OPTIMIZATION ENDPOINTS ============
+
+@router.post("/ai/optimize-title")
+async def optimize_title(data: OptimizeTitleRequest, request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    return await suggest_titles(data, user.id)
+
+async def suggest_titles(data: OptimizeTitleRequest, user_id: str) -> dict:
+    try:
+        prompt = f"""You are an expert at creating compelling crowdfunding campaign titles. 
+
+Current Title: {data.title}
+Category: {data.category}
+Description: {data.description}
+
+Generate 5 alternative campaign titles that are:
+- Compelling and attention-grabbing
+- Clear about what the campaign offers
+- Optimized for backers in the {data.category} category
+- Under 80 characters each
+
+Return a JSON object with exactly 5 titles:
+{{"titles": ["Title 1", "Title 2", "Title 3", "Title 4", "Title 5"]}}"""
+        
+        result = await gemini_structured("optimize_title", prompt, TitleSuggestions, user_id)
+        return {"titles": result.titles[:5]}
+        
+    except Exception as e:
+        logging.error(f"Title optimization error: {e}")
+        # Return fallback titles
+        return {
+            "titles": [
+                f"{data.title} - Make It Real",
+                f"Support {data.title} Today",
+                f"{data.title}: Your Backing Matters",
+                f"Join {data.title} - Create Impact",
+                f"{data.title} - Be Part of Something Great"
+            ]
+        }
+
+@router.post("/ai/enhance-description")
+async def enhance_description(data: EnhanceDescriptionRequest, request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    return await improve_description(data, user.id)
+
+async def improve_description(data: EnhanceDescriptionRequest, user_id: str) -> dict:
+    try:
+        prompt = f"""You are an expert at writing persuasive crowdfunding campaign descriptions.
+
+Campaign Title: {data.title}
+Category: {data.category}
+Goal Amount: ${data.goal_amount}
+Current Description: {data.description}
+
+Improve this description to make it more compelling and persuasive. The enhanced description should:
+- Start with a strong hook that captures attention
+- Clearly explain the problem or opportunity
+- Describe the solution and its impact
+- Include social proof or credibility elements
+- End with a clear call-to-action
+- Be well-structured with paragraphs
+- Be between 200-400 words
+
+Return ONLY the enhanced description text, no additional commentary."""
+        
+        response = await gemini_generate("enhance_description", prompt, user_id)
+        enhanced_description = response.text.strip()
+        
+        # Remove any markdown formatting if present
+        enhanced_description = enhanced_description.replace('**', '').replace('*', '')
+        
+        return {"enhanced_description": enhanced_description}
+        
+    except Exception as e:
+        logging.error(f"Description enhancement error: {e}")
+        raise HTTPException(500, f"AI service error: {str(e)}")
+
+@router.post("/ai/success-prediction")
+async def success_prediction(data: SuccessPredictionRequest, request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    return await predict_success(data, user.id)
+
+async def predict_success(data: SuccessPredictionRequest, user_id: str) -> dict:
+    # A draft has no traction yet, so the local model scores it as a campaign on day one
+    estimate = success_model.score(data.model_dump()) if success_model is not None else None
+    try:
+        estimate_text = ""
+        if estimate is not None:
+            estimate_text = (f"\nOur model, trained on past campaigns, estimates a {estimate:.0f}% success probability. "
+                             "Use exactly that number as success_percentage and explain it.\n")
+        reward_tiers_text = ""
+        if data.reward_tiers:
+            reward_tiers_text = "Reward Tiers:\n" + "\n".join([f"- ${tier.amount}: {tier.description}" for tier in data.reward_tiers])
+        
+        prompt = f"""You are an AI expert at predicting crowdfunding campaign success.
+
+Campaign Details:
+Title: {data.title}
+Category: {data.category}
+Goal: ${data.goal_amount}
+Description: {data.description}
+{reward_tiers_text}
+{estimate_text}
+Analyze this campaign and provide a success prediction in JSON format:
+{{
+    "success_percentage": <number between 0-100>,
+    "confidence_level": "<High/Medium/Low>",
+    "analysis": "<2-3 sentence analysis of why this percentage>",
+    "recommendations": [
+        "<recommendation 1>",
+        "<recommendation 2>",
+        "<recommendation 3>",
+        "<recommendation 4>",
+        "<recommendation 5>"
+    ]
+}}
+
+Be realistic and specific in your analysis."""
+        
+        result = await gemini_structured("success_prediction", prompt, SuccessPredictionOutput, user_id)
+        if estimate is not None:
+            result.success_percentage = estimate
+        return result.model_dump()
+        
+    except Exception as e:
+        logging.error(f"Success prediction error: {e}")
+        # Return fallback
+        return {
+            "success_percentage": estimate if estimate is not None else 70,
+            "confidence_level": "Medium",
+            "analysis": "Based on the campaign details, there is a good potential for success with proper execution.",
+            "recommendations": [
+                "Build a strong pre-launch community",
+                "Offer diverse reward tiers",
+                "Create compelling visual content",
+                "Engage with potential backers early",
+                "Set realistic funding goals"
+            ]
+        }
+
+@router.post("/ai/marketing-strategy")
+async def marketing_strategy(data: MarketingStrategyRequest, request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    return await plan_marketing(data, user.id)
+
+async def plan_marketing(data: MarketingStrategyRequest, user_id: str) -> dict:
+    try:
+        prompt = f"""You are a marketing expert specializing in crowdfunding campaigns.
+
+Campaign Details:
+Title: {data.title}
+Category: {data.category}
+Goal: ${data.goal_amount}
+Description: {data.description}
+
+Create a comprehensive marketing strategy in JSON format with the following structure:
+{{
+    "overview": "<2-3 sentence overview of the marketing approach>",
+    "target_audience": {{
+        "primary": "<description of primary audience>",
+        "secondary": "<description of secondary audience>"
+    }},
+    "channels": [
+        {{
+            "name": "<channel name>",
+            "strategy": "<specific strategy for this channel>",
+            "priority": "<High/Medium/Low>"
+        }}
+    ],
+    "timeline": [
+        {{
+            "phase": "<phase name>",
+            "duration": "<timeframe>",
+            "actions": ["<action 1>", "<action 2>"]
+        }}
+    ],
+    "key_messages": ["<message 1>", "<message 2>", "<message 3>"],
+    "budget_allocation": {{
+        "social_media": "<percentage>",
+        "content_creation": "<percentage>",
+        "influencer_partnerships": "<percentage>",
+        "paid_advertising": "<percentage>"
+    }}
+}}
+
+Provide 3-4 marketing channels and 3 timeline phases."""
+        
+        result = await gemini_structured("marketing_strategy", prompt, MarketingStrategyOutput, user_id)
+        return result.model_dump()
+        
+    except Exception as e:
+        logging.error(f"Marketing strategy error: {e}")
+        # Return fallback
+        return {
+            "overview": f"A focused marketing strategy for the {data.category} campaign emphasizing community engagement and authentic storytelling.",
+            "target_audience": {
+                "primary": f"{data.category} enthusiasts and supporters",
+                "secondary": "General crowdfunding community"
+            },
+            "channels": [
+                {"name": "Social Media", "strategy": "Engage audiences on major platforms", "priority": "High"},
+                {"name": "Email Marketing", "strategy": "Build and nurture email subscribers", "priority": "High"}
+            ],
+            "timeline": [
+                {"phase": "Pre-Launch", "duration": "2 weeks", "actions": ["Build awareness", "Collect subscribers"]},
+                {"phase": "Launch", "duration": "1 week", "actions": ["Announce campaign", "Drive initial momentum"]}
+            ],
+            "key_messages": ["Support innovation", "Make an impact"],
+            "budget_allocation": {
+                "social_media": "40%",
+                "content_creation": "30%",
+                "influencer_partnerships": "20%",
+                "paid_advertising": "10%"
+            }
+        }
+
+# ============ AI COMBINED OPTIMIZATION ENDPOINT ============
+
+OPTIMIZE_ALL_GENERATORS = {
+    "title": (suggest_titles, OptimizeTitleRequest),
+    "description": (improve_description, EnhanceDescriptionRequest),
+    "success_prediction": (predict_success, SuccessPredictionRequest),
+    "marketing_strategy": (plan_marketing, MarketingStrategyRequest),
+}
+
+@router.post("/ai/optimize-all")
+async def optimize_all(data: OptimizeAllRequest, request: Request):
+    """Run the wizard's optimizations concurrently, streaming each section as NDJSON when it completes"""
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    
+    sections = [section for section in OPTIMIZE_SECTIONS if section in data.sections]
+    if not sections or len(sections) != len(set(data.sections)):
+        raise HTTPException(400, f"sections must be drawn from {', '.join(OPTIMIZE_SECTIONS)}")
+    
+    # The router dependency paid for one Gemini call; charge the rest up front
+    if len(sections) > 1:
+        await ai_limiter.admit(quota_caller(request, user), len(sections) - 1)
+    fields = data.model_dump(exclude={"sections"})
+    
+    async def run(section: str):
+        generate, model = OPTIMIZE_ALL_GENERATORS[section]
+        try:
+            # A slot per section, so concurrent sections count against the in-flight cap like separate
+            # requests; dependencies exit before a streaming body runs, so it is taken here
+            async with ai_limiter.slot():
+                data = await generate(model.model_validate(fields), user.id)
+            return {"section": section, "status": "ok", "data": data}
+        except Exception as e:
+            logging.error(f"Optimize-all {section} error: {e}")
+            detail = e.detail if isinstance(e, HTTPException) else "AI service error"
+            return {"section": section, "status": "error", "error": detail}
+    
+    async def stream():
+        tasks = [asyncio.create_task(run(section)) for section in sections]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield dumps(await finished) + b"\n"
+        finally:
+            # Client went away: stop paying for sections nobody will read
+            for task in tasks:
+                task.cancel()
+        yield dumps({"done": True}) + b"\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -0,0 +1,260 @@
+"""Campaign analytics: overview, Monte Carlo projections and Gemini market analysis"""
+from fastapi import APIRouter, Depends, HTTPException, Request
+import logging
+from core import genai, sb_find, sb_find_one, gemini_structured, get_current_user, ai_quota
+from models import CompetitorAnalysisOutput, StrategicRecommendationsOutput
+from success_model import success_level, success_model
+
+router = APIRouter(prefix="/api", tags=["analytics"])
+WARM_UP = (genai,)
+
+# ============ ANALYTICS ENDPOINTS ============
+# Only the Gemini-backed endpoints take AI quota; overview and Monte Carlo are local
+
+def simulate_funding(goal: float, current_raised: float, days_remaining: int = 25,
+                     success_probability: float = None) -> dict:
+    """Funding scenarios and a day-by-day progression for the Monte Carlo view"""
+    import random
+    
+    # Generate three scenarios
+    pessimistic = goal * 0.475
+    realistic = goal * 0.70
+    optimistic = goal * 0.835
+    
+    # Calculate success probability, unless the local model already scored the campaign
+    if success_probability is None:
+        success_probability = min(95, max(60, (current_raised / goal) * 100 + random.uniform(10, 30)))
+    
+    # Generate funding progression data
+    progression_data = []
+    for day in range(1, days_remaining + 1):
+        # Simulate funding growth with some randomness
+        base_progress = current_raised + (realistic - current_raised) * (day / days_remaining)
+        variance = random.uniform(-0.1, 0.15) * base_progress
+        amount = max(current_raised, base_progress + variance)
+        progression_data.append({"day": day, "amount": round(amount, 2)})
+    
+    return {
+        "pessimistic": round(pessimistic, 2),
+        "realistic": round(realistic, 2),
+        "optimistic": round(optimistic, 2),
+        "success_probability": round(success_probability, 1),
+        "progression_data": progression_data,
+    }
+
+@router.get("/analytics/overview")
+async def analytics_overview(request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    
+    # Get user's campaigns
+    campaigns = await sb_find("campaigns", {"creator_id": user.id}, 1000)
+    
+    total_raised = sum(c.get("raised_amount", 0) for c in campaigns)
+    total_backers = sum(c.get("backers_count", 0) for c in campaigns)
+    active_campaigns = sum(1 for c in campaigns if c.get("status") == "active")
+    
+    return {
+        "total_campaigns": len(campaigns),
+        "active_campaigns": active_campaigns,
+        "total_raised": total_raised,
+        "total_backers": total_backers,
+        "campaigns": campaigns
+    }
+
+@router.get("/analytics/monte-carlo/{campaign_id}")
+async def monte_carlo_simulation(campaign_id: str, request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    
+    campaign = await sb_find_one("campaigns", {"id": campaign_id})
+    if not campaign:
+        raise HTTPException(404, "Campaign not found")
+    
+    # Monte Carlo simulation parameters
+    simulation = simulate_funding(
+        campaign["goal_amount"], campaign["raised_amount"], days_remaining=25,
+        success_probability=success_model.score(campaign) if success_model is not None else None,
+    )
+    
+    return {
+        **simulation,
+        "key_insights": [
+            "Campaign exhibits a typical slow start, gaining momentum as it progresses.",
+            "Mid-campaign boosts show significant increases, indicating effective marketing impact.",
+            "Final rush towards the campaign's end helps maximize funding, ensuring a potential stretch goal achievement."
+        ]
+    }
+
+@router.get("/analytics/competitor-analysis/{campaign_id}", dependencies=[Depends(ai_quota)])
+async def competitor_analysis(campaign_id: str, request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    
+    campaign = await sb_find_one("campaigns", {"id": campaign_id})
+    if not campaign:
+        raise HTTPException(404, "Campaign not found")
+    
+    try:
+        prompt = f"""You are analyzing a crowdfunding campaign in the {campaign['category']} category. 
+        Campaign Title: {campaign['title']}
+        Goal: ${campaign['goal_amount']}
+        Description: {campaign['description']}
+        
+        Provide a comprehensive competitor analysis in JSON format with the following structure:
+        {{
+            "market_overview": {{
+                "category_performance": "Detailed text about the category performance",
+                "average_success_rate": "A percentage as a string (e.g., '80.00%')",
+                "typical_funding_min": 50000,
+                "typical_funding_max": 1000000
+            }},
+            "key_trends": [
+                "Trend 1 description",
+                "Trend 2 description",
+                "Trend 3 description"
+            ],
+            "top_competitors": [
+                {{
+                    "name": "Competitor Name",
+                    "funding": 1064708,
+                    "description": "Brief description",
+                    "success_factors": "What made them successful"
+                }}
+            ]
+        }}
+        
+        Make it realistic and specific to the {campaign['category']} category. Provide 3 top competitors with actual realistic names and amounts."""
+        
+        result = await gemini_structured("competitor_analysis", prompt, CompetitorAnalysisOutput, user.id)
+        return result.model_dump()
+        
+    except Exception as e:
+        logging.error(f"Competitor analysis error: {e}")
+        # Return fallback data
+        return {
+            "market_overview": {
+                "category_performance": f"The {campaign['category']} crowdfunding category has seen significant success.",
+                "average_success_rate": "80.00%",
+                "typical_funding_min": 50000,
+                "typical_funding_max": 1000000
+            },
+            "key_trends": [
+                "Growing interest in innovative products",
+                "Increased support for creative projects",
+                "Rising demand for quality and authenticity"
+            ],
+            "top_competitors": []
+        }
+
+@router.get("/analytics/strategic-recommendations/{campaign_id}", dependencies=[Depends(ai_quota)])
+async def strategic_recommendations(campaign_id: str, request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    
+    campaign = await sb_find_one("campaigns", {"id": campaign_id})
+    if not campaign:
+        raise HTTPException(404, "Campaign not found")
+    
+    outlook = None
+    if success_model is not None:
+        # Numbers from the local model; Gemini's outlook only contributes the similar_campaigns text
+        percentage = success_model.score(campaign)
+        outlook = {
+            "percentage": percentage,
+            "level": success_level(percentage),
+            "category_average": f"{success_model.category_rate(campaign['category']) * 100:.0f}% success rate",
+            "similar_campaigns": "Campaigns with strong narratives tend to perform well.",
+        }
+    
+    try:
+        prompt = f"""You are providing strategic recommendations for a crowdfunding campaign.
+        Campaign: {campaign['title']}
+        Category: {campaign['category']}
+        Goal: ${campaign['goal_amount']}
+        Current Raised: ${campaign['raised_amount']}
+        Description: {campaign['description']}
+        
+        Provide strategic recommendations in JSON format:
+        {{
+            "success_prediction": {{
+                "percentage": 85,
+                "level": "High",
+                "category_average": "65% success rate",
+                "similar_campaigns": "Typically, {campaign['category']}-related campaigns with a personal touch and cultural significance have shown to succeed well, especially those that tell a compelling story."
+            }},
+            "success_factors": [
+                "Factor 1",
+                "Factor 2",
+                "Factor 3"
+            ],
+            "risk_factors": [
+                "Risk 1",
+                "Risk 2",
+                "Risk 3"
+            ],
+            "action_recommendations": [
+                {{
+                    "title": "Action title",
+                    "description": "Detailed description",
+                    "priority": "High"
+                }}
+            ],
+            "strategic_recommendations": [
+                {{
+                    "category": "Product Offering",
+                    "priority": "High",
+                    "description": "Recommendation description"
+                }},
+                {{
+                    "category": "Pricing Strategy",
+                    "priority": "High",
+                    "description": "Recommendation with reward tiers",
+                    "reward_tiers": [
+                        {{"amount": 25, "description": "Digital copy of the cookbook"}},
+                        {{"amount": 50, "description": "Physical copy of the cookbook"}},
+                        {{"amount": 100, "description": "Signed copy with exclusive recipes"}},
+                        {{"amount": 200, "description": "Bundle with additional cooking tools or merchandise"}}
+                    ]
+                }},
+                {{
+                    "category": "Marketing Tactics",
+                    "priority": "Medium",
+                    "description": "Marketing recommendation"
+                }},
+                {{
+                    "category": "Community Engagement",
+                    "priority": "Medium",
+                    "description": "Community engagement recommendation"
+                }}
+            ]
+        }}
+        
+        Make it specific and actionable for this campaign."""
+        
+        result = await gemini_structured("strategic_recommendations", prompt, StrategicRecommendationsOutput, user.id)
+        if outlook:
+            result.success_prediction.percentage = outlook["percentage"]
+            result.success_prediction.level = outlook["level"]
+            result.success_prediction.category_average = outlook["category_average"]
+        return result.model_dump(exclude_none=True)
+        
+    except Exception as e:
+        logging.error(f"Strategic recommendations error: {e}")
+        current_percentage = (campaign['raised_amount'] / campaign['goal_amount']) * 100
+        return {
+            "success_prediction": outlook or {
+                "percentage": min(95, max(70, int(current_percentage + 20))),
+                "level": "High",
+                "category_average": "65% success rate",
+                "similar_campaigns": "Campaigns with strong narratives tend to perform well."
+            },
+            "success_factors": ["Strong backing", "Good presentation"],
+            "risk_factors": ["Market competition"],
+            "action_recommendations": [],
+            "strategic_recommendations": []
+        }
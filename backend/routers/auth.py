@@ -0,0 +1,289 @@
+"""Registration, login, Google OAuth, sessions and profile endpoints"""
+from fastapi import APIRouter, HTTPException, Request, Response
+import os
+import logging
+import uuid
+from datetime import datetime, timezone, timedelta
+from core import (supabase, sb_execute, sb_find_one, sb_insert, sb_update, sb_delete, get_current_user,
+                  hash_password, verify_password)
+from models import User, UserSession, EmailVerification, RegisterRequest, LoginRequest
+
+router = APIRouter(prefix="/api", tags=["auth"])
+
+# ============ AUTH ENDPOINTS ============
+
+@router.post("/auth/register")
+async def register(data: RegisterRequest, response: Response):
+    # Check if user exists
+    existing = await sb_find_one("users", {"email": data.email})
+    if existing:
+        raise HTTPException(400, "Email already registered")
+    
+    # Create user (not verified yet)
+    user = User(
+        email=data.email,
+        name=data.name,
+        password_hash=hash_password(data.password)
+    )
+    user_dict = user.model_dump()
+    user_dict['created_at'] = user_dict['created_at'].isoformat()
+    await sb_insert("users", user_dict)
+    
+    # Create email verification token
+    verification = EmailVerification(email=data.email)
+    verification_dict = verification.model_dump()
+    verification_dict['created_at'] = verification_dict['created_at'].isoformat()
+    verification_dict['expires_at'] = verification_dict['expires_at'].isoformat()
+    await sb_insert("email_verifications", verification_dict)
+    
+    # In production, send email with verification link
+    # For now, we'll return the verification link
+    frontend_url = os.environ.get('REACT_APP_BACKEND_URL', 'http://localhost:3000').replace(':8001', ':3000').replace('/api', '')
+    verification_link = f"{frontend_url}/verify-email?token={verification.verification_token}"
+    
+    logging.info(f"Verification link for {data.email}: {verification_link}")
+    
+    # Create session (user can login but should verify email)
+    session = UserSession(
+        user_id=user.id,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=7)
+    )
+    session_dict = session.model_dump()
+    session_dict['created_at'] = session_dict['created_at'].isoformat()
+    session_dict['expires_at'] = session_dict['expires_at'].isoformat()
+    await sb_insert("user_sessions", session_dict)
+    
+    # Set cookie
+    response.set_cookie(
+        key="session_token",
+        value=session.session_token,
+        httponly=True,
+        secure=True,
+        samesite="none",
+        max_age=7*24*60*60,
+        path="/"
+    )
+    
+    return {
+        "user": user.model_dump(), 
+        "session_token": session.session_token,
+        "verification_link": verification_link,
+        "message": "Please check your email to verify your account"
+    }
+
+@router.post("/auth/login")
+async def login(data: LoginRequest, response: Response):
+    user_doc = await sb_find_one("users", {"email": data.email})
+    if not user_doc:
+        raise HTTPException(401, "Invalid credentials")
+    
+    if not verify_password(data.password, user_doc.get("password_hash", "")):
+        raise HTTPException(401, "Invalid credentials")
+    
+    if isinstance(user_doc['created_at'], str):
+        user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
+    user = User(**user_doc)
+    
+    # Create session
+    session = UserSession(
+        user_id=user.id,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=7)
+    )
+    session_dict = session.model_dump()
+    session_dict['created_at'] = session_dict['created_at'].isoformat()
+    session_dict['expires_at'] = session_dict['expires_at'].isoformat()
+    await sb_insert("user_sessions", session_dict)
+    
+    # Set cookie
+    response.set_cookie(
+        key="session_token",
+        value=session.session_token,
+        httponly=True,
+        secure=True,
+        samesite="none",
+        max_age=7*24*60*60,
+        path="/"
+    )
+    
+    return {"user": user.model_dump(), "session_token": session.session_token}
+
+@router.get("/auth/google-login")
+async def google_login():
+    """Initiate Google OAuth via Supabase"""
+    try:
+        # Get frontend URL from environment or use default
+        frontend_url = os.environ.get('REACT_APP_BACKEND_URL', 'http://localhost:3000').replace(':8001', ':3000').replace('/api', '')
+        
+        # Supabase OAuth sign in
+        data = await sb_execute("auth", "sign_in_with_oauth", supabase.auth.sign_in_with_oauth, {
+            "provider": "google",
+            "options": {
+                "redirect_to": f"{frontend_url}/"
+            }
+        })
+        return {"url": data.url}
+    except Exception as e:
+        logging.error(f"OAuth initiation failed: {str(e)}")
+        raise HTTPException(500, f"OAuth initiation failed: {str(e)}")
+
+@router.post("/auth/google/callback")
+async def google_callback(request: Request, response: Response):
+    """Handle Google OAuth callback from Supabase"""
+    try:
+        # Get the access token from the request body or query params
+        body = await request.json() if request.headers.get("content-type") == "application/json" else {}
+        access_token = body.get('access_token')
+        
+        # If not in body, check query params
+        if not access_token:
+            access_token = request.query_params.get('access_token')
+        
+        if not access_token:
+            # Check if we have the full hash fragment data
+            hash_data = body.get('hash_data')
+            if hash_data:
+                # Parse hash fragment
+                import urllib.parse
+                params = urllib.parse.parse_qs(hash_data.lstrip('#'))
+                access_token = params.get('access_token', [None])[0]
+        
+        if not access_token:
+            raise HTTPException(400, "Missing access token")
+        
+        # Get user from Supabase auth
+        user_response = await sb_execute("auth", "get_user", supabase.auth.get_user, access_token)
+        supabase_user = user_response.user
+        
+        if not supabase_user:
+            raise HTTPException(401, "Invalid token")
+        
+        # Check if user exists in our database
+        user_doc = await sb_find_one("users", {"email": supabase_user.email})
+        
+        if not user_doc:
+            # Create new user
+            user = User(
+                email=supabase_user.email,
+                name=supabase_user.user_metadata.get("full_name", supabase_user.email.split("@")[0]),
+                picture=supabase_user.user_metadata.get("avatar_url")
+            )
+            user_dict = user.model_dump()
+            user_dict['created_at'] = user_dict['created_at'].isoformat()
+            await sb_insert("users", user_dict)
+        else:
+            if isinstance(user_doc['created_at'], str):
+                user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
+            user = User(**user_doc)
+        
+        # Create backend session
+        session_token = str(uuid.uuid4())
+        backend_session = UserSession(
+            session_token=session_token,
+            user_id=user.id,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=7)
+        )
+        session_dict = backend_session.model_dump()
+        session_dict['created_at'] = session_dict['created_at'].isoformat()
+        session_dict['expires_at'] = session_dict['expires_at'].isoformat()
+        await sb_insert("user_sessions", session_dict)
+        
+        # Set cookie
+        response.set_cookie(
+            key="session_token",
+            value=session_token,
+            httponly=True,
+            secure=True,
+            samesite="none",
+            max_age=7*24*60*60,
+            path="/"
+        )
+        
+        return {"user": user.model_dump(), "session_token": session_token}
+    except Exception as e:
+        logging.error(f"OAuth callback error: {str(e)}")
+        raise HTTPException(500, f"OAuth callback failed: {str(e)}")
+
+@router.get("/auth/me")
+async def get_me(request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    return user
+
+@router.post("/auth/logout")
+async def logout(request: Request, response: Response):
+    session_token = request.cookies.get("session_token")
+    if session_token:
+        await sb_delete("user_sessions", {"session_token": session_token})
+    
+    response.delete_cookie("session_token", path="/")
+    return {"message": "Logged out"}
+
+@router.get("/auth/verify-email")
+async def verify_email(token: str):
+    """Verify email with token"""
+    verification = await sb_find_one("email_verifications", {"verification_token": token})
+    
+    if not verification:
+        raise HTTPException(404, "Invalid verification token")
+    
+    if verification.get("verified"):
+        return {"message": "Email already verified"}
+    
+    if datetime.fromisoformat(verification["expires_at"]) < datetime.now(timezone.utc):
+        raise HTTPException(400, "Verification token expired")
+    
+    # Mark as verified
+    await sb_update(
+        "email_verifications",
+        {"verification_token": token},
+        {"verified": True}
+    )
+    
+    # You could also add a verified flag to the user model if needed
+    # await sb_update("users", {"email": verification["email"]}, {"email_verified": True})
+    
+    return {"message": "Email verified successfully"}
+
+@router.post("/auth/reset-password")
+async def reset_password(request: Request):
+    """Send password reset email via Supabase"""
+    try:
+        body = await request.json()
+        email = body.get('email')
+        
+        if not email:
+            raise HTTPException(400, "Email is required")
+        
+        # Use Supabase Auth to send password reset email
+        await sb_execute("auth", "reset_password_email", supabase.auth.reset_password_email, email)
+        
+        return {"message": "Password reset email sent"}
+    except Exception as e:
+        logging.error(f"Password reset error: {e}")
+        raise HTTPException(500, f"Failed to send reset email: {str(e)}")
+
+@router.put("/auth/update-profile")
+async def update_profile(request: Request):
+    """Update user profile"""
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    
+    body = await request.json()
+    update_data = {}
+    
+    # Allow updating specific fields
+    if 'name' in body:
+        update_data['name'] = body['name']
+    if 'phone' in body:
+        update_data['phone'] = body['phone']
+    if 'location' in body:
+        update_data['location'] = body['location']
+    if 'bio' in body:
+        update_data['bio'] = body['bio']
+    
+    if update_data:
+        await sb_update("users", {"id": user.id}, update_data)
+    
+    return {"message": "Profile updated successfully"}
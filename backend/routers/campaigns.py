@@ -0,0 +1,270 @@
+"""Campaign listing, detail, home feed, CRUD and AI success analysis endpoints"""
+from fastapi import APIRouter, HTTPException, Request, Response
+import asyncio
+import logging
+from typing import List, Optional
+from datetime import datetime
+from fast_json import FastJSONResponse
+from core import (genai, sb_find, sb_find_one, sb_insert, sb_update, sb_delete, get_current_user,
+                  home_feed, record_cached_answer, ai_limiter, quota_caller)
+from analysis import analysis_refresher, generate_analysis
+from campaign_scores import SCORE_COLUMNS, listing_order
+from success_model import success_model
+from models import (Campaign, CAMPAIGN_COLUMNS, AIAnalysis, CampaignCreate, CampaignCreateExtended,
+                    CampaignUpdate)
+
+router = APIRouter(prefix="/api", tags=["campaigns"])
+WARM_UP = (genai,)
+
+LISTING_COLUMNS = ",".join((CAMPAIGN_COLUMNS, *SCORE_COLUMNS))
+
+# ============ CAMPAIGN ENDPOINTS ============
+
+@router.get("/feed/home")
+async def get_home_feed(request: Request):
+    """Precomputed landing page sections (trending, nearly funded, newest, per category)"""
+    body, etag = home_feed.render()
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=30"}
+    # If-None-Match uses weak comparison, so a gzip/br cached copy's W/ tag matches too
+    candidates = {tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")}
+    if "*" in candidates or etag.removeprefix("W/") in candidates:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def stored_success_probabilities(campaign_ids: List[str], chunk_size: int = 200) -> dict:
+    """campaign_id -> success_probability from the stored analyses, in a few batched lookups"""
+    chunks = [campaign_ids[i:i + chunk_size] for i in range(0, len(campaign_ids), chunk_size)]
+    results = await asyncio.gather(*(
+        sb_find("ai_analyses", {"campaign_id": {"$in": chunk}}, len(chunk),
+                columns="campaign_id,success_probability")
+        for chunk in chunks
+    ))
+    return {row["campaign_id"]: row["success_probability"] for rows in results for row in rows}
+
+@router.get("/campaigns", response_model=List[Campaign])
+async def get_campaigns(category: Optional[str] = None, search: Optional[str] = None, sort: Optional[str] = None):
+    order_by, desc, sort_filters = listing_order(sort)
+    query = {"status": "active", **sort_filters}
+    if category:
+        query["category"] = category
+    if search:
+        query["title"] = {"$regex": search, "$options": "i"}
+    
+    # Rows are already JSON-ready, so serialize them as-is instead of re-validating
+    campaigns = await sb_find("campaigns", query, 1000, columns=LISTING_COLUMNS, order_by=order_by, desc=desc)
+    if success_model is not None and campaigns:
+        # Badge scores for the whole page in one pass, instead of an /analysis call per card
+        for campaign, score in zip(campaigns, success_model.score_many(campaigns).tolist()):
+            campaign["success_probability"] = score
+    elif campaigns:
+        stored = await stored_success_probabilities([c["id"] for c in campaigns])
+        for campaign in campaigns:
+            if campaign["id"] in stored:
+                campaign["success_probability"] = stored[campaign["id"]]
+    return FastJSONResponse(campaigns)
+
+@router.get("/campaigns/{campaign_id}")
+async def get_campaign(campaign_id: str):
+    campaign = await sb_find_one("campaigns", {"id": campaign_id})
+    if not campaign:
+        raise HTTPException(404, "Campaign not found")
+    return FastJSONResponse(campaign)
+
+@router.get("/campaigns/{campaign_id}/page")
+async def get_campaign_page(campaign_id: str, request: Request, comments_limit: int = 50):
+    """Campaign, cached analysis, first page of comments and viewer pledge status in one payload"""
+    comments_limit = max(1, min(comments_limit, 1000))
+
+    async def get_viewer():
+        user = await get_current_user(request)
+        if not user:
+            return {"authenticated": False, "has_pledged": False}
+        pledge = await sb_find_one("pledges", {"campaign_id": campaign_id, "user_id": user.id,
+                                               "payment_status": "paid"})
+        return {"authenticated": True, "user_id": user.id, "has_pledged": pledge is not None}
+
+    campaign, analysis, comments, viewer = await asyncio.gather(
+        sb_find_one("campaigns", {"id": campaign_id}),
+        sb_find_one("ai_analyses", {"campaign_id": campaign_id}),
+        sb_find("comments", {"campaign_id": campaign_id}, comments_limit + 1, order_by="created_at", desc=True),
+        get_viewer(),
+    )
+    if not campaign:
+        raise HTTPException(404, "Campaign not found")
+
+    viewer["is_creator"] = viewer.get("user_id") == campaign["creator_id"]
+
+    # Analysis is only served from cache here; a missing one is generated via /analysis
+    return FastJSONResponse({
+        "campaign": campaign,
+        "analysis": analysis,
+        "comments": comments[:comments_limit],
+        "has_more_comments": len(comments) > comments_limit,
+        "viewer": viewer,
+    })
+
+@router.post("/campaigns", response_model=Campaign)
+async def create_campaign(data: CampaignCreate, request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    
+    campaign = Campaign(
+        title=data.title,
+        description=data.description,
+        category=data.category,
+        goal_amount=data.goal_amount,
+        creator_id=user.id,
+        creator_name=user.name,
+        image_url=data.image_url,
+        duration_days=30,
+        tags=[],
+        reward_tiers=[]
+    )
+    
+    # Get AI analysis; over quota the campaign is still created and the analysis generated on first view
+    try:
+        async with ai_limiter.limit(quota_caller(request, user)):
+            probability, analysis_text = await generate_analysis(campaign.model_dump(), "create_campaign", user.id)
+        
+        # Save AI analysis
+        ai_analysis = AIAnalysis(
+            campaign_id=campaign.id,
+            success_probability=probability,
+            analysis_text=analysis_text
+        )
+        ai_dict = ai_analysis.model_dump()
+        ai_dict['created_at'] = ai_dict['created_at'].isoformat()
+        await sb_insert("ai_analyses", ai_dict)
+    except Exception as e:
+        logging.error(f"AI analysis error: {e}")
+    
+    campaign_dict = campaign.model_dump()
+    campaign_dict['created_at'] = campaign_dict['created_at'].isoformat()
+    await sb_insert("campaigns", campaign_dict)
+    home_feed.upsert_campaign(campaign_dict)
+    
+    return campaign
+
+@router.post("/campaigns/extended", response_model=Campaign)
+async def create_campaign_extended(data: CampaignCreateExtended, request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    
+    # Convert reward tiers to dict format
+    reward_tiers_dict = [tier.model_dump() for tier in data.reward_tiers]
+    
+    campaign = Campaign(
+        title=data.title,
+        description=data.description,
+        category=data.category,
+        goal_amount=data.goal_amount,
+        creator_id=user.id,
+        creator_name=user.name,
+        image_url=data.image_url,
+        status=data.status,
+        duration_days=data.duration_days,
+        tags=data.tags,
+        reward_tiers=reward_tiers_dict
+    )
+    
+    campaign_dict = campaign.model_dump()
+    campaign_dict['created_at'] = campaign_dict['created_at'].isoformat()
+    await sb_insert("campaigns", campaign_dict)
+    home_feed.upsert_campaign(campaign_dict)
+    
+    return campaign
+
+@router.put("/campaigns/{campaign_id}")
+async def update_campaign(campaign_id: str, data: CampaignUpdate, request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    
+    campaign = await sb_find_one("campaigns", {"id": campaign_id})
+    if not campaign:
+        raise HTTPException(404, "Campaign not found")
+    
+    if campaign["creator_id"] != user.id and not user.is_admin:
+        raise HTTPException(403, "Not authorized")
+    
+    update_data = {k: v for k, v in data.model_dump().items() if v is not None}
+    if update_data:
+        await sb_update("campaigns", {"id": campaign_id}, {"$set": update_data})
+        analysis_refresher.note_update(campaign_id, campaign, update_data)
+    
+    updated = await sb_find_one("campaigns", {"id": campaign_id})
+    home_feed.upsert_campaign(updated)
+    if isinstance(updated['created_at'], str):
+        updated['created_at'] = datetime.fromisoformat(updated['created_at'])
+    return updated
+
+@router.delete("/campaigns/{campaign_id}")
+async def delete_campaign(campaign_id: str, request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    
+    campaign = await sb_find_one("campaigns", {"id": campaign_id})
+    if not campaign:
+        raise HTTPException(404, "Campaign not found")
+    
+    if campaign["creator_id"] != user.id and not user.is_admin:
+        raise HTTPException(403, "Not authorized")
+    
+    await sb_delete("campaigns", {"id": campaign_id})
+    home_feed.remove_campaign(campaign_id)
+    return {"message": "Campaign deleted"}
+
+@router.get("/campaigns/{campaign_id}/analysis")
+async def get_campaign_analysis(campaign_id: str, request: Request):
+    analysis = await sb_find_one("ai_analyses", {"campaign_id": campaign_id})
+    
+    # If analysis doesn't exist, generate it dynamically; only this path spends AI quota, so
+    # stored analyses keep serving page views when the caller is over it
+    if not analysis:
+        campaign = await sb_find_one("campaigns", {"id": campaign_id})
+        if not campaign:
+            raise HTTPException(404, "Campaign not found")
+        
+        try:
+            user = await get_current_user(request)
+            async with ai_limiter.limit(quota_caller(request, user)):
+                probability, analysis_text = await generate_analysis(campaign, "get_campaign_analysis")
+            
+            # Save AI analysis for future use
+            ai_analysis = AIAnalysis(
+                campaign_id=campaign_id,
+                success_probability=probability,
+                analysis_text=analysis_text
+            )
+            ai_dict = ai_analysis.model_dump()
+            ai_dict['created_at'] = ai_dict['created_at'].isoformat()
+            await sb_insert("ai_analyses", ai_dict)
+            
+            return {
+                "campaign_id": campaign_id,
+                "success_probability": probability,
+                "analysis_text": analysis_text,
+                "created_at": ai_dict['created_at']
+            }
+        except Exception as e:
+            logging.error(f"AI analysis error: {e}")
+            return {"success_probability": 75.0, "analysis_text": "Analysis pending"}
+    
+    record_cached_answer("get_campaign_analysis")
+    if isinstance(analysis['created_at'], str):
+        analysis['created_at'] = datetime.fromisoformat(analysis['created_at'])
+    return analysis
+
+@router.get("/my-campaigns")
+async def get_my_campaigns(request: Request, sort: Optional[str] = None):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    
+    order_by, desc, sort_filters = listing_order(sort)
+    campaigns = await sb_find("campaigns", {"creator_id": user.id, **sort_filters}, 1000, order_by=order_by,
+                              desc=desc)
+    return FastJSONResponse(campaigns)
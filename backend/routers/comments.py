@@ -0,0 +1,33 @@
+"""Campaign comment endpoints"""
+from fastapi import APIRouter, HTTPException, Request
+from fast_json import FastJSONResponse
+from core import sb_find, sb_insert, get_current_user
+from models import Comment, CommentCreate
+
+router = APIRouter(prefix="/api", tags=["comments"])
+
+# ============ COMMENTS ENDPOINTS ============
+
+@router.get("/campaigns/{campaign_id}/comments")
+async def get_comments(campaign_id: str):
+    comments = await sb_find("comments", {"campaign_id": campaign_id}, 1000, order_by="created_at", desc=True)
+    return FastJSONResponse(comments)
+
+@router.post("/campaigns/{campaign_id}/comments")
+async def create_comment(campaign_id: str, data: CommentCreate, request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    
+    comment = Comment(
+        campaign_id=campaign_id,
+        user_id=user.id,
+        user_name=user.name,
+        content=data.content
+    )
+    
+    comment_dict = comment.model_dump()
+    comment_dict['created_at'] = comment_dict['created_at'].isoformat()
+    await sb_insert("comments", comment_dict)
+    
+    return comment
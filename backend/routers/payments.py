@@ -0,0 +1,157 @@
+"""Stripe checkout, payment status and webhook endpoints"""
+from fastapi import APIRouter, HTTPException, Request
+import os
+import logging
+from core import stripe, stripe_call, sb_find_one, sb_insert, sb_update, get_current_user, home_feed
+from analysis import analysis_refresher
+from models import Pledge, PaymentTransaction, PledgeRequest
+
+router = APIRouter(prefix="/api", tags=["payments"])
+WARM_UP = (stripe,)
+
+# ============ PAYMENT ENDPOINTS ============
+
+@router.post("/payments/create-checkout")
+async def create_checkout(data: PledgeRequest, request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    
+    # Get campaign
+    campaign = await sb_find_one("campaigns", {"id": data.campaign_id})
+    if not campaign:
+        raise HTTPException(404, "Campaign not found")
+    
+    # Fixed pledge amounts (in INR)
+    PLEDGE_PACKAGES = {
+        "small": 500.0,
+        "medium": 2500.0,
+        "large": 5000.0
+    }
+    
+    # Default to small package
+    amount = PLEDGE_PACKAGES["small"]
+    
+    try:
+        host_url = data.origin_url
+        
+        success_url = f"{host_url}/campaign/{data.campaign_id}?session_id={{CHECKOUT_SESSION_ID}}"
+        cancel_url = f"{host_url}/campaign/{data.campaign_id}"
+        
+        # Create Stripe checkout session
+        session = await stripe_call(
+            "checkout.session.create", stripe.checkout.Session.create,
+            payment_method_types=['card'],
+            line_items=[{
+                'price_data': {
+                    'currency': 'inr',
+                    'product_data': {
+                        'name': f'Back Campaign: {campaign["title"]}',
+                        'description': f'Supporting {campaign["title"]}',
+                    },
+                    'unit_amount': int(amount * 100),  # Stripe uses paise (smallest unit)
+                },
+                'quantity': 1,
+            }],
+            mode='payment',
+            success_url=success_url,
+            cancel_url=cancel_url,
+            metadata={
+                "campaign_id": data.campaign_id,
+                "user_id": user.id
+            }
+        )
+        
+        # Save transaction
+        transaction = PaymentTransaction(
+            session_id=session.id,
+            amount=amount,
+            currency="inr",
+            campaign_id=data.campaign_id,
+            user_id=user.id,
+            metadata={"campaign_id": data.campaign_id, "user_id": user.id}
+        )
+        tx_dict = transaction.model_dump()
+        tx_dict['created_at'] = tx_dict['created_at'].isoformat()
+        await sb_insert("payment_transactions", tx_dict)
+        
+        return {"url": session.url, "session_id": session.id}
+    except Exception as e:
+        logging.error(f"Payment error: {e}")
+        raise HTTPException(500, f"Payment service error: {str(e)}")
+
+@router.get("/payments/status/{session_id}")
+async def get_payment_status(session_id: str, request: Request):
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(401, "Not authenticated")
+    
+    try:
+        # Get session status from Stripe
+        session = await stripe_call("checkout.session.retrieve", stripe.checkout.Session.retrieve, session_id)
+        
+        # Update transaction
+        transaction = await sb_find_one("payment_transactions", {"session_id": session_id})
+        if transaction and transaction["payment_status"] != "paid":
+            new_status = "paid" if session.payment_status == "paid" else session.status
+            await sb_update(
+                "payment_transactions",
+                {"session_id": session_id},
+                {"payment_status": new_status}
+            )
+            
+            # If paid, update campaign
+            if new_status == "paid":
+                campaign_id = transaction["campaign_id"]
+                campaign = await sb_find_one("campaigns", {"id": campaign_id})
+                if campaign:
+                    await sb_update(
+                        "campaigns",
+                        {"id": campaign_id},
+                        {
+                            "raised_amount": campaign.get("raised_amount", 0) + transaction["amount"],
+                            "backers_count": campaign.get("backers_count", 0) + 1
+                        }
+                    )
+                    home_feed.record_pledge(campaign_id, transaction["amount"])
+                    raised = campaign.get("raised_amount", 0)
+                    analysis_refresher.note_funding(campaign_id, raised, raised + transaction["amount"],
+                                                    campaign.get("goal_amount"))
+                
+                # Create pledge record
+                pledge = Pledge(
+                    campaign_id=campaign_id,
+                    user_id=user.id,
+                    amount=transaction["amount"],
+                    session_id=session_id,
+                    payment_status="paid"
+                )
+                pledge_dict = pledge.model_dump()
+                pledge_dict['created_at'] = pledge_dict['created_at'].isoformat()
+                await sb_insert("pledges", pledge_dict)
+        
+        return {
+            "status": session.status,
+            "payment_status": session.payment_status,
+            "amount_total": session.amount_total / 100 if session.amount_total else 0,  # Convert from cents
+            "currency": session.currency
+        }
+    except Exception as e:
+        logging.error(f"Payment status error: {e}")
+        raise HTTPException(500, f"Payment service error: {str(e)}")
+
+@router.post("/webhook/stripe")
+async def stripe_webhook(request: Request):
+    try:
+        body = await request.body()
+        signature = request.headers.get("Stripe-Signature")
+        
+        stripe.api_key = os.environ.get('STRIPE_API_KEY')
+        
+        # Verify webhook signature (optional but recommended for production)
+        # event = stripe.Webhook.construct_event(body, signature, webhook_secret)
+        
+        return {"status": "success"}
+    except Exception as e:
+        logging.error(f"Webhook error: {e}")
+        return {"status": "error", "message": str(e)}
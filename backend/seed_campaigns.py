@@ -5,6 +5,7 @@ import uuid
 from supabase import create_client, Client
 from dotenv import load_dotenv
 from pathlib import Path
+from sb_bulk import insert_many
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -146,9 +147,9 @@ async def seed_campaigns():
         except Exception as e:
             print(f"Note: {e}")
         
-        # Insert campaigns
-        for campaign_data in CAMPAIGNS:
-            campaign = {
+        # Insert campaigns in one bulk request
+        campaigns = [
+            {
                 "id": str(uuid.uuid4()),
                 "title": campaign_data["title"],
                 "description": campaign_data["description"],
@@ -165,8 +166,10 @@ async def seed_campaigns():
                 "reward_tiers": [],
                 "created_at": datetime.now(timezone.utc).isoformat()
             }
-            
-            result = supabase.table("campaigns").insert(campaign).execute()
+            for campaign_data in CAMPAIGNS
+        ]
+        insert_many(supabase, "campaigns", campaigns)
+        for campaign in campaigns:
             print(f"Created campaign: {campaign['title']}")
         
         print(f"\nSuccessfully seeded {len(CAMPAIGNS)} campaigns!")
@@ -1,1836 +1,66 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Header, Request, Response
-from fastapi.responses import JSONResponse
-from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException, Request, Response
 from starlette.middleware.cors import CORSMiddleware
-from supabase import create_client, Client
 import os
+import asyncio
+import importlib
 import logging
-from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict, Any
-import uuid
-from datetime import datetime, timezone, timedelta
-import google.generativeai as genai
-import stripe
-import bcrypt
-
-ROOT_DIR = Path(__file__).parent
-load_dotenv(ROOT_DIR / '.env')
-
-# Supabase connection
-SUPABASE_URL = os.environ['SUPABASE_URL']
-SUPABASE_KEY = os.environ['SUPABASE_KEY']
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
-# Helper functions for Supabase
-def handle_supabase_response(response):
-    """Extract data from Supabase response"""
-    if hasattr(response, 'data'):
-        return response.data
-    return response
-
-async def sb_find_one(table: str, filters: dict):
-    """Find one record from Supabase table"""
-    query = supabase.table(table).select("*")
-    for key, value in filters.items():
-        query = query.eq(key, value)
-    result = query.limit(1).execute()
-    data = handle_supabase_response(result)
-    return data[0] if data else None
-
-async def sb_find(table: str, filters: dict = None, limit: int = 1000):
-    """Find multiple records from Supabase table"""
-    query = supabase.table(table).select("*")
-    if filters:
-        for key, value in filters.items():
-            if isinstance(value, dict):
-                # Handle special queries
-                if "$regex" in value:
-                    # Supabase uses ilike for pattern matching
-                    search_term = value["$regex"]
-                    query = query.ilike(key, f"%{search_term}%")
-            else:
-                query = query.eq(key, value)
-    result = query.limit(limit).execute()
-    return handle_supabase_response(result) or []
-
-async def sb_insert(table: str, data: dict):
-    """Insert a record into Supabase table"""
-    clean_data = {k: v for k, v in data.items() if k != '_id' and v is not None}
-    result = supabase.table(table).insert(clean_data).execute()
-    inserted = handle_supabase_response(result)
-    return inserted[0] if inserted else None
-
-async def sb_update(table: str, filters: dict, update_data: dict):
-    """Update records in Supabase table"""
-    # Remove $set wrapper if present
-    if "$set" in update_data:
-        update_data = update_data["$set"]
-    
-    query = supabase.table(table).update(update_data)
-    for key, value in filters.items():
-        query = query.eq(key, value)
-    result = query.execute()
-    return handle_supabase_response(result)
-
-async def sb_delete(table: str, filters: dict):
-    """Delete records from Supabase table"""
-    query = supabase.table(table).delete()
-    for key, value in filters.items():
-        query = query.eq(key, value)
-    result = query.execute()
-    return handle_supabase_response(result)
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from compression import CompressionMiddleware
+from metrics import REGISTRY, MetricsMiddleware
+from tracing import tracer, RequestIdFilter, TracingMiddleware
+from profiler import RequestProfilerMiddleware
+from lazy import warm_up
+from core import (supabase, sb_find_all, home_feed, HOME_FEED_REFRESH_SECONDS, LAZY_IMPORT_WARMUP, request_profiler,
+                  background_tasks, chat_message_writer, flush_token_usage, TOKEN_USAGE_FLUSH_SECONDS)
+from analysis import analysis_refresher
+from home_feed import SOURCE_COLUMNS as FEED_SOURCE_COLUMNS
+from campaign_scores import CAMPAIGN_SCORE_INTERVAL_SECONDS, campaign_scorer
+from routers import ALL_ROUTERS
 
 # Create the main app
 app = FastAPI()
-api_router = APIRouter(prefix="/api")
-
-# ============ MODELS ============
-
-class User(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    email: str
-    name: str
-    picture: Optional[str] = None
-    password_hash: Optional[str] = None
-    is_admin: bool = False
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-class UserSession(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    session_token: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    user_id: str
-    expires_at: datetime
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-class EmailVerification(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    email: str
-    verification_token: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    expires_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc) + timedelta(hours=24))
-    verified: bool = False
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-class Campaign(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    title: str
-    description: str
-    category: str
-    goal_amount: float
-    raised_amount: float = 0.0
-    creator_id: str
-    creator_name: Optional[str] = None
-    image_url: Optional[str] = None
-    status: str = "active"
-    backers_count: int = 0
-    duration_days: int = 30
-    tags: List[str] = []
-    reward_tiers: List[Dict[str, Any]] = []
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-class AIAnalysis(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    campaign_id: str
-    success_probability: float
-    analysis_text: str
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-class Comment(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    campaign_id: str
-    user_id: str
-    user_name: str
-    content: str
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-class Pledge(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    campaign_id: str
-    user_id: str
-    amount: float
-    session_id: Optional[str] = None
-    payment_status: str = "pending"
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-class PaymentTransaction(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    session_id: str
-    amount: float
-    currency: str
-    campaign_id: str
-    user_id: str
-    metadata: Optional[Dict[str, str]] = None
-    payment_status: str = "initiated"
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-class ChatMessage(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    user_id: Optional[str] = None
-    session_id: str
-    message: str
-    response: Optional[str] = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-# ============ REQUEST MODELS ============
-
-class RegisterRequest(BaseModel):
-    email: str
-    password: str
-    name: str
-
-class LoginRequest(BaseModel):
-    email: str
-    password: str
-
-class CampaignCreate(BaseModel):
-    title: str
-    description: str
-    category: str
-    goal_amount: float
-    image_url: Optional[str] = None
-
-class CampaignUpdate(BaseModel):
-    title: Optional[str] = None
-    description: Optional[str] = None
-    category: Optional[str] = None
-    goal_amount: Optional[float] = None
-    image_url: Optional[str] = None
-    status: Optional[str] = None
-
-class CommentCreate(BaseModel):
-    content: str
-
-class ChatRequest(BaseModel):
-    message: str
-    session_id: Optional[str] = None
-
-class PledgeRequest(BaseModel):
-    campaign_id: str
-    origin_url: str
-
-class RewardTier(BaseModel):
-    amount: float
-    description: str
-
-class CampaignCreateExtended(BaseModel):
-    title: str
-    description: str
-    category: str
-    goal_amount: float
-    duration_days: int = 30
-    status: str = "active"
-    tags: List[str] = []
-    reward_tiers: List[RewardTier] = []
-    image_url: Optional[str] = None
-
-class OptimizeTitleRequest(BaseModel):
-    title: str
-    description: str
-    category: str
-
-class EnhanceDescriptionRequest(BaseModel):
-    description: str
-    title: str
-    category: str
-    goal_amount: float
-
-class SuccessPredictionRequest(BaseModel):
-    title: str
-    description: str
-    category: str
-    goal_amount: float
-    reward_tiers: List[RewardTier] = []
-
-class MarketingStrategyRequest(BaseModel):
-    title: str
-    description: str
-    category: str
-    goal_amount: float
-
-# ============ HELPER FUNCTIONS ============
-
-async def get_supabase_user(request: Request):
-    """Get user from Supabase JWT token"""
-    auth_header = request.headers.get("authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        return None
-    
-    token = auth_header.split(" ")[1]
-    
-    try:
-        # Verify token and get user from Supabase
-        user_response = supabase.auth.get_user(token)
-        if user_response and user_response.user:
-            supabase_user = user_response.user
-            # Create User object from Supabase user
-            return User(
-                id=supabase_user.id,
-                email=supabase_user.email,
-                name=supabase_user.user_metadata.get('name', supabase_user.email.split('@')[0]),
-                is_admin=supabase_user.app_metadata.get('is_admin', False),
-                created_at=datetime.fromisoformat(supabase_user.created_at) if isinstance(supabase_user.created_at, str) else supabase_user.created_at
-            )
-    except Exception as e:
-        print(f"Error verifying Supabase token: {e}")
-        return None
-
-async def get_current_user(request: Request) -> Optional[User]:
-    # First try to get user from Supabase JWT token (for frontend auth)
-    supabase_user = await get_supabase_user(request)
-    if supabase_user:
-        return supabase_user
-    
-    # Fallback to session_token for backend auth
-    session_token = request.cookies.get("session_token")
-    
-    if not session_token:
-        auth_header = request.headers.get("authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            session_token = auth_header.split(" ")[1]
-    
-    if not session_token:
-        return None
-    
-    session = await sb_find_one("user_sessions", {"session_token": session_token})
-    if not session or datetime.fromisoformat(session["expires_at"]) < datetime.now(timezone.utc):
-        return None
-    
-    user_doc = await sb_find_one("users", {"id": session["user_id"]})
-    if not user_doc:
-        return None
-    
-    if isinstance(user_doc['created_at'], str):
-        user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
-    
-    return User(**user_doc)
-
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
-
-# ============ AUTH ENDPOINTS ============
-
-@api_router.post("/auth/register")
-async def register(data: RegisterRequest, response: Response):
-    # Check if user exists
-    existing = await sb_find_one("users", {"email": data.email})
-    if existing:
-        raise HTTPException(400, "Email already registered")
-    
-    # Create user (not verified yet)
-    user = User(
-        email=data.email,
-        name=data.name,
-        password_hash=hash_password(data.password)
-    )
-    user_dict = user.model_dump()
-    user_dict['created_at'] = user_dict['created_at'].isoformat()
-    await sb_insert("users", user_dict)
-    
-    # Create email verification token
-    verification = EmailVerification(email=data.email)
-    verification_dict = verification.model_dump()
-    verification_dict['created_at'] = verification_dict['created_at'].isoformat()
-    verification_dict['expires_at'] = verification_dict['expires_at'].isoformat()
-    await sb_insert("email_verifications", verification_dict)
-    
-    # In production, send email with verification link
-    # For now, we'll return the verification link
-    frontend_url = os.environ.get('REACT_APP_BACKEND_URL', 'http://localhost:3000').replace(':8001', ':3000').replace('/api', '')
-    verification_link = f"{frontend_url}/verify-email?token={verification.verification_token}"
-    
-    logging.info(f"Verification link for {data.email}: {verification_link}")
-    
-    # Create session (user can login but should verify email)
-    session = UserSession(
-        user_id=user.id,
-        expires_at=datetime.now(timezone.utc) + timedelta(days=7)
-    )
-    session_dict = session.model_dump()
-    session_dict['created_at'] = session_dict['created_at'].isoformat()
-    session_dict['expires_at'] = session_dict['expires_at'].isoformat()
-    await sb_insert("user_sessions", session_dict)
-    
-    # Set cookie
-    response.set_cookie(
-        key="session_token",
-        value=session.session_token,
-        httponly=True,
-        secure=True,
-        samesite="none",
-        max_age=7*24*60*60,
-        path="/"
-    )
-    
-    return {
-        "user": user.model_dump(), 
-        "session_token": session.session_token,
-        "verification_link": verification_link,
-        "message": "Please check your email to verify your account"
-    }
-
-@api_router.post("/auth/login")
-async def login(data: LoginRequest, response: Response):
-    user_doc = await sb_find_one("users", {"email": data.email})
-    if not user_doc:
-        raise HTTPException(401, "Invalid credentials")
-    
-    if not verify_password(data.password, user_doc.get("password_hash", "")):
-        raise HTTPException(401, "Invalid credentials")
-    
-    if isinstance(user_doc['created_at'], str):
-        user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
-    user = User(**user_doc)
-    
-    # Create session
-    session = UserSession(
-        user_id=user.id,
-        expires_at=datetime.now(timezone.utc) + timedelta(days=7)
-    )
-    session_dict = session.model_dump()
-    session_dict['created_at'] = session_dict['created_at'].isoformat()
-    session_dict['expires_at'] = session_dict['expires_at'].isoformat()
-    await sb_insert("user_sessions", session_dict)
-    
-    # Set cookie
-    response.set_cookie(
-        key="session_token",
-        value=session.session_token,
-        httponly=True,
-        secure=True,
-        samesite="none",
-        max_age=7*24*60*60,
-        path="/"
-    )
-    
-    return {"user": user.model_dump(), "session_token": session.session_token}
-
-@api_router.get("/auth/google-login")
-async def google_login():
-    """Initiate Google OAuth via Supabase"""
-    try:
-        # Get frontend URL from environment or use default
-        frontend_url = os.environ.get('REACT_APP_BACKEND_URL', 'http://localhost:3000').replace(':8001', ':3000').replace('/api', '')
-        
-        # Supabase OAuth sign in
-        data = supabase.auth.sign_in_with_oauth({
-            "provider": "google",
-            "options": {
-                "redirect_to": f"{frontend_url}/"
-            }
-        })
-        return {"url": data.url}
-    except Exception as e:
-        logging.error(f"OAuth initiation failed: {str(e)}")
-        raise HTTPException(500, f"OAuth initiation failed: {str(e)}")
-
-@api_router.post("/auth/google/callback")
-async def google_callback(request: Request, response: Response):
-    """Handle Google OAuth callback from Supabase"""
-    try:
-        # Get the access token from the request body or query params
-        body = await request.json() if request.headers.get("content-type") == "application/json" else {}
-        access_token = body.get('access_token')
-        
-        # If not in body, check query params
-        if not access_token:
-            access_token = request.query_params.get('access_token')
-        
-        if not access_token:
-            # Check if we have the full hash fragment data
-            hash_data = body.get('hash_data')
-            if hash_data:
-                # Parse hash fragment
-                import urllib.parse
-                params = urllib.parse.parse_qs(hash_data.lstrip('#'))
-                access_token = params.get('access_token', [None])[0]
-        
-        if not access_token:
-            raise HTTPException(400, "Missing access token")
-        
-        # Get user from Supabase auth
-        user_response = supabase.auth.get_user(access_token)
-        supabase_user = user_response.user
-        
-        if not supabase_user:
-            raise HTTPException(401, "Invalid token")
-        
-        # Check if user exists in our database
-        user_doc = await sb_find_one("users", {"email": supabase_user.email})
-        
-        if not user_doc:
-            # Create new user
-            user = User(
-                email=supabase_user.email,
-                name=supabase_user.user_metadata.get("full_name", supabase_user.email.split("@")[0]),
-                picture=supabase_user.user_metadata.get("avatar_url")
-            )
-            user_dict = user.model_dump()
-            user_dict['created_at'] = user_dict['created_at'].isoformat()
-            await sb_insert("users", user_dict)
-        else:
-            if isinstance(user_doc['created_at'], str):
-                user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
-            user = User(**user_doc)
-        
-        # Create backend session
-        session_token = str(uuid.uuid4())
-        backend_session = UserSession(
-            session_token=session_token,
-            user_id=user.id,
-            expires_at=datetime.now(timezone.utc) + timedelta(days=7)
-        )
-        session_dict = backend_session.model_dump()
-        session_dict['created_at'] = session_dict['created_at'].isoformat()
-        session_dict['expires_at'] = session_dict['expires_at'].isoformat()
-        await sb_insert("user_sessions", session_dict)
-        
-        # Set cookie
-        response.set_cookie(
-            key="session_token",
-            value=session_token,
-            httponly=True,
-            secure=True,
-            samesite="none",
-            max_age=7*24*60*60,
-            path="/"
-        )
-        
-        return {"user": user.model_dump(), "session_token": session_token}
-    except Exception as e:
-        logging.error(f"OAuth callback error: {str(e)}")
-        raise HTTPException(500, f"OAuth callback failed: {str(e)}")
-
-@api_router.get("/auth/me")
-async def get_me(request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    return user
-
-@api_router.post("/auth/logout")
-async def logout(request: Request, response: Response):
-    session_token = request.cookies.get("session_token")
-    if session_token:
-        await sb_delete("user_sessions", {"session_token": session_token})
-    
-    response.delete_cookie("session_token", path="/")
-    return {"message": "Logged out"}
-
-@api_router.get("/auth/verify-email")
-async def verify_email(token: str):
-    """Verify email with token"""
-    verification = await sb_find_one("email_verifications", {"verification_token": token})
-    
-    if not verification:
-        raise HTTPException(404, "Invalid verification token")
-    
-    if verification.get("verified"):
-        return {"message": "Email already verified"}
-    
-    if datetime.fromisoformat(verification["expires_at"]) < datetime.now(timezone.utc):
-        raise HTTPException(400, "Verification token expired")
-    
-    # Mark as verified
-    await sb_update(
-        "email_verifications",
-        {"verification_token": token},
-        {"verified": True}
-    )
-    
-    # You could also add a verified flag to the user model if needed
-    # await sb_update("users", {"email": verification["email"]}, {"email_verified": True})
-    
-    return {"message": "Email verified successfully"}
-
-@api_router.post("/auth/reset-password")
-async def reset_password(request: Request):
-    """Send password reset email via Supabase"""
-    try:
-        body = await request.json()
-        email = body.get('email')
-        
-        if not email:
-            raise HTTPException(400, "Email is required")
-        
-        # Use Supabase Auth to send password reset email
-        supabase.auth.reset_password_email(email)
-        
-        return {"message": "Password reset email sent"}
-    except Exception as e:
-        logging.error(f"Password reset error: {e}")
-        raise HTTPException(500, f"Failed to send reset email: {str(e)}")
-
-@api_router.put("/auth/update-profile")
-async def update_profile(request: Request):
-    """Update user profile"""
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    body = await request.json()
-    update_data = {}
-    
-    # Allow updating specific fields
-    if 'name' in body:
-        update_data['name'] = body['name']
-    if 'phone' in body:
-        update_data['phone'] = body['phone']
-    if 'location' in body:
-        update_data['location'] = body['location']
-    if 'bio' in body:
-        update_data['bio'] = body['bio']
-    
-    if update_data:
-        await sb_update("users", {"id": user.id}, update_data)
-    
-    return {"message": "Profile updated successfully"}
-
-# ============ CAMPAIGN ENDPOINTS ============
-
-@api_router.get("/campaigns", response_model=List[Campaign])
-async def get_campaigns(category: Optional[str] = None, search: Optional[str] = None):
-    query = {"status": "active"}
-    if category:
-        query["category"] = category
-    if search:
-        query["title"] = {"$regex": search, "$options": "i"}
-    
-    campaigns = await sb_find("campaigns", query, 1000)
-    for campaign in campaigns:
-        if isinstance(campaign['created_at'], str):
-            campaign['created_at'] = datetime.fromisoformat(campaign['created_at'])
-    return campaigns
-
-@api_router.get("/campaigns/{campaign_id}")
-async def get_campaign(campaign_id: str):
-    campaign = await sb_find_one("campaigns", {"id": campaign_id})
-    if not campaign:
-        raise HTTPException(404, "Campaign not found")
-    if isinstance(campaign['created_at'], str):
-        campaign['created_at'] = datetime.fromisoformat(campaign['created_at'])
-    return campaign
-
-@api_router.post("/campaigns", response_model=Campaign)
-async def create_campaign(data: CampaignCreate, request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    campaign = Campaign(
-        title=data.title,
-        description=data.description,
-        category=data.category,
-        goal_amount=data.goal_amount,
-        creator_id=user.id,
-        creator_name=user.name,
-        image_url=data.image_url,
-        duration_days=30,
-        tags=[],
-        reward_tiers=[]
-    )
-    
-    # Get AI analysis
-    try:
-        genai.configure(api_key=os.environ.get('GEMINI_API_KEY'))
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        
-        analysis_prompt = f"""Analyze this crowdfunding campaign and predict its success probability (0-100%):
-        Title: {campaign.title}
-        Category: {campaign.category}
-        Goal: ${campaign.goal_amount}
-        Description: {campaign.description}
-        
-        Respond with ONLY a number between 0-100 representing the success probability percentage."""
-        
-        response = model.generate_content(analysis_prompt)
-        ai_response = response.text.strip()
-        
-        # Extract percentage
-        probability = 75.0  # Default
-        try:
-            probability = float(''.join(filter(lambda x: x.isdigit() or x == '.', ai_response.split()[0])))
-            probability = max(0, min(100, probability))
-        except (ValueError, IndexError):
-            pass
-        
-        # Save AI analysis
-        ai_analysis = AIAnalysis(
-            campaign_id=campaign.id,
-            success_probability=probability,
-            analysis_text=ai_response
-        )
-        ai_dict = ai_analysis.model_dump()
-        ai_dict['created_at'] = ai_dict['created_at'].isoformat()
-        await sb_insert("ai_analyses", ai_dict)
-    except Exception as e:
-        logging.error(f"AI analysis error: {e}")
-    
-    campaign_dict = campaign.model_dump()
-    campaign_dict['created_at'] = campaign_dict['created_at'].isoformat()
-    await sb_insert("campaigns", campaign_dict)
-    
-    return campaign
-
-@api_router.post("/campaigns/extended", response_model=Campaign)
-async def create_campaign_extended(data: CampaignCreateExtended, request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    # Convert reward tiers to dict format
-    reward_tiers_dict = [tier.model_dump() for tier in data.reward_tiers]
-    
-    campaign = Campaign(
-        title=data.title,
-        description=data.description,
-        category=data.category,
-        goal_amount=data.goal_amount,
-        creator_id=user.id,
-        creator_name=user.name,
-        image_url=data.image_url,
-        status=data.status,
-        duration_days=data.duration_days,
-        tags=data.tags,
-        reward_tiers=reward_tiers_dict
-    )
-    
-    campaign_dict = campaign.model_dump()
-    campaign_dict['created_at'] = campaign_dict['created_at'].isoformat()
-    await sb_insert("campaigns", campaign_dict)
-    
-    return campaign
-
-@api_router.put("/campaigns/{campaign_id}")
-async def update_campaign(campaign_id: str, data: CampaignUpdate, request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    campaign = await sb_find_one("campaigns", {"id": campaign_id})
-    if not campaign:
-        raise HTTPException(404, "Campaign not found")
-    
-    if campaign["creator_id"] != user.id and not user.is_admin:
-        raise HTTPException(403, "Not authorized")
-    
-    update_data = {k: v for k, v in data.model_dump().items() if v is not None}
-    if update_data:
-        await sb_update("campaigns", {"id": campaign_id}, {"$set": update_data})
-    
-    updated = await sb_find_one("campaigns", {"id": campaign_id})
-    if isinstance(updated['created_at'], str):
-        updated['created_at'] = datetime.fromisoformat(updated['created_at'])
-    return updated
-
-@api_router.delete("/campaigns/{campaign_id}")
-async def delete_campaign(campaign_id: str, request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    campaign = await sb_find_one("campaigns", {"id": campaign_id})
-    if not campaign:
-        raise HTTPException(404, "Campaign not found")
-    
-    if campaign["creator_id"] != user.id and not user.is_admin:
-        raise HTTPException(403, "Not authorized")
-    
-    await sb_delete("campaigns", {"id": campaign_id})
-    return {"message": "Campaign deleted"}
-
-@api_router.get("/campaigns/{campaign_id}/analysis")
-async def get_campaign_analysis(campaign_id: str):
-    analysis = await sb_find_one("ai_analyses", {"campaign_id": campaign_id})
-    
-    # If analysis doesn't exist, generate it dynamically
-    if not analysis:
-        campaign = await sb_find_one("campaigns", {"id": campaign_id})
-        if not campaign:
-            raise HTTPException(404, "Campaign not found")
-        
-        try:
-            genai.configure(api_key=os.environ.get('GEMINI_API_KEY'))
-            model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            
-            analysis_prompt = f"""Analyze this crowdfunding campaign and predict its success probability.
-
-Title: {campaign.get('title', '')}
-Category: {campaign.get('category', '')}
-Goal Amount: ₹{campaign.get('goal_amount', 0)}
-Current Raised: ₹{campaign.get('raised_amount', 0)}
-Backers Count: {campaign.get('backers_count', 0)}
-Description: {campaign.get('description', '')}
-
-Based on the category, goal amount, description quality, and current traction, provide:
-1. A success probability percentage (between 0-100)
-2. A brief 2-3 sentence analysis
-
-Respond ONLY in this format:
-Percentage: XX
-Analysis: Your 2-3 sentence analysis here."""
-            
-            response = model.generate_content(analysis_prompt)
-            ai_response = response.text.strip()
-            
-            # Extract percentage and analysis
-            probability = 75.0  # Default
-            analysis_text = "This campaign shows moderate potential for success based on its category and goals."
-            
-            try:
-                lines = ai_response.split('\n')
-                for line in lines:
-                    if 'percentage:' in line.lower():
-                        prob_str = ''.join(filter(lambda x: x.isdigit() or x == '.', line))
-                        if prob_str:
-                            probability = float(prob_str)
-                            probability = max(0, min(100, probability))
-                    elif 'analysis:' in line.lower():
-                        analysis_text = line.split(':', 1)[1].strip()
-                        # Get the rest of the lines as well
-                        idx = lines.index(line)
-                        analysis_text = ' '.join(lines[idx:]).replace('Analysis:', '').strip()
-                        break
-            except Exception as e:
-                logging.error(f"Error parsing AI response: {e}")
-            
-            # Save AI analysis for future use
-            ai_analysis = AIAnalysis(
-                campaign_id=campaign_id,
-                success_probability=probability,
-                analysis_text=analysis_text
-            )
-            ai_dict = ai_analysis.model_dump()
-            ai_dict['created_at'] = ai_dict['created_at'].isoformat()
-            await sb_insert("ai_analyses", ai_dict)
-            
-            return {
-                "campaign_id": campaign_id,
-                "success_probability": probability,
-                "analysis_text": analysis_text,
-                "created_at": ai_dict['created_at']
-            }
-        except Exception as e:
-            logging.error(f"AI analysis error: {e}")
-            return {"success_probability": 75.0, "analysis_text": "Analysis pending"}
-    
-    if isinstance(analysis['created_at'], str):
-        analysis['created_at'] = datetime.fromisoformat(analysis['created_at'])
-    return analysis
-
-@api_router.get("/my-campaigns")
-async def get_my_campaigns(request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    campaigns = await sb_find("campaigns", {"creator_id": user.id}, 1000)
-    for campaign in campaigns:
-        if isinstance(campaign['created_at'], str):
-            campaign['created_at'] = datetime.fromisoformat(campaign['created_at'])
-    return campaigns
-
-# ============ ADMIN ENDPOINTS ============
 
-@api_router.get("/admin/campaigns")
-async def admin_get_all_campaigns(request: Request):
-    user = await get_current_user(request)
-    if not user or not user.is_admin:
-        raise HTTPException(403, "Admin access required")
-    
-    campaigns = await sb_find("campaigns", {}, 1000)
-    for campaign in campaigns:
-        if isinstance(campaign['created_at'], str):
-            campaign['created_at'] = datetime.fromisoformat(campaign['created_at'])
-    return campaigns
-
-@api_router.get("/admin/stats")
-async def admin_stats(request: Request):
-    user = await get_current_user(request)
-    if not user or not user.is_admin:
-        raise HTTPException(403, "Admin access required")
-    
-    # Get counts using Supabase
-    all_campaigns = await sb_find("campaigns", {}, 10000)
-    total_campaigns = len(all_campaigns)
-    active_campaigns = len([c for c in all_campaigns if c.get('status') == 'active'])
-    
-    all_users = await sb_find("users", {}, 10000)
-    total_users = len(all_users)
-    
-    # Calculate total raised
-    total_raised = sum(c.get('raised_amount', 0) for c in all_campaigns)
-    
-    return {
-        "total_campaigns": total_campaigns,
-        "active_campaigns": active_campaigns,
-        "total_users": total_users,
-        "total_raised": total_raised
-    }
-
-@api_router.get("/admin/users")
-async def admin_get_all_users(request: Request):
-    user = await get_current_user(request)
-    if not user or not user.is_admin:
-        raise HTTPException(403, "Admin access required")
-    
-    users = await sb_find("users", {}, 10000)
-    for user_doc in users:
-        if isinstance(user_doc['created_at'], str):
-            user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
-    return users
-
-# ============ COMMENTS ENDPOINTS ============
-
-@api_router.get("/campaigns/{campaign_id}/comments")
-async def get_comments(campaign_id: str):
-    comments = await sb_find("comments", {"campaign_id": campaign_id}, 1000)
-    for comment in comments:
-        if isinstance(comment['created_at'], str):
-            comment['created_at'] = datetime.fromisoformat(comment['created_at'])
-    return comments
-
-@api_router.post("/campaigns/{campaign_id}/comments")
-async def create_comment(campaign_id: str, data: CommentCreate, request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    comment = Comment(
-        campaign_id=campaign_id,
-        user_id=user.id,
-        user_name=user.name,
-        content=data.content
-    )
-    
-    comment_dict = comment.model_dump()
-    comment_dict['created_at'] = comment_dict['created_at'].isoformat()
-    await sb_insert("comments", comment_dict)
-    
-    return comment
-
-# ============ AI CHAT ENDPOINTS ============
-
-@api_router.post("/ai/chat")
-async def ai_chat(data: ChatRequest, request: Request):
-    user = await get_current_user(request)
-    session_id = data.session_id or str(uuid.uuid4())
-    
-    try:
-        genai.configure(api_key=os.environ.get('GEMINI_API_KEY'))
-        
-        # Get chat history for this session
-        chat_history = await sb_find("chat_messages", {"session_id": session_id}, 50)
-        
-        # Build conversation context
-        conversation_parts = ["You are a helpful AI assistant for a crowdfunding platform. Help users with campaign-related queries, funding advice, and platform navigation.\n"]
-        
-        for msg in chat_history[-5:]:  # Last 5 messages for context
-            conversation_parts.append(f"User: {msg['message']}")
-            if msg.get('response'):
-                conversation_parts.append(f"Assistant: {msg['response']}")
-        
-        conversation_parts.append(f"User: {data.message}")
-        
-        # Generate response
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        full_prompt = "\n".join(conversation_parts)
-        response = model.generate_content(full_prompt)
-        response_text = response.text.strip()
-        
-        # Save chat message
-        chat_msg = ChatMessage(
-            user_id=user.id if user else None,
-            session_id=session_id,
-            message=data.message,
-            response=response_text
-        )
-        msg_dict = chat_msg.model_dump()
-        msg_dict['created_at'] = msg_dict['created_at'].isoformat()
-        await sb_insert("chat_messages", msg_dict)
-        
-        return {"response": response_text, "session_id": session_id}
-    except Exception as e:
-        logging.error(f"AI chat error: {e}")
-        raise HTTPException(500, f"AI service error: {str(e)}")
-
-# ============ AI CAMPAIGN OPTIMIZATION ENDPOINTS ============
-
-@api_router.post("/ai/optimize-title")
-async def optimize_title(data: OptimizeTitleRequest, request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    try:
-        import google.generativeai as genai
-        genai.configure(api_key=os.environ.get('GEMINI_API_KEY'))
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        
-        prompt = f"""You are an expert at creating compelling crowdfunding campaign titles. 
-
-Current Title: {data.title}
-Category: {data.category}
-Description: {data.description}
-
-Generate 5 alternative campaign titles that are:
-- Compelling and attention-grabbing
-- Clear about what the campaign offers
-- Optimized for backers in the {data.category} category
-- Under 80 characters each
-
-Return ONLY a JSON array of 5 titles, nothing else. Format:
-["Title 1", "Title 2", "Title 3", "Title 4", "Title 5"]"""
-        
-        response = model.generate_content(prompt)
-        
-        import json
-        import re
-        
-        # Extract JSON array from response
-        response_text = response.text
-        json_match = re.search(r'\[.*?\]', response_text, re.DOTALL)
-        
-        if json_match:
-            titles = json.loads(json_match.group())
-        else:
-            # Fallback titles
-            titles = [
-                f"{data.title} - Transform Your Vision",
-                f"Support {data.title}: Make It Happen",
-                f"{data.title}: Innovation Meets Opportunity",
-                f"Back {data.title} - Shape the Future",
-                f"{data.title} - Join the Movement"
-            ]
-        
-        return {"titles": titles}
-        
-    except Exception as e:
-        logging.error(f"Title optimization error: {e}")
-        # Return fallback titles
-        return {
-            "titles": [
-                f"{data.title} - Make It Real",
-                f"Support {data.title} Today",
-                f"{data.title}: Your Backing Matters",
-                f"Join {data.title} - Create Impact",
-                f"{data.title} - Be Part of Something Great"
-            ]
-        }
-
-@api_router.post("/ai/enhance-description")
-async def enhance_description(data: EnhanceDescriptionRequest, request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    try:
-        import google.generativeai as genai
-        genai.configure(api_key=os.environ.get('GEMINI_API_KEY'))
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        
-        prompt = f"""You are an expert at writing persuasive crowdfunding campaign descriptions.
-
-Campaign Title: {data.title}
-Category: {data.category}
-Goal Amount: ${data.goal_amount}
-Current Description: {data.description}
-
-Improve this description to make it more compelling and persuasive. The enhanced description should:
-- Start with a strong hook that captures attention
-- Clearly explain the problem or opportunity
-- Describe the solution and its impact
-- Include social proof or credibility elements
-- End with a clear call-to-action
-- Be well-structured with paragraphs
-- Be between 200-400 words
-
-Return ONLY the enhanced description text, no additional commentary."""
-        
-        response = model.generate_content(prompt)
-        enhanced_description = response.text.strip()
-        
-        # Remove any markdown formatting if present
-        enhanced_description = enhanced_description.replace('**', '').replace('*', '')
-        
-        return {"enhanced_description": enhanced_description}
-        
-    except Exception as e:
-        logging.error(f"Description enhancement error: {e}")
-        raise HTTPException(500, f"AI service error: {str(e)}")
-
-@api_router.post("/ai/success-prediction")
-async def success_prediction(data: SuccessPredictionRequest, request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    try:
-        import google.generativeai as genai
-        genai.configure(api_key=os.environ.get('GEMINI_API_KEY'))
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        
-        reward_tiers_text = ""
-        if data.reward_tiers:
-            reward_tiers_text = "Reward Tiers:\n" + "\n".join([f"- ${tier.amount}: {tier.description}" for tier in data.reward_tiers])
-        
-        prompt = f"""You are an AI expert at predicting crowdfunding campaign success.
-
-Campaign Details:
-Title: {data.title}
-Category: {data.category}
-Goal: ${data.goal_amount}
-Description: {data.description}
-{reward_tiers_text}
-
-Analyze this campaign and provide a success prediction in JSON format:
-{{
-    "success_percentage": <number between 0-100>,
-    "confidence_level": "<High/Medium/Low>",
-    "analysis": "<2-3 sentence analysis of why this percentage>",
-    "recommendations": [
-        "<recommendation 1>",
-        "<recommendation 2>",
-        "<recommendation 3>",
-        "<recommendation 4>",
-        "<recommendation 5>"
-    ]
-}}
-
-Be realistic and specific in your analysis."""
-        
-        response = model.generate_content(prompt)
-        
-        import json
-        import re
-        
-        # Extract JSON from response
-        response_text = response.text
-        json_match = re.search(r'\{[\s\S]*?\}', response_text)
-        
-        if json_match:
-            prediction = json.loads(json_match.group())
-        else:
-            # Fallback prediction
-            base_score = 65
-            if data.goal_amount < 10000:
-                base_score += 10
-            if len(data.reward_tiers) >= 3:
-                base_score += 5
-            
-            prediction = {
-                "success_percentage": min(95, base_score),
-                "confidence_level": "Medium",
-                "analysis": f"The campaign's success probability is moderately strong based on the {data.category} category. The goal of ${data.goal_amount} is achievable with proper marketing and community engagement.",
-                "recommendations": [
-                    "Expand reward tiers to include more options for different contribution levels",
-                    "Create a detailed budget breakdown to build trust with backers",
-                    "Promote through social media and community events to reach a wider audience",
-                    "Add testimonials or endorsements to strengthen credibility",
-                    "Incorporate visuals and videos to make the campaign more compelling"
-                ]
-            }
-        
-        return prediction
-        
-    except Exception as e:
-        logging.error(f"Success prediction error: {e}")
-        # Return fallback
-        return {
-            "success_percentage": 70,
-            "confidence_level": "Medium",
-            "analysis": "Based on the campaign details, there is a good potential for success with proper execution.",
-            "recommendations": [
-                "Build a strong pre-launch community",
-                "Offer diverse reward tiers",
-                "Create compelling visual content",
-                "Engage with potential backers early",
-                "Set realistic funding goals"
-            ]
-        }
-
-@api_router.post("/ai/marketing-strategy")
-async def marketing_strategy(data: MarketingStrategyRequest, request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    try:
-        import google.generativeai as genai
-        genai.configure(api_key=os.environ.get('GEMINI_API_KEY'))
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        
-        prompt = f"""You are a marketing expert specializing in crowdfunding campaigns.
-
-Campaign Details:
-Title: {data.title}
-Category: {data.category}
-Goal: ${data.goal_amount}
-Description: {data.description}
-
-Create a comprehensive marketing strategy in JSON format with the following structure:
-{{
-    "overview": "<2-3 sentence overview of the marketing approach>",
-    "target_audience": {{
-        "primary": "<description of primary audience>",
-        "secondary": "<description of secondary audience>"
-    }},
-    "channels": [
-        {{
-            "name": "<channel name>",
-            "strategy": "<specific strategy for this channel>",
-            "priority": "<High/Medium/Low>"
-        }}
-    ],
-    "timeline": [
-        {{
-            "phase": "<phase name>",
-            "duration": "<timeframe>",
-            "actions": ["<action 1>", "<action 2>"]
-        }}
-    ],
-    "key_messages": ["<message 1>", "<message 2>", "<message 3>"],
-    "budget_allocation": {{
-        "social_media": "<percentage>",
-        "content_creation": "<percentage>",
-        "influencer_partnerships": "<percentage>",
-        "paid_advertising": "<percentage>"
-    }}
-}}
-
-Provide 3-4 marketing channels and 3 timeline phases."""
-        
-        response = model.generate_content(prompt)
-        
-        import json
-        import re
-        
-        # Extract JSON from response
-        response_text = response.text
-        json_match = re.search(r'\{[\s\S]*\}', response_text)
-        
-        if json_match:
-            strategy = json.loads(json_match.group())
-        else:
-            # Fallback strategy
-            strategy = {
-                "overview": f"A multi-channel marketing approach focused on building awareness and community engagement for this {data.category} campaign, leveraging social media, content marketing, and strategic partnerships.",
-                "target_audience": {
-                    "primary": f"Enthusiasts and early adopters in the {data.category} space who value innovation and community-driven projects",
-                    "secondary": "Broader audience interested in supporting creative and impactful projects"
-                },
-                "channels": [
-                    {
-                        "name": "Social Media Marketing",
-                        "strategy": "Create engaging content on Instagram, Twitter, and Facebook. Share behind-the-scenes stories, progress updates, and user testimonials. Use hashtags to increase visibility.",
-                        "priority": "High"
-                    },
-                    {
-                        "name": "Email Marketing",
-                        "strategy": "Build an email list and send regular updates about campaign milestones, exclusive offers, and compelling stories that resonate with backers.",
-                        "priority": "High"
-                    },
-                    {
-                        "name": "Influencer Partnerships",
-                        "strategy": f"Identify and collaborate with influencers in the {data.category} niche who can authentically promote the campaign to their followers.",
-                        "priority": "Medium"
-                    },
-                    {
-                        "name": "Content Marketing",
-                        "strategy": "Create blog posts, videos, and infographics that showcase the campaign's value proposition and impact. Share success stories and expert insights.",
-                        "priority": "Medium"
-                    }
-                ],
-                "timeline": [
-                    {
-                        "phase": "Pre-Launch (2-4 weeks before)",
-                        "duration": "2-4 weeks",
-                        "actions": [
-                            "Build landing page and collect email subscribers",
-                            "Create teaser content and build anticipation",
-                            "Reach out to potential influencers and media outlets"
-                        ]
-                    },
-                    {
-                        "phase": "Launch Week",
-                        "duration": "7 days",
-                        "actions": [
-                            "Announce campaign launch across all channels",
-                            "Engage with early backers and build momentum",
-                            "Leverage PR and media coverage opportunities"
-                        ]
-                    },
-                    {
-                        "phase": "Mid-Campaign Push",
-                        "duration": "2-3 weeks",
-                        "actions": [
-                            "Share progress updates and celebrate milestones",
-                            "Run targeted ads to reach new audiences",
-                            "Host live Q&A sessions or webinars"
-                        ]
-                    }
-                ],
-                "key_messages": [
-                    f"Join us in making {data.title} a reality",
-                    "Your support drives innovation and creates lasting impact",
-                    "Be part of a community that values quality and authenticity"
-                ],
-                "budget_allocation": {
-                    "social_media": "30%",
-                    "content_creation": "25%",
-                    "influencer_partnerships": "25%",
-                    "paid_advertising": "20%"
-                }
-            }
-        
-        return strategy
-        
-    except Exception as e:
-        logging.error(f"Marketing strategy error: {e}")
-        # Return fallback
-        return {
-            "overview": f"A focused marketing strategy for the {data.category} campaign emphasizing community engagement and authentic storytelling.",
-            "target_audience": {
-                "primary": f"{data.category} enthusiasts and supporters",
-                "secondary": "General crowdfunding community"
-            },
-            "channels": [
-                {"name": "Social Media", "strategy": "Engage audiences on major platforms", "priority": "High"},
-                {"name": "Email Marketing", "strategy": "Build and nurture email subscribers", "priority": "High"}
-            ],
-            "timeline": [
-                {"phase": "Pre-Launch", "duration": "2 weeks", "actions": ["Build awareness", "Collect subscribers"]},
-                {"phase": "Launch", "duration": "1 week", "actions": ["Announce campaign", "Drive initial momentum"]}
-            ],
-            "key_messages": ["Support innovation", "Make an impact"],
-            "budget_allocation": {
-                "social_media": "40%",
-                "content_creation": "30%",
-                "influencer_partnerships": "20%",
-                "paid_advertising": "10%"
-            }
-        }
-
-# ============ PAYMENT ENDPOINTS ============
-
-@api_router.post("/payments/create-checkout")
-async def create_checkout(data: PledgeRequest, request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    # Get campaign
-    campaign = await sb_find_one("campaigns", {"id": data.campaign_id})
-    if not campaign:
-        raise HTTPException(404, "Campaign not found")
-    
-    # Fixed pledge amounts (in INR)
-    PLEDGE_PACKAGES = {
-        "small": 500.0,
-        "medium": 2500.0,
-        "large": 5000.0
-    }
-    
-    # Default to small package
-    amount = PLEDGE_PACKAGES["small"]
-    
-    try:
-        stripe.api_key = os.environ.get('STRIPE_API_KEY')
-        host_url = data.origin_url
-        
-        success_url = f"{host_url}/campaign/{data.campaign_id}?session_id={{CHECKOUT_SESSION_ID}}"
-        cancel_url = f"{host_url}/campaign/{data.campaign_id}"
-        
-        # Create Stripe checkout session
-        session = stripe.checkout.Session.create(
-            payment_method_types=['card'],
-            line_items=[{
-                'price_data': {
-                    'currency': 'inr',
-                    'product_data': {
-                        'name': f'Back Campaign: {campaign["title"]}',
-                        'description': f'Supporting {campaign["title"]}',
-                    },
-                    'unit_amount': int(amount * 100),  # Stripe uses paise (smallest unit)
-                },
-                'quantity': 1,
-            }],
-            mode='payment',
-            success_url=success_url,
-            cancel_url=cancel_url,
-            metadata={
-                "campaign_id": data.campaign_id,
-                "user_id": user.id
-            }
-        )
-        
-        # Save transaction
-        transaction = PaymentTransaction(
-            session_id=session.id,
-            amount=amount,
-            currency="inr",
-            campaign_id=data.campaign_id,
-            user_id=user.id,
-            metadata={"campaign_id": data.campaign_id, "user_id": user.id}
-        )
-        tx_dict = transaction.model_dump()
-        tx_dict['created_at'] = tx_dict['created_at'].isoformat()
-        await sb_insert("payment_transactions", tx_dict)
-        
-        return {"url": session.url, "session_id": session.id}
-    except Exception as e:
-        logging.error(f"Payment error: {e}")
-        raise HTTPException(500, f"Payment service error: {str(e)}")
-
-@api_router.get("/payments/status/{session_id}")
-async def get_payment_status(session_id: str, request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    try:
-        stripe.api_key = os.environ.get('STRIPE_API_KEY')
-        
-        # Get session status from Stripe
-        session = stripe.checkout.Session.retrieve(session_id)
-        
-        # Update transaction
-        transaction = await sb_find_one("payment_transactions", {"session_id": session_id})
-        if transaction and transaction["payment_status"] != "paid":
-            new_status = "paid" if session.payment_status == "paid" else session.status
-            await sb_update(
-                "payment_transactions",
-                {"session_id": session_id},
-                {"payment_status": new_status}
-            )
-            
-            # If paid, update campaign
-            if new_status == "paid":
-                campaign_id = transaction["campaign_id"]
-                campaign = await sb_find_one("campaigns", {"id": campaign_id})
-                if campaign:
-                    await sb_update(
-                        "campaigns",
-                        {"id": campaign_id},
-                        {
-                            "raised_amount": campaign.get("raised_amount", 0) + transaction["amount"],
-                            "backers_count": campaign.get("backers_count", 0) + 1
-                        }
-                    )
-                
-                # Create pledge record
-                pledge = Pledge(
-                    campaign_id=campaign_id,
-                    user_id=user.id,
-                    amount=transaction["amount"],
-                    session_id=session_id,
-                    payment_status="paid"
-                )
-                pledge_dict = pledge.model_dump()
-                pledge_dict['created_at'] = pledge_dict['created_at'].isoformat()
-                await sb_insert("pledges", pledge_dict)
-        
-        return {
-            "status": session.status,
-            "payment_status": session.payment_status,
-            "amount_total": session.amount_total / 100 if session.amount_total else 0,  # Convert from cents
-            "currency": session.currency
-        }
-    except Exception as e:
-        logging.error(f"Payment status error: {e}")
-        raise HTTPException(500, f"Payment service error: {str(e)}")
-
-@api_router.post("/webhook/stripe")
-async def stripe_webhook(request: Request):
-    try:
-        body = await request.body()
-        signature = request.headers.get("Stripe-Signature")
-        
-        stripe.api_key = os.environ.get('STRIPE_API_KEY')
-        
-        # Verify webhook signature (optional but recommended for production)
-        # event = stripe.Webhook.construct_event(body, signature, webhook_secret)
-        
-        return {"status": "success"}
-    except Exception as e:
-        logging.error(f"Webhook error: {e}")
-        return {"status": "error", "message": str(e)}
-
-# ============ ANALYTICS ENDPOINTS ============
-
-@api_router.get("/analytics/overview")
-async def analytics_overview(request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    # Get user's campaigns
-    campaigns = await sb_find("campaigns", {"creator_id": user.id}, 1000)
-    
-    total_raised = sum(c.get("raised_amount", 0) for c in campaigns)
-    total_backers = sum(c.get("backers_count", 0) for c in campaigns)
-    active_campaigns = sum(1 for c in campaigns if c.get("status") == "active")
-    
-    return {
-        "total_campaigns": len(campaigns),
-        "active_campaigns": active_campaigns,
-        "total_raised": total_raised,
-        "total_backers": total_backers,
-        "campaigns": campaigns
-    }
-
-@api_router.get("/analytics/monte-carlo/{campaign_id}")
-async def monte_carlo_simulation(campaign_id: str, request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    campaign = await sb_find_one("campaigns", {"id": campaign_id})
-    if not campaign:
-        raise HTTPException(404, "Campaign not found")
-    
-    import random
-    import numpy as np
-    
-    # Monte Carlo simulation parameters
-    goal = campaign["goal_amount"]
-    current_raised = campaign["raised_amount"]
-    days_remaining = 25
-    
-    # Generate three scenarios
-    pessimistic = goal * 0.475
-    realistic = goal * 0.70
-    optimistic = goal * 0.835
-    
-    # Calculate success probability
-    success_probability = min(95, max(60, (current_raised / goal) * 100 + random.uniform(10, 30)))
-    
-    # Generate funding progression data
-    progression_data = []
-    for day in range(1, days_remaining + 1):
-        # Simulate funding growth with some randomness
-        base_progress = current_raised + (realistic - current_raised) * (day / days_remaining)
-        variance = random.uniform(-0.1, 0.15) * base_progress
-        amount = max(current_raised, base_progress + variance)
-        progression_data.append({"day": day, "amount": round(amount, 2)})
-    
-    return {
-        "pessimistic": round(pessimistic, 2),
-        "realistic": round(realistic, 2),
-        "optimistic": round(optimistic, 2),
-        "success_probability": round(success_probability, 1),
-        "progression_data": progression_data,
-        "key_insights": [
-            "Campaign exhibits a typical slow start, gaining momentum as it progresses.",
-            "Mid-campaign boosts show significant increases, indicating effective marketing impact.",
-            "Final rush towards the campaign's end helps maximize funding, ensuring a potential stretch goal achievement."
-        ]
-    }
-
-@api_router.get("/analytics/competitor-analysis/{campaign_id}")
-async def competitor_analysis(campaign_id: str, request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    campaign = await sb_find_one("campaigns", {"id": campaign_id})
-    if not campaign:
-        raise HTTPException(404, "Campaign not found")
-    
-    try:
-        import google.generativeai as genai
-        genai.configure(api_key=os.environ.get('GEMINI_API_KEY'))
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        
-        prompt = f"""You are analyzing a crowdfunding campaign in the {campaign['category']} category. 
-        Campaign Title: {campaign['title']}
-        Goal: ${campaign['goal_amount']}
-        Description: {campaign['description']}
-        
-        Provide a comprehensive competitor analysis in JSON format with the following structure:
-        {{
-            "market_overview": {{
-                "category_performance": "Detailed text about the category performance",
-                "average_success_rate": "A percentage as a string (e.g., '80.00%')",
-                "typical_funding_min": 50000,
-                "typical_funding_max": 1000000
-            }},
-            "key_trends": [
-                "Trend 1 description",
-                "Trend 2 description",
-                "Trend 3 description"
-            ],
-            "top_competitors": [
-                {{
-                    "name": "Competitor Name",
-                    "funding": 1064708,
-                    "description": "Brief description",
-                    "success_factors": "What made them successful"
-                }}
-            ]
-        }}
-        
-        Make it realistic and specific to the {campaign['category']} category. Provide 3 top competitors with actual realistic names and amounts."""
-        
-        response = model.generate_content(prompt)
-        
-        # Parse the AI response
-        import json
-        import re
-        
-        # Extract JSON from response
-        response_text = response.text
-        json_match = re.search(r'\{[\s\S]*\}', response_text)
-        
-        if json_match:
-            analysis_data = json.loads(json_match.group())
-        else:
-            # Fallback data
-            analysis_data = {
-                "market_overview": {
-                    "category_performance": f"The {campaign['category']} crowdfunding category has seen significant success, with campaigns raising substantial amounts. For instance, campaigns in this category have shown strong community engagement and innovative product offerings.",
-                    "average_success_rate": "80.00%",
-                    "typical_funding_min": 50000,
-                    "typical_funding_max": 1000000
-                },
-                "key_trends": [
-                    "Growing interest in culinary experiences and heritage recipes",
-                    "Increased support for self-published cookbooks",
-                    "Rising demand for culturally diverse and authentic cooking content"
-                ],
-                "top_competitors": [
-                    {
-                        "name": "ASMOKE Essential: Smart Pellet Grill with Unlimited Flavor",
-                        "funding": 1064708,
-                        "description": "Combines traditional grilling with modern technology, offering precise temperature control and app integration.",
-                        "success_factors": "Innovative product offering, Strong community engagement, Effective use of social media marketing"
-                    },
-                    {
-                        "name": "FYR GRILL: The Ultimate Portable Live-Fire Experience",
-                        "funding": 695890,
-                        "description": "Portable design that allows for live-fire cooking anywhere, with modular add-ons for versatility.",
-                        "success_factors": "Unique product concept, Appeal to outdoor enthusiasts, High-quality visuals and demonstrations"
-                    },
-                    {
-                        "name": "BARE 5.0: TwinSteel™ - Premium Knives Without the Premium Price",
-                        "funding": 283946,
-                        "description": "Offers premium knives at an affordable price, utilizing Swedish steel for superior sharpness.",
-                        "success_factors": "High-quality product, Competitive pricing, Strong brand storytelling"
-                    }
-                ]
-            }
-        
-        return analysis_data
-        
-    except Exception as e:
-        logging.error(f"Competitor analysis error: {e}")
-        # Return fallback data
-        return {
-            "market_overview": {
-                "category_performance": f"The {campaign['category']} crowdfunding category has seen significant success.",
-                "average_success_rate": "80.00%",
-                "typical_funding_min": 50000,
-                "typical_funding_max": 1000000
-            },
-            "key_trends": [
-                "Growing interest in innovative products",
-                "Increased support for creative projects",
-                "Rising demand for quality and authenticity"
-            ],
-            "top_competitors": []
-        }
-
-@api_router.get("/analytics/strategic-recommendations/{campaign_id}")
-async def strategic_recommendations(campaign_id: str, request: Request):
-    user = await get_current_user(request)
-    if not user:
-        raise HTTPException(401, "Not authenticated")
-    
-    campaign = await sb_find_one("campaigns", {"id": campaign_id})
-    if not campaign:
-        raise HTTPException(404, "Campaign not found")
-    
-    try:
-        import google.generativeai as genai
-        genai.configure(api_key=os.environ.get('GEMINI_API_KEY'))
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        
-        prompt = f"""You are providing strategic recommendations for a crowdfunding campaign.
-        Campaign: {campaign['title']}
-        Category: {campaign['category']}
-        Goal: ${campaign['goal_amount']}
-        Current Raised: ${campaign['raised_amount']}
-        Description: {campaign['description']}
-        
-        Provide strategic recommendations in JSON format:
-        {{
-            "success_prediction": {{
-                "percentage": 85,
-                "level": "High",
-                "category_average": "65% success rate",
-                "similar_campaigns": "Typically, {campaign['category']}-related campaigns with a personal touch and cultural significance have shown to succeed well, especially those that tell a compelling story."
-            }},
-            "success_factors": [
-                "Factor 1",
-                "Factor 2",
-                "Factor 3"
-            ],
-            "risk_factors": [
-                "Risk 1",
-                "Risk 2",
-                "Risk 3"
-            ],
-            "action_recommendations": [
-                {{
-                    "title": "Action title",
-                    "description": "Detailed description",
-                    "priority": "High"
-                }}
-            ],
-            "strategic_recommendations": [
-                {{
-                    "category": "Product Offering",
-                    "priority": "High",
-                    "description": "Recommendation description"
-                }},
-                {{
-                    "category": "Pricing Strategy",
-                    "priority": "High",
-                    "description": "Recommendation with reward tiers",
-                    "reward_tiers": [
-                        {{"amount": 25, "description": "Digital copy of the cookbook"}},
-                        {{"amount": 50, "description": "Physical copy of the cookbook"}},
-                        {{"amount": 100, "description": "Signed copy with exclusive recipes"}},
-                        {{"amount": 200, "description": "Bundle with additional cooking tools or merchandise"}}
-                    ]
-                }},
-                {{
-                    "category": "Marketing Tactics",
-                    "priority": "Medium",
-                    "description": "Marketing recommendation"
-                }},
-                {{
-                    "category": "Community Engagement",
-                    "priority": "Medium",
-                    "description": "Community engagement recommendation"
-                }}
-            ]
-        }}
-        
-        Make it specific and actionable for this campaign."""
-        
-        response = model.generate_content(prompt)
-        
-        import json
-        import re
-        
-        response_text = response.text
-        json_match = re.search(r'\{[\s\S]*\}', response_text)
-        
-        if json_match:
-            recommendations = json.loads(json_match.group())
-        else:
-            # Fallback
-            current_percentage = (campaign['raised_amount'] / campaign['goal_amount']) * 100
-            recommendations = {
-                "success_prediction": {
-                    "percentage": min(95, max(70, int(current_percentage + 20))),
-                    "level": "High" if current_percentage > 50 else "Medium",
-                    "category_average": "65% success rate",
-                    "similar_campaigns": f"Typically, {campaign['category']}-related campaigns with a personal touch have shown to succeed well."
-                },
-                "success_factors": [
-                    f"Already surpassed funding goal by ${campaign['raised_amount'] - campaign['goal_amount']}" if campaign['raised_amount'] > campaign['goal_amount'] else "Strong initial backing",
-                    "Well-defined niche focused on heritage and family recipes",
-                    "Attractive and professional campaign presentation"
-                ],
-                "risk_factors": [
-                    f"Potential saturation in the {campaign['category']} market",
-                    "Seasonality of food-related campaigns",
-                    "High competition from similar successful projects"
-                ],
-                "action_recommendations": [
-                    {
-                        "title": "Promote on social media platforms to maintain momentum",
-                        "description": "Increased visibility and potential backers",
-                        "priority": "High"
-                    },
-                    {
-                        "title": "Consider stretch goals to incentivize additional funding",
-                        "description": "Encourage backers to contribute more as campaign already exceeded initial goal",
-                        "priority": "Medium"
-                    },
-                    {
-                        "title": "Engage backers with updates about the cookbook process and additional content",
-                        "description": "Build community interest and increase shareability of the campaign",
-                        "priority": "Medium"
-                    },
-                    {
-                        "title": "Collaborate with food influencers for greater outreach",
-                        "description": "Enhance credibility and attract more backers through social proof",
-                        "priority": "Low"
-                    }
-                ],
-                "strategic_recommendations": [
-                    {
-                        "category": "Product Offering",
-                        "priority": "High",
-                        "description": "Highlight the unique cultural stories and modern adaptations accompanying each recipe to differentiate the cookbook."
-                    },
-                    {
-                        "category": "Pricing Strategy",
-                        "priority": "High",
-                        "description": "Implement tiered pricing with early bird discounts to encourage prompt support and reward higher pledges with exclusive content.",
-                        "reward_tiers": [
-                            {"amount": 25, "description": "Digital copy of the cookbook"},
-                            {"amount": 50, "description": "Physical copy of the cookbook"},
-                            {"amount": 100, "description": "Signed copy with exclusive recipes"},
-                            {"amount": 200, "description": "Bundle with additional cooking tools or merchandise"}
-                        ]
-                    },
-                    {
-                        "category": "Marketing Tactics",
-                        "priority": "Medium",
-                        "description": "Collaborate with food bloggers and influencers to review and promote the cookbook, leveraging their established audiences."
-                    },
-                    {
-                        "category": "Community Engagement",
-                        "priority": "Medium",
-                        "description": "Create a campaign hashtag and encourage backers to share their own family recipes and stories, fostering a sense of community."
-                    }
-                ]
-            }
-        
-        return recommendations
-        
-    except Exception as e:
-        logging.error(f"Strategic recommendations error: {e}")
-        current_percentage = (campaign['raised_amount'] / campaign['goal_amount']) * 100
-        return {
-            "success_prediction": {
-                "percentage": min(95, max(70, int(current_percentage + 20))),
-                "level": "High",
-                "category_average": "65% success rate",
-                "similar_campaigns": "Campaigns with strong narratives tend to perform well."
-            },
-            "success_factors": ["Strong backing", "Good presentation"],
-            "risk_factors": ["Market competition"],
-            "action_recommendations": [],
-            "strategic_recommendations": []
-        }
-
-# Include router
-app.include_router(api_router)
+# Feature routers served by this deployment, e.g. ENABLED_ROUTERS=auth,campaigns,comments
+# for lean API workers and ENABLED_ROUTERS=ai,analytics for AI workers that scale
+# separately. Disabled routers are never imported.
+ENABLED_ROUTERS = [
+    name.strip() for name in os.environ.get('ENABLED_ROUTERS', ','.join(ALL_ROUTERS)).split(',') if name.strip()
+]
+unknown_routers = set(ENABLED_ROUTERS) - set(ALL_ROUTERS)
+if unknown_routers:
+    raise RuntimeError(f"Unknown routers in ENABLED_ROUTERS: {', '.join(sorted(unknown_routers))}")
+
+warm_up_targets = [supabase]
+for router_name in ENABLED_ROUTERS:
+    router_module = importlib.import_module(f"routers.{router_name}")
+    app.include_router(router_module.router)
+    warm_up_targets.extend(t for t in getattr(router_module, "WARM_UP", ()) if t not in warm_up_targets)
+
+# Liveness/readiness probe; touches no SDKs or tables
+@app.get("/api/health")
+async def health():
+    return {"status": "ok", "routers": ENABLED_ROUTERS}
+
+# Prometheus scrape endpoint; set METRICS_TOKEN to require a bearer token
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    token = os.environ.get('METRICS_TOKEN')
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        raise HTTPException(401, "Not authenticated")
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# Innermost, so per-request profiles cover the handler rather than the middleware stack
+app.add_middleware(RequestProfilerMiddleware, request_profiler=request_profiler)
+
+# Compress large JSON bodies; streaming responses are always passed through
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get('COMPRESSION_MIN_SIZE', '1024')),
+    gzip_level=int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6')),
+    brotli_quality=int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '4')),
+    exempt_paths=os.environ.get('COMPRESSION_EXEMPT_PATHS', '/api/webhook').split(','),
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -1838,15 +68,105 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
+# Request ids and the root span for each request; the outbound-call spans nest under it
+app.add_middleware(TracingMiddleware)
+
+# Outermost, so latency covers compression and CORS handling too
+app.add_middleware(MetricsMiddleware)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
 )
+for handler in logging.getLogger().handlers:
+    handler.addFilter(RequestIdFilter())
 logger = logging.getLogger(__name__)
 
+async def refresh_home_feed():
+    """Full rebuild from Supabase; incremental updates keep it current in between"""
+    # Both reads page through every row, so the feed covers the whole catalog and every recent pledge
+    campaigns = await sb_find_all("campaigns", {"status": "active"}, columns=FEED_SOURCE_COLUMNS)
+    # Only pledges inside the velocity window count towards trending
+    since = (datetime.now(timezone.utc) - timedelta(seconds=home_feed.velocity_window)).isoformat()
+    pledges = await sb_find_all("pledges", {"payment_status": "paid", "created_at": {"$gte": since}},
+                                columns="id,campaign_id,amount,created_at")
+    home_feed.rebuild(campaigns, pledges)
+
+async def home_feed_refresher():
+    # Periodic rebuilds converge workers that did not see another worker's writes
+    while True:
+        await asyncio.sleep(HOME_FEED_REFRESH_SECONDS)
+        try:
+            await refresh_home_feed()
+        except Exception as e:
+            logger.error(f"Home feed refresh failed: {e}")
+
+async def token_usage_flusher():
+    while True:
+        await asyncio.sleep(TOKEN_USAGE_FLUSH_SECONDS)
+        try:
+            await flush_token_usage()
+        except Exception as e:
+            logger.error(f"Token usage flush failed: {e}")
+
+@app.on_event("startup")
+async def configure_thread_pool():
+    # Every Supabase/Gemini/Stripe call holds a pool thread for its full latency; the
+    # default pool (cpus + 4 threads) caps a small worker at a handful of calls in flight
+    size = int(os.environ.get('THREAD_POOL_SIZE', '64'))
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=size, thread_name_prefix="io"))
+
+@app.on_event("startup")
+async def build_home_feed():
+    if "campaigns" not in ENABLED_ROUTERS:
+        return
+    try:
+        await refresh_home_feed()
+    except Exception as e:
+        logger.error(f"Initial home feed build failed: {e}")
+    app.state.home_feed_task = asyncio.create_task(home_feed_refresher())
+
+@app.on_event("startup")
+async def start_token_usage_flusher():
+    app.state.token_usage_task = asyncio.create_task(token_usage_flusher())
+
+@app.on_event("startup")
+async def start_campaign_scorer():
+    if "campaigns" in ENABLED_ROUTERS and CAMPAIGN_SCORE_INTERVAL_SECONDS > 0:
+        app.state.campaign_score_task = asyncio.create_task(campaign_scorer())
+
+@app.on_event("startup")
+async def start_analysis_refresher():
+    # Queued by campaign edits and pledges, so only workers serving those routers have work
+    if "campaigns" in ENABLED_ROUTERS or "payments" in ENABLED_ROUTERS:
+        app.state.analysis_refresh_task = asyncio.create_task(analysis_refresher.run_forever())
+
+@app.on_event("startup")
+async def warm_up_sdks():
+    # Registered after build_home_feed, so "background" loads the SDKs while the
+    # worker is already serving; "startup" holds readiness until they are loaded
+    if LAZY_IMPORT_WARMUP == "startup":
+        await asyncio.to_thread(warm_up, *warm_up_targets)
+    elif LAZY_IMPORT_WARMUP == "background":
+        app.state.warm_up_task = asyncio.create_task(asyncio.to_thread(warm_up, *warm_up_targets))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     # Supabase client doesn't need explicit closing
-    pass
+    for name in ("home_feed_task", "token_usage_task", "analysis_refresh_task", "campaign_score_task"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
+    # Let post-response work and queued chat writes finish before the worker exits
+    drain_seconds = int(os.environ.get('SHUTDOWN_DRAIN_SECONDS', '10'))
+    if background_tasks:
+        await asyncio.wait(set(background_tasks), timeout=drain_seconds)
+    await chat_message_writer.close(drain_seconds)
+    try:
+        await flush_token_usage()
+    except Exception as e:
+        logger.error(f"Final token usage flush failed: {e}")
+    tracer.shutdown()
@@ -0,0 +1,166 @@
+"""
+Slow-call log for outbound Supabase, Gemini and Stripe calls.
+
+Every call is folded into per-minute aggregates keyed by its signature
+(kind, table/endpoint, operation and the filter columns, never their values),
+which back the admin "top slowest signatures" view. Calls over the threshold
+for their kind are logged as one JSON line on the `slow_calls` logger; a
+small random sample of the remaining calls is logged too, so the fast path
+stays visible.
+"""
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from tracing import current_request_id
+
+logger = logging.getLogger("slow_calls")
+
+
+def redact_filters(filters: Optional[dict]) -> Optional[dict]:
+    """Keep filter columns and operators, drop the values"""
+    if not filters:
+        return None
+    return {key: {op: "?" for op in value} if isinstance(value, dict) else "?" for key, value in filters.items()}
+
+
+def row_count(result: Any) -> Optional[int]:
+    data = getattr(result, "data", result)
+    return len(data) if isinstance(data, list) else None
+
+
+def payload_bytes(payload: Any) -> Optional[int]:
+    if payload is None:
+        return None
+    if isinstance(payload, str):
+        return len(payload.encode())
+    return len(json.dumps(payload, default=str))
+
+
+class CallRecord:
+    __slots__ = ("result",)
+
+    def __init__(self):
+        self.result = None
+
+
+class SlowCallLog:
+    def __init__(self, thresholds_ms: Dict[str, float], default_threshold_ms: float = 500.0,
+                 sample_rate: float = 0.01, window_seconds: int = 900, bucket_seconds: int = 60):
+        self.thresholds_ms = thresholds_ms
+        self.default_threshold_ms = default_threshold_ms
+        self.sample_rate = sample_rate
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        # bucket start -> signature -> [count, slow_count, total_ms, max_ms, max_rows]
+        self._buckets: Dict[int, Dict[tuple, list]] = {}
+        self._lock = threading.Lock()
+
+    def threshold_ms(self, kind: str) -> float:
+        return self.thresholds_ms.get(kind, self.default_threshold_ms)
+
+    @contextmanager
+    def track(self, kind: str, target: str, operation: str, filters: Optional[dict] = None, payload: Any = None):
+        """Time the block; set `record.result` inside it so the row count can be reported"""
+        record = CallRecord()
+        start = time.perf_counter()
+        error = None
+        try:
+            yield record
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.record(kind, target, operation, (time.perf_counter() - start) * 1000,
+                        filters=filters, payload=payload, result=record.result, error=error)
+
+    def record(self, kind: str, target: str, operation: str, duration_ms: float, filters: Optional[dict] = None,
+               payload: Any = None, result: Any = None, error: Optional[str] = None):
+        redacted = redact_filters(filters)
+        signature = (kind, target, operation, tuple(sorted(redacted)) if redacted else ())
+        rows = row_count(result)
+        slow = duration_ms >= self.threshold_ms(kind)
+        bucket = int(time.time()) // self.bucket_seconds * self.bucket_seconds
+
+        with self._lock:
+            stats = self._buckets.setdefault(bucket, {}).get(signature)
+            if stats is None:
+                stats = self._buckets[bucket][signature] = [0, 0, 0.0, 0.0, 0]
+            stats[0] += 1
+            stats[1] += slow
+            stats[2] += duration_ms
+            stats[3] = max(stats[3], duration_ms)
+            stats[4] = max(stats[4], rows or 0)
+            if len(self._buckets) > self.window_seconds // self.bucket_seconds + 1:
+                self._prune(bucket)
+
+        if slow or error or random.random() < self.sample_rate:
+            entry = {
+                "kind": kind,
+                "target": target,
+                "operation": operation,
+                "duration_ms": round(duration_ms, 2),
+                "threshold_ms": self.threshold_ms(kind),
+                "slow": slow,
+                "filters": redacted,
+                "rows": rows,
+                "payload_bytes": payload_bytes(payload),
+                "request_id": current_request_id(),
+            }
+            if error:
+                entry["error"] = error
+            line = json.dumps(entry)
+            logger.warning(line) if slow or error else logger.info(line)
+
+    def _prune(self, newest_bucket: int):
+        cutoff = newest_bucket - self.window_seconds
+        for bucket in [b for b in self._buckets if b <= cutoff]:
+            del self._buckets[bucket]
+
+    def top(self, limit: int = 20, window_seconds: Optional[int] = None, sort: str = "total_ms") -> list:
+        """Aggregate signatures over the window, slowest first by `sort`"""
+        window = min(window_seconds or self.window_seconds, self.window_seconds)
+        cutoff = time.time() - window
+        merged: Dict[tuple, list] = {}
+        with self._lock:
+            for bucket, signatures in self._buckets.items():
+                if bucket + self.bucket_seconds <= cutoff:
+                    continue
+                for signature, stats in signatures.items():
+                    total = merged.setdefault(signature, [0, 0, 0.0, 0.0, 0])
+                    total[0] += stats[0]
+                    total[1] += stats[1]
+                    total[2] += stats[2]
+                    total[3] = max(total[3], stats[3])
+                    total[4] = max(total[4], stats[4])
+
+        rows = []
+        for (kind, target, operation, filter_keys), (count, slow_count, total_ms, max_ms, max_rows) in merged.items():
+            rows.append({
+                "kind": kind,
+                "target": target,
+                "operation": operation,
+                "filter_columns": list(filter_keys),
+                "count": count,
+                "slow_count": slow_count,
+                "total_ms": round(total_ms, 2),
+                "avg_ms": round(total_ms / count, 2),
+                "max_ms": round(max_ms, 2),
+                "max_rows": max_rows,
+            })
+        rows.sort(key=lambda r: r.get(sort, r["total_ms"]), reverse=True)
+        return rows[:limit]
+
+
+def parse_thresholds(spec: str) -> Dict[str, float]:
+    """'db=250,gemini=5000' -> {'db': 250.0, 'gemini': 5000.0}"""
+    thresholds = {}
+    for part in spec.split(","):
+        if "=" in part:
+            kind, value = part.split("=", 1)
+            thresholds[kind.strip()] = float(value)
+    return thresholds
@@ -0,0 +1,64 @@
+"""
+Parsing and validation of JSON answers from Gemini.
+
+Calls are made in JSON mode (see core.gemini_structured), so the text is
+normally plain JSON. For the cases where it is not, extract_json strips code
+fences, decodes the first complete JSON value (nested objects included) and
+drops trailing commas. The result is validated against a pydantic schema;
+when that fails the caller sends only the invalid output, the validation
+errors and the schema back to Gemini for a repair, which is far cheaper than
+repeating the original prompt.
+"""
+import json
+import re
+from typing import Any, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+T = TypeVar("T", bound=BaseModel)
+
+_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+class StructuredOutputError(ValueError):
+    """Model output that is not valid JSON or does not match the schema"""
+
+
+def extract_json(text: str) -> Any:
+    """First complete JSON object or array in `text`"""
+    text = _FENCE.sub("", text or "")
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    decoder = json.JSONDecoder()
+    for candidate in (text, _TRAILING_COMMA.sub(r"\1", text)):
+        for match in re.finditer(r"[\[{]", candidate):
+            try:
+                value, _ = decoder.raw_decode(candidate, match.start())
+                return value
+            except ValueError:
+                continue
+    raise StructuredOutputError("no JSON object or array found in the response")
+
+
+def parse_structured(text: str, schema: Type[T]) -> T:
+    """Extract JSON from `text` and validate it against `schema`"""
+    data = extract_json(text)
+    try:
+        return schema.model_validate(data)
+    except ValidationError as e:
+        errors = "; ".join(f"{'.'.join(str(part) for part in error['loc']) or 'root'}: {error['msg']}"
+                           for error in e.errors()[:10])
+        raise StructuredOutputError(errors) from e
+
+
+def repair_prompt(text: str, schema: Type[BaseModel], error: StructuredOutputError) -> str:
+    return (
+        "The JSON below does not match the required schema.\n"
+        f"Problems: {error}\n\n"
+        f"Schema:\n{json.dumps(schema.model_json_schema(), separators=(',', ':'))}\n\n"
+        f"JSON:\n{(text or '')[:8000]}\n\n"
+        "Return ONLY the corrected JSON, keeping all content that is already valid."
+    )
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Local success-probability model for campaigns.
+
+A logistic regression over a handful of features that can be computed for
+any campaign row at any point of its run: progress through its duration,
+percent funded, funding pace, goal size, backers per day, description length,
+reward tiers, image and the historical success rate of its category. Scoring
+is one matrix-vector product over the listing (about 2ms per thousand rows,
+mostly reading the dicts), so badges, Discover cards and analyses never wait
+on Gemini for the number; Gemini only writes the narrative around it.
+
+The model is trained offline from our own history. Every finished campaign is
+replayed at several points of its run (SNAPSHOT_POINTS) from its pledges, and
+labelled by whether it ended at or above its goal:
+
+    # from a generate_dataset.py export
+    python success_model.py --data ./dataset --out success_model.json
+
+    # straight from the Supabase project in .env
+    python success_model.py --out success_model.json
+
+The artifact is a small JSON file (standardization, weights, category rates,
+holdout metrics) read at import from SUCCESS_MODEL_PATH. Without it
+`success_model` is None and callers keep their Gemini-only behaviour. The file
+is read once per process, and with the launcher's default --preload that is
+the master, so a retrained file needs a full restart (or the USR2+WINCH
+upgrade); a HUP only picks it up when running with --no-preload.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from lazy import lazy_module
+
+np = lazy_module("numpy")
+
+logger = logging.getLogger("success_model")
+
+FEATURES = (
+    "elapsed", "funded", "pace", "log_goal", "backers_per_day", "duration",
+    "description_chars", "reward_tiers", "has_image", "category_rate",
+)
+SNAPSHOT_POINTS = (0.0, 0.1, 0.25, 0.5, 0.75, 0.9)
+CATEGORY_PRIOR_WEIGHT = 20  # campaigns' worth of the global rate mixed into each category's rate
+
+
+def feature_matrix(goal, raised, backers, elapsed_days, duration_days, description_chars, reward_tiers,
+                   has_image, category_rate):
+    """One row of FEATURES per campaign from equal-length arrays; shared by training and scoring"""
+    goal = np.maximum(np.asarray(goal, dtype=float), 1.0)
+    duration = np.maximum(np.asarray(duration_days, dtype=float), 1.0)
+    elapsed_days = np.clip(np.asarray(elapsed_days, dtype=float), 0.0, duration)
+    elapsed = elapsed_days / duration
+    funded = np.clip(np.asarray(raised, dtype=float) / goal, 0.0, 3.0)
+    return np.column_stack([
+        elapsed,
+        funded,
+        np.clip(funded / np.maximum(elapsed, 0.05), 0.0, 5.0),
+        np.log1p(goal),
+        np.log1p(np.asarray(backers, dtype=float) / np.maximum(elapsed_days, 1.0)),
+        duration / 30.0,
+        np.log1p(np.asarray(description_chars, dtype=float)),
+        np.minimum(np.asarray(reward_tiers, dtype=float), 10.0),
+        np.asarray(has_image, dtype=float),
+        np.asarray(category_rate, dtype=float),
+    ])
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30.0, 30.0)))
+
+
+def _elapsed_days(created_at, now: datetime) -> float:
+    if isinstance(created_at, str):
+        try:
+            created_at = datetime.fromisoformat(created_at)
+        except ValueError:
+            return 0.0
+    if not isinstance(created_at, datetime):
+        return 0.0  # drafts in the creation wizard have not started yet
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (now - created_at).total_seconds() / 86400)
+
+
+def success_level(probability: float) -> str:
+    return "High" if probability >= 70 else "Medium" if probability >= 40 else "Low"
+
+
+class SuccessModel:
+    def __init__(self, params: dict):
+        self.params = params
+        self.trained_at = params.get("trained_at")
+        self.category_rates = params["category_rates"]
+        self.global_rate = params["global_rate"]
+        self._coefficients = None  # numpy arrays, built on first score so loading stays numpy-free
+
+    @classmethod
+    def load(cls, path: str) -> Optional["SuccessModel"]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                params = json.load(f)
+        except FileNotFoundError:
+            logger.info(f"No success model at {path}; success scores come from Gemini only")
+            return None
+        if tuple(params.get("features", ())) != FEATURES:
+            logger.warning(f"Success model at {path} was trained on different features; ignoring it")
+            return None
+        return cls(params)
+
+    def category_rate(self, category: Optional[str]) -> float:
+        return self.category_rates.get(category or "", self.global_rate)
+
+    def score_many(self, campaigns: List[dict], now: Optional[datetime] = None):
+        """Success probability (0-100) for each campaign row, as a numpy array"""
+        if self._coefficients is None:
+            p = self.params
+            self._coefficients = (np.asarray(p["mean"]), np.asarray(p["scale"]), np.asarray(p["weights"]),
+                                  float(p["bias"]))
+        mean, scale, weights, bias = self._coefficients
+        now = now or datetime.now(timezone.utc)
+        n = len(campaigns)
+        X = feature_matrix(
+            goal=np.fromiter((c.get("goal_amount") or 0 for c in campaigns), float, n),
+            raised=np.fromiter((c.get("raised_amount") or 0 for c in campaigns), float, n),
+            backers=np.fromiter((c.get("backers_count") or 0 for c in campaigns), float, n),
+            elapsed_days=np.fromiter((_elapsed_days(c.get("created_at"), now) for c in campaigns), float, n),
+            duration_days=np.fromiter((c.get("duration_days") or 30 for c in campaigns), float, n),
+            description_chars=np.fromiter((len(c.get("description") or "") for c in campaigns), float, n),
+            reward_tiers=np.fromiter((len(c.get("reward_tiers") or ()) for c in campaigns), float, n),
+            has_image=np.fromiter((bool(c.get("image_url")) for c in campaigns), float, n),
+            category_rate=np.fromiter((self.category_rate(c.get("category")) for c in campaigns), float, n),
+        )
+        return np.round(_sigmoid(((X - mean) / scale) @ weights + bias) * 100, 1)
+
+    def score(self, campaign: dict, now: Optional[datetime] = None) -> float:
+        return float(self.score_many([campaign], now)[0])
+
+
+success_model = SuccessModel.load(
+    os.environ.get('SUCCESS_MODEL_PATH', str(Path(__file__).parent / 'success_model.json'))
+)
+
+
+# ============ OFFLINE TRAINING ============
+
+def _fit_logistic(X, y, l2: float, iterations: int = 50):
+    """Newton/IRLS fit of an L2-regularized logistic regression; returns (weights, bias)"""
+    Xb = np.column_stack([np.ones(len(X)), X])
+    penalty = l2 * np.eye(Xb.shape[1])
+    penalty[0, 0] = 0.0  # the intercept is not shrunk
+    w = np.zeros(Xb.shape[1])
+    for _ in range(iterations):
+        p = _sigmoid(Xb @ w)
+        gradient = Xb.T @ (p - y) + penalty @ w
+        hessian = (Xb * (p * (1 - p))[:, None]).T @ Xb + penalty
+        step = np.linalg.solve(hessian, gradient)
+        w -= step
+        if np.abs(step).max() < 1e-8:
+            break
+    return w[1:], w[0]
+
+
+def _category_rates(categories, labels) -> Tuple[dict, float]:
+    import pandas as pd
+
+    frame = pd.DataFrame({"category": categories, "label": labels})
+    global_rate = float(frame["label"].mean())
+    grouped = frame.groupby("category")["label"].agg(["sum", "count"])
+    rates = (grouped["sum"] + CATEGORY_PRIOR_WEIGHT * global_rate) / (grouped["count"] + CATEGORY_PRIOR_WEIGHT)
+    return {str(category): round(float(rate), 4) for category, rate in rates.items()}, global_rate
+
+
+def snapshots(campaigns, pledges, now: datetime):
+    """Finished campaigns replayed at each SNAPSHOT_POINT, with label = ended at or above goal"""
+    import pandas as pd
+
+    campaigns = campaigns.copy()
+    campaigns["created_at"] = pd.to_datetime(campaigns["created_at"], utc=True, format="ISO8601")
+    campaigns["duration_days"] = campaigns["duration_days"].fillna(30).clip(lower=1)
+    ends = campaigns["created_at"] + pd.to_timedelta(campaigns["duration_days"], unit="D")
+    finished = campaigns[(ends <= pd.Timestamp(now)) & (campaigns["status"] != "draft")].copy()
+    finished["label"] = (finished["raised_amount"] >= finished["goal_amount"]).astype(float)
+
+    pledges = pledges[pledges["payment_status"] == "paid"] if "payment_status" in pledges else pledges
+    pledges = pledges.merge(finished[["id", "created_at", "duration_days"]], left_on="campaign_id", right_on="id",
+                            suffixes=("", "_campaign"))
+    pledged_at = pd.to_datetime(pledges["created_at"], utc=True, format="ISO8601")
+    pledges["progress"] = ((pledged_at - pledges["created_at_campaign"]).dt.total_seconds()
+                           / (pledges["duration_days"] * 86400))
+
+    frames = []
+    for point in SNAPSHOT_POINTS:
+        so_far = (pledges[pledges["progress"] <= point].groupby("campaign_id")["amount"]
+                  .agg(raised_so_far="sum", backers_so_far="size"))
+        snapshot = finished.join(so_far, on="id")
+        snapshot[["raised_so_far", "backers_so_far"]] = snapshot[["raised_so_far", "backers_so_far"]].fillna(0)
+        snapshot["elapsed_days"] = point * snapshot["duration_days"]
+        frames.append(snapshot)
+    return finished, pd.concat(frames, ignore_index=True)
+
+
+def _training_matrix(frame, category_rates: dict, global_rate: float):
+    return feature_matrix(
+        goal=frame["goal_amount"].to_numpy(float),
+        raised=frame["raised_so_far"].to_numpy(float),
+        backers=frame["backers_so_far"].to_numpy(float),
+        elapsed_days=frame["elapsed_days"].to_numpy(float),
+        duration_days=frame["duration_days"].to_numpy(float),
+        description_chars=frame["description"].fillna("").str.len().to_numpy(float),
+        reward_tiers=frame["reward_tiers"].map(_tier_count).to_numpy(float),
+        has_image=frame["image_url"].fillna("").astype(bool).to_numpy(float),
+        category_rate=frame["category"].map(category_rates).fillna(global_rate).to_numpy(float),
+    )
+
+
+def _tier_count(value) -> int:
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return 0
+    return len(value) if isinstance(value, (list, tuple)) else 0
+
+
+def _fit(frame, campaigns, l2: float) -> dict:
+    category_rates, global_rate = _category_rates(campaigns["category"], campaigns["label"])
+    X = _training_matrix(frame, category_rates, global_rate)
+    mean, scale = X.mean(axis=0), X.std(axis=0)
+    scale[scale == 0] = 1.0
+    weights, bias = _fit_logistic((X - mean) / scale, frame["label"].to_numpy(float), l2)
+    return {
+        "features": list(FEATURES),
+        "mean": mean.round(6).tolist(),
+        "scale": scale.round(6).tolist(),
+        "weights": weights.round(6).tolist(),
+        "bias": round(float(bias), 6),
+        "category_rates": category_rates,
+        "global_rate": round(global_rate, 4),
+    }
+
+
+def _evaluate(params: dict, frame) -> dict:
+    import pandas as pd
+
+    X = _training_matrix(frame, params["category_rates"], params["global_rate"])
+    p = _sigmoid(((X - np.asarray(params["mean"])) / np.asarray(params["scale"])) @ np.asarray(params["weights"])
+                 + params["bias"])
+    y = frame["label"].to_numpy(float)
+    positives, negatives = y.sum(), len(y) - y.sum()
+    ranks = pd.Series(p).rank().to_numpy()
+    auc = (ranks[y == 1].sum() - positives * (positives + 1) / 2) / (positives * negatives) \
+        if positives and negatives else float("nan")
+    clipped = np.clip(p, 1e-6, 1 - 1e-6)
+    return {
+        "auc": round(float(auc), 4),
+        "brier": round(float(np.mean((p - y) ** 2)), 4),
+        "log_loss": round(float(-np.mean(y * np.log(clipped) + (1 - y) * np.log(1 - clipped))), 4),
+        "base_rate": round(float(y.mean()), 4),
+        "samples": int(len(y)),
+    }
+
+
+def train(campaigns, pledges, now: Optional[datetime] = None, l2: float = 1.0, holdout: float = 0.2) -> dict:
+    """Fit on a campaign-level split, report holdout metrics, then refit on everything"""
+    import pandas as pd
+
+    now = now or datetime.now(timezone.utc)
+    finished, frame = snapshots(campaigns, pledges, now)
+    if finished["label"].nunique() < 2:
+        raise ValueError("need finished campaigns that both met and missed their goal to train")
+
+    in_holdout = (pd.util.hash_pandas_object(finished["id"], index=False) % 1000) < holdout * 1000
+    holdout_ids = set(finished.loc[in_holdout.to_numpy(), "id"])
+    test_mask = frame["id"].isin(holdout_ids)
+    metrics = None
+    if holdout_ids and not test_mask.all():
+        params = _fit(frame[~test_mask], finished[~finished["id"].isin(holdout_ids)], l2)
+        metrics = _evaluate(params, frame[test_mask])
+
+    params = _fit(frame, finished, l2)
+    params.update({
+        "trained_at": now.isoformat(),
+        "campaigns": int(len(finished)),
+        "samples": int(len(frame)),
+        "l2": l2,
+        "holdout": metrics,
+    })
+    return params
+
+
+CAMPAIGN_TRAINING_COLUMNS = ("id", "category", "goal_amount", "raised_amount", "status", "duration_days",
+                             "description", "reward_tiers", "image_url", "created_at")
+PLEDGE_TRAINING_COLUMNS = ("campaign_id", "amount", "payment_status", "created_at")
+
+
+def load_csv(data_dir: Path):
+    """campaigns and pledges frames from a generate_dataset.py --out directory"""
+    import pandas as pd
+
+    campaigns = pd.read_csv(data_dir / "campaigns.csv", usecols=list(CAMPAIGN_TRAINING_COLUMNS))
+    pledges = pd.read_csv(data_dir / "pledges.csv", usecols=list(PLEDGE_TRAINING_COLUMNS))
+    return campaigns, pledges
+
+
+def _fetch_all(client, table: str, columns: Iterable[str], page_size: int = 1000) -> List[dict]:
+    rows, start = [], 0
+    while True:
+        page = client.table(table).select(",".join(columns)).range(start, start + page_size - 1).execute().data
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+
+def load_supabase():
+    """campaigns and pledges frames read page by page from the Supabase project in .env"""
+    import pandas as pd
+    from dotenv import load_dotenv
+    from supabase import create_client
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = create_client(os.environ['SUPABASE_URL'], os.environ['SUPABASE_KEY'])
+    campaigns = pd.DataFrame(_fetch_all(client, "campaigns", CAMPAIGN_TRAINING_COLUMNS),
+                             columns=list(CAMPAIGN_TRAINING_COLUMNS))
+    pledges = pd.DataFrame(_fetch_all(client, "pledges", PLEDGE_TRAINING_COLUMNS),
+                           columns=list(PLEDGE_TRAINING_COLUMNS))
+    return campaigns, pledges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", type=Path, help="generate_dataset.py --out directory (default: read Supabase)")
+    parser.add_argument("--out", type=Path, default=Path(__file__).parent / "success_model.json")
+    parser.add_argument("--l2", type=float, default=1.0, help="regularization strength")
+    parser.add_argument("--now", help="ISO timestamp treated as the present, for fixed-now datasets")
+    args = parser.parse_args()
+
+    campaigns, pledges = load_csv(args.data) if args.data else load_supabase()
+    now = datetime.fromisoformat(args.now) if args.now else None
+    params = train(campaigns, pledges, now=now, l2=args.l2)
+    args.out.write_text(json.dumps(params, indent=2), encoding="utf-8")
+
+    print(f"Trained on {params['campaigns']:,} finished campaigns ({params['samples']:,} snapshots)")
+    if params["holdout"]:
+        print("Holdout: " + ", ".join(f"{key}={value}" for key, value in params["holdout"].items()))
+    for name, weight in sorted(zip(FEATURES, params["weights"]), key=lambda item: -abs(item[1])):
+        print(f"  {name:18} {weight:+.3f}")
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
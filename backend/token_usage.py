@@ -0,0 +1,93 @@
+"""
+Gemini token accounting rolled up per day, endpoint and user.
+
+Every Gemini call records its prompt, completion and cached token counts
+(from the response's usage_metadata), latency and outcome into an in-memory
+ledger. Answers served from our own stored results (e.g. a cached campaign
+analysis) are recorded as cache hits with no tokens, which shows what the
+cache saves. The ledger keeps only deltas since its last flush; flushing adds
+them to the gemini_usage_daily table through the record_gemini_usage
+function, so workers never overwrite each other's totals.
+"""
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+COUNTERS = ("calls", "cache_hits", "errors", "prompt_tokens", "completion_tokens", "cached_tokens", "latency_ms")
+
+
+def usage_tokens(response) -> Tuple[int, int, int]:
+    """(prompt, completion, cached) token counts from a Gemini response; zeros when absent"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return 0, 0, 0
+    return (
+        int(getattr(usage, "prompt_token_count", 0) or 0),
+        int(getattr(usage, "candidates_token_count", 0) or 0),
+        int(getattr(usage, "cached_content_token_count", 0) or 0),
+    )
+
+
+class TokenUsageLedger:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str, str], Dict[str, int]] = {}
+
+    def record(self, endpoint: str, user_id: Optional[str], prompt_tokens: int = 0, completion_tokens: int = 0,
+               cached_tokens: int = 0, latency_ms: float = 0.0, cache_hit: bool = False, error: bool = False):
+        day = datetime.now(timezone.utc).date().isoformat()
+        key = (day, endpoint, user_id or "")
+        with self._lock:
+            row = self._pending.get(key)
+            if row is None:
+                row = self._pending[key] = dict.fromkeys(COUNTERS, 0)
+            row["calls"] += 1
+            row["cache_hits"] += int(cache_hit)
+            row["errors"] += int(error)
+            row["prompt_tokens"] += prompt_tokens
+            row["completion_tokens"] += completion_tokens
+            row["cached_tokens"] += cached_tokens
+            row["latency_ms"] += int(latency_ms)
+
+    def drain(self) -> List[dict]:
+        """Take the deltas recorded since the last drain as gemini_usage_daily rows"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return [{"day": day, "endpoint": endpoint, "user_id": user_id, **counters}
+                for (day, endpoint, user_id), counters in pending.items()]
+
+    def restore(self, rows: List[dict]) -> None:
+        """Merge rows back after a failed flush so the next one retries them"""
+        with self._lock:
+            for row in rows:
+                key = (row["day"], row["endpoint"], row["user_id"])
+                target = self._pending.setdefault(key, dict.fromkeys(COUNTERS, 0))
+                for counter in COUNTERS:
+                    target[counter] += row[counter]
+
+
+def summarize(rows: List[dict], group_by: str, input_price_per_m: float, output_price_per_m: float,
+              limit: int = 50) -> List[dict]:
+    """Totals per `group_by` (endpoint, user_id or day) with estimated cost, most expensive first"""
+    groups: Dict[str, Dict[str, int]] = {}
+    for row in rows:
+        target = groups.setdefault(row.get(group_by) or "", dict.fromkeys(COUNTERS, 0))
+        for counter in COUNTERS:
+            target[counter] += int(row.get(counter) or 0)
+
+    result = []
+    for key, totals in groups.items():
+        generated = totals["calls"] - totals["cache_hits"]
+        cost = (totals["prompt_tokens"] * input_price_per_m + totals["completion_tokens"] * output_price_per_m) / 1e6
+        result.append({
+            group_by: key,
+            **totals,
+            "total_tokens": totals["prompt_tokens"] + totals["completion_tokens"],
+            "avg_prompt_tokens": round(totals["prompt_tokens"] / generated, 1) if generated else 0,
+            "avg_completion_tokens": round(totals["completion_tokens"] / generated, 1) if generated else 0,
+            "avg_latency_ms": round(totals["latency_ms"] / generated, 1) if generated else 0,
+            "cache_hit_ratio": round(totals["cache_hits"] / totals["calls"], 3) if totals["calls"] else 0,
+            "estimated_cost_usd": round(cost, 4),
+        })
+    result.sort(key=lambda item: (item["estimated_cost_usd"], item["total_tokens"]), reverse=True)
+    return result[:limit]
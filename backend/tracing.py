@@ -0,0 +1,286 @@
+"""
+Lightweight OpenTelemetry-compatible tracing.
+
+Spans carry W3C trace/span ids and propagate through contextvars, so work
+started with asyncio.gather or asyncio.to_thread nests under the request span.
+Incoming `traceparent` headers are honoured and every request gets an
+X-Request-ID that is echoed back and stamped on spans and log records.
+
+Exporters are pluggable (TRACING_EXPORTER):
+    none                  tracing disabled (request ids still propagate)
+    console               one log line per span
+    file:/path/spans.jsonl  OTLP/JSON lines, readable by the OpenTelemetry
+                          Collector's otlpjsonfile receiver
+    package.module:Class  any object with export(span) and shutdown()
+"""
+import importlib
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from metrics import route_template
+
+logger = logging.getLogger("tracing")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def parse_traceparent(header: Optional[str]):
+    """Return (trace_id, parent_span_id) from a W3C traceparent header, or (None, None)"""
+    if not header:
+        return None, None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None, None
+    trace_id, span_id = parts[1].lower(), parts[2].lower()
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None, None
+    return trace_id, span_id
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Span:
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "attributes",
+                 "start_ns", "end_ns", "error", "events")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: str = "internal",
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+        self.events = []
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_error(self, message: str):
+        self.error = message
+
+    def record_exception(self, exc: BaseException):
+        self.error = f"{type(exc).__name__}: {exc}"
+        self.events.append({
+            "name": "exception",
+            "timeUnixNano": str(time.time_ns()),
+            "attributes": [
+                {"key": "exception.type", "value": {"stringValue": type(exc).__name__}},
+                {"key": "exception.message", "value": {"stringValue": str(exc)}},
+            ],
+        })
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": SPAN_KINDS.get(self.kind, 1),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.events:
+            span["events"] = self.events
+        return span
+
+
+class _NoopSpan:
+    trace_id = span_id = parent_id = None
+    traceparent = None
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_error(self, message):
+        pass
+
+    def record_exception(self, exc):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+# ============ EXPORTERS ============
+
+class ConsoleSpanExporter:
+    def export(self, span: Span):
+        attrs = " ".join(f"{k}={v}" for k, v in span.attributes.items())
+        status = f" error={span.error!r}" if span.error else ""
+        logger.info(f"span {span.name} {span.duration_ms:.1f}ms trace={span.trace_id} "
+                    f"span={span.span_id} parent={span.parent_id or '-'} {attrs}{status}")
+
+    def shutdown(self):
+        pass
+
+
+class FileSpanExporter:
+    """Appends one OTLP/JSON ExportTraceServiceRequest per line"""
+
+    def __init__(self, path: str, service_name: str):
+        self.path = path
+        self.resource = {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]}
+        self._lock = threading.Lock()
+        self._file = open(path, "a", buffering=1)
+
+    def export(self, span: Span):
+        line = json.dumps({"resourceSpans": [{
+            "resource": self.resource,
+            "scopeSpans": [{"scope": {"name": "server"}, "spans": [span.to_otlp()]}],
+        }]})
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+def make_exporter(spec: Optional[str], service_name: str):
+    """Build an exporter from a TRACING_EXPORTER value; None disables tracing"""
+    spec = (spec or "none").strip()
+    if spec == "none":
+        return None
+    if spec == "console":
+        return ConsoleSpanExporter()
+    if spec.startswith("file:"):
+        return FileSpanExporter(spec[len("file:"):], service_name)
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+# ============ TRACER ============
+
+class Tracer:
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", attributes: Optional[Dict[str, Any]] = None,
+             trace_id: Optional[str] = None, parent_id: Optional[str] = None):
+        """Child of the current span (or a new trace) that is exported when the block exits"""
+        if self.exporter is None:
+            yield NOOP_SPAN
+            return
+        parent = _current_span.get()
+        if trace_id is None:
+            trace_id = parent.trace_id if parent else secrets.token_hex(16)
+            parent_id = parent.span_id if parent else None
+        span = Span(name, trace_id, parent_id, kind, attributes)
+        request_id = _request_id.get()
+        if request_id:
+            span.attributes["request.id"] = request_id
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.record_exception(exc)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            try:
+                self.exporter.export(span)
+            except Exception as e:
+                logger.error(f"Span export failed: {e}")
+
+    def shutdown(self):
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+tracer = Tracer(make_exporter(os.environ.get("TRACING_EXPORTER"),
+                              os.environ.get("TRACING_SERVICE_NAME", "crowdfunding-api")))
+
+
+class RequestIdFilter(logging.Filter):
+    """Adds record.request_id so log formats can include %(request_id)s"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get() or "-"
+        return True
+
+
+class TracingMiddleware:
+    def __init__(self, app: ASGIApp, request_id_header: str = "x-request-id") -> None:
+        self.app = app
+        self.request_id_header = request_id_header.lower().encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        request_id = headers.get(self.request_id_header, b"").decode("latin-1")[:128] or uuid.uuid4().hex
+        trace_id, parent_id = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        rid_token = _request_id.set(request_id)
+
+        with tracer.span(f"{scope['method']} {scope['path']}", kind="server", trace_id=trace_id,
+                         parent_id=parent_id, attributes={"http.method": scope["method"]}) as span:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (self.request_id_header, request_id.encode("latin-1"))]
+                    if span.traceparent:
+                        message["headers"].append((b"traceparent", span.traceparent.encode()))
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_error(f"HTTP {message['status']}")
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if span is not NOOP_SPAN:
+                    route = route_template(scope)
+                    span.name = f"{scope['method']} {route}"
+                    span.set_attribute("http.route", route)
+                    span.set_attribute("http.target", scope["path"])
+                _request_id.reset(rid_token)
@@ -0,0 +1,103 @@
+"""
+Write-behind buffer for rows whose insert need not delay the response.
+
+Rows are queued in memory and written by one background task in bulk: a batch
+goes out when max_batch rows are waiting or flush_interval seconds after its
+first row, whichever is sooner. The queue holds at most max_pending rows;
+beyond that put() waits for the writer (backpressure) instead of growing
+without bound.
+
+A failed batch is retried with backoff and then dropped with an error log.
+close() drains the queue, so a graceful shutdown loses nothing; a crash loses
+at most the queued rows, i.e. about flush_interval seconds of writes, or up to
+max_pending rows while the database is unavailable.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+from metrics import WRITE_BEHIND_EVENTS, WRITE_BEHIND_PENDING
+
+logger = logging.getLogger("write_behind")
+
+_STOP = object()
+
+
+class WriteBehindBuffer:
+    def __init__(self, name: str, write_batch: Callable[[List[dict]], Awaitable], max_batch: int = 200,
+                 flush_interval: float = 0.25, max_pending: int = 5000, retries: int = 3):
+        self.name = name
+        self.write_batch = write_batch
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.retries = retries
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    async def put(self, row: dict) -> None:
+        """Queue a row; waits only while max_pending rows are already queued"""
+        if self._closing:
+            await self._write([row])
+            return
+        self._ensure_started()
+        if self._queue.full():
+            WRITE_BEHIND_EVENTS.inc(buffer=self.name, event="blocked")
+        await self._queue.put(row)
+        pending = self._queue.qsize()
+        WRITE_BEHIND_PENDING.set(pending, buffer=self.name)
+        if pending >= self.max_batch:
+            self._batch_ready.set()
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Write everything queued, waiting at most `timeout` seconds"""
+        if self._task is None or self._closing:
+            return
+        self._closing = True
+        try:
+            await asyncio.wait_for(self._queue.put(_STOP), timeout)
+            self._batch_ready.set()
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"{self.name}: {self._queue.qsize()} queued rows not written before shutdown")
+
+    def _ensure_started(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue(self.max_pending)
+            self._batch_ready = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name=f"write-behind {self.name}")
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if not self._closing and self._queue.qsize() < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._batch_ready.clear()
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            WRITE_BEHIND_PENDING.set(self._queue.qsize(), buffer=self.name)
+
+            rows = [row for row in batch if row is not _STOP]
+            if rows:
+                await self._write(rows)
+            if len(rows) < len(batch):
+                return
+
+    async def _write(self, rows: List[dict]) -> None:
+        for attempt in range(self.retries):
+            try:
+                await self.write_batch(rows)
+                WRITE_BEHIND_EVENTS.inc(len(rows), buffer=self.name, event="written")
+                return
+            except Exception as e:
+                logger.warning(f"{self.name}: writing {len(rows)} rows failed (attempt {attempt + 1}): {e}")
+                if attempt + 1 < self.retries:
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+        WRITE_BEHIND_EVENTS.inc(len(rows), buffer=self.name, event="dropped")
+        logger.error(f"{self.name}: dropped {len(rows)} rows after {self.retries} attempts")
@@ -59,95 +59,161 @@ export default function AIOptimizer({ data, onChange }) {
     return true;
   };
 
+  const FEATURE_ENDPOINTS = {
+    title: '/ai/optimize-title',
+    description: '/ai/enhance-description',
+    success_prediction: '/ai/success-prediction',
+    marketing_strategy: '/ai/marketing-strategy'
+  };
+
+  const FEATURE_MESSAGES = {
+    title: 'Title suggestions generated!',
+    description: 'Description enhanced!',
+    success_prediction: 'Success prediction generated!',
+    marketing_strategy: 'Marketing strategy generated!'
+  };
+
+  const requestBody = () => {
+    const validTiers = (data.reward_tiers || []).filter(tier => tier.amount && tier.description);
+    return {
+      title: data.title,
+      description: data.description,
+      category: data.category,
+      goal_amount: parseFloat(data.goal_amount),
+      reward_tiers: validTiers.map(tier => ({
+        amount: parseFloat(tier.amount),
+        description: tier.description
+      }))
+    };
+  };
+
+  // Shape an endpoint's response into what the suggestion panels render
+  const toSuggestion = (featureId, result) => {
+    switch (featureId) {
+      case "title":
+        return { titles: result.titles };
+      case "description":
+        return { improved_description: result.enhanced_description };
+      case "success_prediction":
+        return {
+          probability: result.success_percentage / 100,
+          explanation: result.analysis,
+          recommendations: result.recommendations || []
+        };
+      case "marketing_strategy": {
+        let strategyText = result.overview || '';
+        if (result.channels) {
+          strategyText += '\n\nMarketing Channels:\n';
+          result.channels.forEach(channel => {
+            strategyText += `\n• ${channel.name} (${channel.priority} priority)\n  ${channel.strategy}`;
+          });
+        }
+        return { strategy: strategyText };
+      }
+      default:
+        return null;
+    }
+  };
+
+  const showError = (featureId, status, detail, retryAfter) => {
+    if (status === 429) {
+      toast.error(`${detail || 'Too many AI requests'}${retryAfter ? ` (try again in ${retryAfter}s)` : ''}`);
+    } else {
+      toast.error(`Failed to optimize ${featureId}`);
+    }
+  };
+
   const optimizeFeature = async (featureId) => {
     if (!validateData()) return;
 
     setIsOptimizing(prev => ({ ...prev, [featureId]: true }));
 
     try {
-      let response;
-      
-      switch (featureId) {
-        case "title":
-          response = await axiosInstance.post('/ai/optimize-title', {
-            title: data.title,
-            description: data.description,
-            category: data.category
-          });
-          setSuggestions(prev => ({ ...prev, [featureId]: { titles: response.data.titles } }));
-          toast.success('Title suggestions generated!');
-          break;
+      const response = await axiosInstance.post(FEATURE_ENDPOINTS[featureId], requestBody());
+      setSuggestions(prev => ({ ...prev, [featureId]: toSuggestion(featureId, response.data) }));
+      toast.success(FEATURE_MESSAGES[featureId]);
+    } catch (error) {
+      console.error(`Error optimizing ${featureId}:`, error);
+      showError(featureId, error.response?.status, error.response?.data?.detail, error.response?.headers?.['retry-after']);
+    } finally {
+      setIsOptimizing(prev => ({ ...prev, [featureId]: false }));
+    }
+  };
 
-        case "description":
-          response = await axiosInstance.post('/ai/enhance-description', {
-            title: data.title,
-            description: data.description,
-            category: data.category,
-            goal_amount: parseFloat(data.goal_amount)
-          });
-          setSuggestions(prev => ({ 
-            ...prev, 
-            [featureId]: { improved_description: response.data.enhanced_description } 
-          }));
-          toast.success('Description enhanced!');
-          break;
+  // One request for every feature; sections arrive as NDJSON lines as soon as each is ready
+  const optimizeAll = async () => {
+    if (!validateData()) return;
 
-        case "success_prediction":
-          const validTiers = (data.reward_tiers || []).filter(tier => tier.amount && tier.description);
-          response = await axiosInstance.post('/ai/success-prediction', {
-            title: data.title,
-            description: data.description,
-            category: data.category,
-            goal_amount: parseFloat(data.goal_amount),
-            reward_tiers: validTiers.map(tier => ({ 
-              amount: parseFloat(tier.amount), 
-              description: tier.description 
-            }))
-          });
-          
-          setSuggestions(prev => ({ 
-            ...prev, 
-            [featureId]: {
-              probability: response.data.success_percentage / 100,
-              explanation: response.data.analysis,
-              recommendations: response.data.recommendations || []
-            }
-          }));
-          toast.success('Success prediction generated!');
-          break;
+    const featureIds = Object.keys(FEATURE_ENDPOINTS);
+    const pending = new Set(featureIds);
+    setIsOptimizing(prev => ({ ...prev, all: true, ...Object.fromEntries(featureIds.map(id => [id, true])) }));
 
-        case "marketing_strategy":
-          response = await axiosInstance.post('/ai/marketing-strategy', {
-            title: data.title,
-            description: data.description,
-            category: data.category,
-            goal_amount: parseFloat(data.goal_amount)
-          });
-          
-          let strategyText = response.data.overview || '';
-          if (response.data.channels) {
-            strategyText += '\n\nMarketing Channels:\n';
-            response.data.channels.forEach(channel => {
-              strategyText += `\n• ${channel.name} (${channel.priority} priority)\n  ${channel.strategy}`;
-            });
-          }
-          
-          setSuggestions(prev => ({ 
-            ...prev, 
-            [featureId]: { strategy: strategyText } 
-          }));
-          toast.success('Marketing strategy generated!');
-          break;
+    const finish = (featureId) => {
+      pending.delete(featureId);
+      setIsOptimizing(prev => ({ ...prev, [featureId]: false }));
+    };
 
-        default:
-          break;
+    try {
+      const sessionToken = localStorage.getItem('session_token');
+      const response = await fetch(`${axiosInstance.defaults.baseURL}/ai/optimize-all`, {
+        method: 'POST',
+        credentials: 'include',
+        headers: {
+          'Content-Type': 'application/json',
+          ...(sessionToken ? { Authorization: `Bearer ${sessionToken}` } : {})
+        },
+        body: JSON.stringify({ ...requestBody(), sections: featureIds })
+      });
+
+      if (!response.ok) {
+        const body = await response.json().catch(() => ({}));
+        showError('all sections', response.status, body.detail, response.headers.get('retry-after'));
+        return;
+      }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffered = '';
+      let completed = 0;
+
+      const handleLine = (line) => {
+        if (!line.trim()) return;
+        const message = JSON.parse(line);
+        if (!message.section) {
+          if (message.status === 'error') showError('all sections', 429, message.error);
+          return;
+        }
+        if (message.status === 'ok') {
+          setSuggestions(prev => ({ ...prev, [message.section]: toSuggestion(message.section, message.data) }));
+          completed += 1;
+        } else {
+          toast.error(`Failed to optimize ${message.section}`);
+        }
+        finish(message.section);
+      };
+
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffered += decoder.decode(value, { stream: true });
+        const lines = buffered.split('\n');
+        buffered = lines.pop();
+        lines.forEach(handleLine);
       }
+      handleLine(buffered);
 
+      if (completed > 0) {
+        toast.success(`${completed} of ${featureIds.length} optimizations generated!`);
+      }
     } catch (error) {
-      console.error(`Error optimizing ${featureId}:`, error);
-      toast.error(`Failed to optimize ${featureId}`);
+      console.error('Error optimizing all sections:', error);
+      toast.error('Failed to optimize campaign');
     } finally {
-      setIsOptimizing(prev => ({ ...prev, [featureId]: false }));
+      setIsOptimizing(prev => ({
+        ...prev,
+        all: false,
+        ...Object.fromEntries([...pending].map(id => [id, false]))
+      }));
     }
   };
 
@@ -183,6 +249,20 @@ export default function AIOptimizer({ data, onChange }) {
           </p>
         </CardHeader>
         <CardContent className="space-y-6">
+          <Button
+            onClick={optimizeAll}
+            disabled={isOptimizing.all}
+            className="w-full bg-gradient-to-r from-indigo-500 to-purple-500 hover:from-indigo-600 hover:to-purple-600 text-white"
+            data-testid="optimize-all-button"
+          >
+            {isOptimizing.all ? (
+              <RefreshCw className="w-4 h-4 mr-2 animate-spin" />
+            ) : (
+              <Sparkles className="w-4 h-4 mr-2" />
+            )}
+            {isOptimizing.all ? "Optimizing everything..." : "Optimize Everything"}
+          </Button>
+
           {optimizationFeatures.map((feature, index) => (
             <motion.div
               key={feature.id}
@@ -62,15 +62,20 @@ const CampaignDetailPage = () => {
 
   const fetchCampaignDetails = async () => {
     try {
-      const [campaignResp, analysisResp, commentsResp] = await Promise.all([
-        axiosInstance.get(`/campaigns/${id}`),
-        axiosInstance.get(`/campaigns/${id}/analysis`),
-        axiosInstance.get(`/campaigns/${id}/comments`)
-      ]);
-      
-      setCampaign(campaignResp.data);
-      setAnalysis(analysisResp.data);
-      setComments(commentsResp.data);
+      // Single aggregate request instead of three parallel round trips
+      const response = await axiosInstance.get(`/campaigns/${id}/page`);
+
+      setCampaign(response.data.campaign);
+      setComments(response.data.comments);
+
+      if (response.data.analysis) {
+        setAnalysis(response.data.analysis);
+      } else {
+        // No cached analysis yet - generate it without blocking the page
+        axiosInstance.get(`/campaigns/${id}/analysis`)
+          .then((analysisResp) => setAnalysis(analysisResp.data))
+          .catch(() => {});
+      }
     } catch (error) {
       toast.error('Failed to load campaign');
       navigate('/discover');
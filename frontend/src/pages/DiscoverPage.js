@@ -10,7 +10,7 @@ import { toast } from 'sonner';
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 
-const CampaignCard = ({ campaign, analysis }) => {
+const CampaignCard = ({ campaign }) => {
   const navigate = useNavigate();
   const fundingPercentage = (campaign.raised_amount / campaign.goal_amount) * 100;
 
@@ -26,10 +26,10 @@ const CampaignCard = ({ campaign, analysis }) => {
           alt={campaign.title}
           className="w-full h-56 object-cover"
         />
-        {analysis && analysis.success_probability >= 70 && (
+        {campaign.success_probability >= 70 && (
           <div className="ai-success-badge" data-testid="ai-success-badge">
             <Sparkles className="w-3 h-3" />
-            {Math.round(analysis.success_probability)}% Success
+            {Math.round(campaign.success_probability)}% Success
           </div>
         )}
         <div className="campaign-category">{campaign.category}</div>
@@ -75,7 +75,6 @@ const CampaignCard = ({ campaign, analysis }) => {
 
 const DiscoverPage = () => {
   const [campaigns, setCampaigns] = useState([]);
-  const [analyses, setAnalyses] = useState({});
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState('');
   const [selectedCategory, setSelectedCategory] = useState('all');
@@ -86,20 +85,9 @@ const DiscoverPage = () => {
 
   const fetchCampaigns = async () => {
     try {
+      // Listings carry success_probability from the backend model, so badges need no extra requests
       const response = await axiosInstance.get(`/campaigns`);
       setCampaigns(response.data);
-      
-      // Fetch AI analyses for each campaign
-      const analysesData = {};
-      for (const campaign of response.data) {
-        try {
-          const analysisResp = await axiosInstance.get(`/campaigns/${campaign.id}/analysis`);
-          analysesData[campaign.id] = analysisResp.data;
-        } catch (err) {
-          console.error(`Failed to fetch analysis for ${campaign.id}`);
-        }
-      }
-      setAnalyses(analysesData);
     } catch (error) {
       toast.error('Failed to load campaigns');
     } finally {
@@ -164,7 +152,6 @@ const DiscoverPage = () => {
               <CampaignCard 
                 key={campaign.id} 
                 campaign={campaign} 
-                analysis={analyses[campaign.id]}
               />
             ))}
           </div>
@@ -77,8 +77,10 @@ const HomePage = () => {
 
   const fetchCampaigns = async () => {
     try {
-      const response = await axios.get(`${API}/campaigns`);
-      setCampaigns(response.data.slice(0, 6)); // Show first 6 campaigns
+      // Small precomputed feed instead of the full campaign list
+      const response = await axios.get(`${API}/feed/home`);
+      const { trending, newest } = response.data;
+      setCampaigns(trending.length > 0 ? trending : newest);
     } catch (error) {
       console.error('Failed to fetch campaigns');
     } finally {
@@ -0,0 +1,17 @@
+"""
+Backend modules import each other by bare name (server.py runs from backend/),
+and core.py builds its Supabase, Gemini and Stripe clients at import, so the
+offline fakes from backend/benchmarks are installed before any test imports it.
+"""
+import os
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent / "backend"
+sys.path[:0] = [str(BACKEND), str(BACKEND / "benchmarks")]
+os.environ.setdefault("SUPABASE_URL", "http://fake-supabase.local")
+os.environ.setdefault("SUPABASE_KEY", "fake.fake.fake")
+
+from fakes import FakeConfig, install  # noqa: E402
+
+install(FakeConfig(db_latency_ms=0, gemini_latency_ms=0, stripe_latency_ms=0))
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+import campaign_scores
+from campaign_scores import LISTING_SORTS, listing_order, score_campaigns
+
+
+def test_no_sort_keeps_the_default_order():
+    assert listing_order(None) == (None, False, {})
+    assert listing_order("") == (None, False, {})
+
+
+@pytest.mark.parametrize("sort", ["newest", "funded", "momentum"])
+def test_sorts_map_to_their_indexed_column(sort):
+    assert listing_order(sort) == (*LISTING_SORTS[sort], {})
+
+
+def test_ending_sorts_ascending_and_skips_campaigns_already_over():
+    before = datetime.now(timezone.utc)
+    order_by, desc, filters = listing_order("ending")
+    assert (order_by, desc) == ("ends_at", False)
+    cutoff = datetime.fromisoformat(filters["ends_at"]["$gte"])
+    assert before <= cutoff <= datetime.now(timezone.utc)
+
+
+def test_success_falls_back_to_momentum_without_the_model(monkeypatch):
+    monkeypatch.setattr(campaign_scores, "success_model", None)
+    assert listing_order("success") == (*LISTING_SORTS["momentum"], {})
+    monkeypatch.setattr(campaign_scores, "success_model", object())
+    assert listing_order("success") == (*LISTING_SORTS["success"], {})
+
+
+def test_unknown_sort_is_a_400():
+    with pytest.raises(HTTPException) as refused:
+        listing_order("random")
+    assert refused.value.status_code == 400
+
+
+def test_scores_are_relative_to_the_category_and_ends_at_follows_duration():
+    now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    started = (now - timedelta(days=10)).isoformat()
+    campaigns = [
+        {"id": "fast", "category": "Tech", "goal_amount": 1000, "raised_amount": 600, "backers_count": 40,
+         "duration_days": 30, "created_at": started},
+        {"id": "slow", "category": "Tech", "goal_amount": 1000, "raised_amount": 100, "backers_count": 4,
+         "duration_days": 30, "created_at": started},
+        {"id": "alone", "category": "Art", "goal_amount": 500, "raised_amount": 50, "backers_count": 2,
+         "duration_days": 20, "created_at": started},
+    ]
+    rows = {row["id"]: row for row in score_campaigns(campaigns, now)}
+
+    assert rows["fast"]["funded_ratio"] == 0.6
+    assert rows["fast"]["momentum_score"] > 1 > rows["slow"]["momentum_score"]
+    assert rows["alone"]["momentum_score"] == pytest.approx(1.0)  # typical for its own category
+    assert rows["alone"]["ends_at"] == (now + timedelta(days=10)).isoformat()
+    assert "success_score" not in rows["fast"]
+    assert score_campaigns([], now) == []
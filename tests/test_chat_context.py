@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+
+import chat_context
+from chat_context import ChatContextStore
+
+START = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def row(n, seconds=None):
+    created_at = START + timedelta(seconds=n if seconds is None else seconds)
+    return {"id": f"m{n}", "message": f"q{n}", "response": f"a{n}", "created_at": created_at.isoformat()}
+
+
+def test_unknown_and_idle_sessions_must_be_loaded(monkeypatch):
+    store = ChatContextStore(ttl_seconds=60)
+    assert store.get("s") is None
+    assert store.load("s", [row(1)]) == ("", [("q1", "a1")])
+    assert store.get("s") == ("", [("q1", "a1")])
+
+    now = chat_context.time.monotonic()
+    monkeypatch.setattr(chat_context.time, "monotonic", lambda: now + 61)
+    assert store.get("s") is None
+
+
+def test_sync_since_starts_the_overlap_before_the_newest_row_seen():
+    store = ChatContextStore(sync_overlap_seconds=5)
+    store.load("s", [row(1), row(3)])
+    assert store.sync_since("s") == (START + timedelta(seconds=3 - 5)).isoformat()
+
+    store.append("s", "q9", "a9", "m9", (START + timedelta(seconds=9)).isoformat())
+    assert store.sync_since("s") == (START + timedelta(seconds=4)).isoformat()
+    assert store.sync_since("other") is None
+
+
+def test_merge_adds_only_turns_this_worker_has_not_seen():
+    store = ChatContextStore()
+    store.load("s", [row(1)])
+    store.append("s", "q2", "a2", "m2", row(2)["created_at"])
+
+    # Another worker answered m3; m2 (ours) and m1 come back inside the overlap
+    _, turns = store.merge("s", [row(1), row(2), row(3)])
+    assert turns == [("q1", "a1"), ("q2", "a2"), ("q3", "a3")]
+
+    # A row flushed late with an earlier created_at is still picked up once
+    _, turns = store.merge("s", [row(4, seconds=2.5), row(3)])
+    assert turns[-1] == ("q4", "a4") and len(turns) == 4
+
+
+def test_compaction_replaces_the_oldest_turns_with_the_summary():
+    store = ChatContextStore(token_budget=10, keep_recent_turns=1)
+    for n in range(3):
+        needs_compaction = store.append("s", "question " * 10, f"answer {n}", f"m{n}")
+    assert needs_compaction
+
+    summary, oldest = store.begin_compaction("s")
+    assert summary == "" and len(oldest) == 2
+    assert store.begin_compaction("s") is None  # already claimed
+
+    store.append("s", "late", "turn", "m3")
+    store.finish_compaction("s", oldest, "summary so far")
+    summary, turns = store.get("s")
+    assert summary == "summary so far"
+    assert [response for _, response in turns] == ["answer 2", "turn"]
+
+    # Compacted turns are not merged back from the database
+    _, turns = store.merge("s", [{"id": "m0", "message": "question", "response": "answer 0"}])
+    assert len(turns) == 2
+
+
+def test_least_recently_used_sessions_are_evicted():
+    store = ChatContextStore(max_sessions=2)
+    store.load("a", [])
+    store.load("b", [])
+    store.get("a")
+    store.load("c", [])
+    assert store.get("b") is None
+    assert store.get("a") is not None and len(store) == 2
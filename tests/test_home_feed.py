@@ -0,0 +1,97 @@
+import hashlib
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import home_feed
+from home_feed import HomeFeed
+
+
+def campaign(campaign_id, **fields):
+    row = {"id": campaign_id, "title": f"Campaign {campaign_id}", "category": "Tech", "goal_amount": 1000,
+           "raised_amount": 0, "backers_count": 0, "status": "active",
+           "created_at": "2026-01-01T00:00:00+00:00", "description": "x" * 500}
+    row.update(fields)
+    return row
+
+
+@pytest.fixture
+def feed():
+    feed = HomeFeed(section_size=2, velocity_window_hours=1)
+    feed.rebuild([campaign("a"), campaign("b", raised_amount=800), campaign("c", category="Art")])
+    return feed
+
+
+def test_render_reuses_the_cached_body_until_something_changes(feed, monkeypatch):
+    body, etag = feed.render()
+    builds = []
+    build = feed._build_locked
+    monkeypatch.setattr(feed, "_build_locked", lambda now: builds.append(now) or build(now))
+
+    assert feed.render() == (body, etag)
+    assert builds == []
+
+    feed.upsert_campaign(campaign("d"))
+    new_body, new_etag = feed.render()
+    assert len(builds) == 1
+    assert new_etag != etag
+    assert json.loads(new_body)["total_active"] == 4
+
+
+def test_etag_is_a_weak_hash_of_the_body(feed):
+    body, etag = feed.render()
+    assert etag == 'W/"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def test_feed_route_answers_if_none_match_with_weak_comparison(feed, monkeypatch):
+    from routers import campaigns
+    monkeypatch.setattr(campaigns, "home_feed", feed)
+    app = FastAPI()
+    app.include_router(campaigns.router)
+    client = TestClient(app)
+
+    response = client.get("/api/feed/home")
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert client.get("/api/feed/home", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/feed/home", headers={"If-None-Match": f'"other", {etag[2:]}'}).status_code == 304
+    assert client.get("/api/feed/home", headers={"If-None-Match": "*"}).status_code == 304
+    assert client.get("/api/feed/home", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_cards_carry_only_card_fields_and_a_description_preview(feed):
+    feed.upsert_campaign(campaign("d", secret="internal", created_at="2026-02-01T00:00:00+00:00"))
+    newest = json.loads(feed.render()[0])["newest"]
+    card = next(card for card in newest if card["id"] == "d")
+    assert set(card) == set(home_feed.CARD_FIELDS) | {"description"}
+    assert len(card["description"]) == home_feed.DESCRIPTION_PREVIEW_CHARS
+
+
+def test_inactive_campaigns_leave_the_feed(feed):
+    feed.upsert_campaign(campaign("a", status="completed"))
+    feed.remove_campaign("b")
+    assert json.loads(feed.render()[0])["total_active"] == 1
+
+
+def test_pledges_drive_trending_and_expire_after_the_window(feed, monkeypatch):
+    now = time.time()
+    feed.record_pledge("c", 50, at=now)
+    feed.record_pledge("a", 10, at=now - 1800)
+    trending = json.loads(feed.render()[0])["trending"]
+    assert [card["id"] for card in trending] == ["c", "a"]
+    assert trending[0]["pledge_velocity"] == 50
+    assert trending[0]["raised_amount"] == 50 and trending[0]["backers_count"] == 1
+
+    monkeypatch.setattr(home_feed.time, "time", lambda: now + 3601)
+    trending = json.loads(feed.render()[0])["trending"]
+    assert all(card["pledge_velocity"] == 0 for card in trending)
+
+
+def test_nearly_funded_lists_campaigns_close_to_their_goal(feed):
+    feed.upsert_campaign(campaign("done", raised_amount=1000))
+    sections = json.loads(feed.render()[0])
+    assert [card["id"] for card in sections["nearly_funded"]] == ["b"]
+    assert set(sections["categories"]) == {"Art", "Tech"}
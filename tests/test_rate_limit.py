@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import rate_limit
+from rate_limit import InMemoryRateLimitBackend, QuotaLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return clock
+
+
+def take(backend, key, capacity=3, rate=1.0, cost=1.0):
+    return asyncio.run(backend.take(key, capacity, rate, cost))
+
+
+def test_bucket_allows_a_burst_then_reports_the_wait(clock):
+    backend = InMemoryRateLimitBackend()
+    assert [take(backend, "k") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert take(backend, "k") == pytest.approx(1.0)
+    assert take(backend, "k", cost=2) == pytest.approx(2.0)
+
+
+def test_bucket_refills_at_its_rate_up_to_capacity(clock):
+    backend = InMemoryRateLimitBackend()
+    for _ in range(3):
+        take(backend, "k")
+    clock.now += 0.5
+    assert take(backend, "k") == pytest.approx(0.5)
+    clock.now += 0.5
+    assert take(backend, "k") == 0.0
+
+    clock.now += 100
+    assert [take(backend, "k") for _ in range(4)][-1] > 0  # refill stops at capacity
+
+
+def test_bucket_with_no_rate_never_refills(clock):
+    backend = InMemoryRateLimitBackend()
+    take(backend, "k", capacity=1, rate=0)
+    clock.now += 1e6
+    assert take(backend, "k", capacity=1, rate=0) == float("inf")
+
+
+def test_least_recently_used_keys_are_forgotten_as_full_buckets(clock):
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    take(backend, "a", capacity=1)
+    take(backend, "b", capacity=1)
+    take(backend, "a", capacity=1)  # refused, but marks "a" as recently used
+    take(backend, "c", capacity=1)  # evicts "b"
+    assert take(backend, "b", capacity=1) == 0.0
+    assert "a" not in backend._buckets  # evicted in turn by "b"
+
+
+def limiter(**overrides):
+    options = dict(user_burst=2, user_per_minute=60, global_burst=3, global_per_minute=60, max_in_flight=1,
+                   queue_timeout=0.05)
+    options.update(overrides)
+    return QuotaLimiter("test", InMemoryRateLimitBackend(), **options)
+
+
+def test_admit_raises_429_with_retry_after_for_an_exhausted_caller(clock):
+    quota = limiter()
+
+    async def scenario():
+        await quota.admit("user:1")
+        await quota.admit("user:1")
+        with pytest.raises(HTTPException) as refused:
+            await quota.admit("user:1")
+        return refused.value
+
+    refused = asyncio.run(scenario())
+    assert refused.status_code == 429
+    assert refused.headers["Retry-After"] == "1"
+
+
+def test_global_refusal_hands_the_callers_token_back(clock):
+    quota = limiter(global_burst=1)
+
+    async def scenario():
+        await quota.admit("user:1")
+        with pytest.raises(HTTPException) as refused:
+            await quota.admit("user:2")  # global bucket empty
+        return refused.value
+
+    assert asyncio.run(scenario()).status_code == 429
+    tokens, _ = quota.backend._buckets["test:user:2"]
+    assert tokens == quota.user_burst
+
+
+def test_slot_caps_calls_in_flight_and_times_out_with_429():
+    quota = limiter()
+
+    async def scenario():
+        async with quota.slot():
+            with pytest.raises(HTTPException) as refused:
+                async with quota.slot():
+                    pass
+        async with quota.slot():  # released again
+            pass
+        return refused.value
+
+    assert asyncio.run(scenario()).status_code == 429
@@ -0,0 +1,82 @@
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+import core
+from structured_output import StructuredOutputError, extract_json, parse_structured, repair_prompt
+
+
+class Titles(BaseModel):
+    titles: List[str]
+
+
+@pytest.mark.parametrize("text", [
+    '{"titles": ["A", "B"]}',
+    '```json\n{"titles": ["A", "B"]}\n```',
+    'Here you go: {"titles": ["A", "B"]} Hope that helps!',
+    '{"titles": ["A", "B",],}',
+])
+def test_extract_json_recovers_the_object(text):
+    assert extract_json(text) == {"titles": ["A", "B"]}
+
+
+def test_extract_json_keeps_nested_values():
+    assert extract_json('prefix {"a": {"b": [1, {"c": 2}]}} suffix') == {"a": {"b": [1, {"c": 2}]}}
+
+
+def test_extract_json_without_json_raises():
+    with pytest.raises(StructuredOutputError):
+        extract_json("I cannot help with that.")
+
+
+def test_parse_structured_reports_the_invalid_fields():
+    with pytest.raises(StructuredOutputError, match="titles"):
+        parse_structured('{"titles": "not a list"}', Titles)
+
+
+def test_repair_prompt_sends_only_the_output_errors_and_schema():
+    error = StructuredOutputError("titles: Input should be a valid list")
+    prompt = repair_prompt('{"titles": "x"}', Titles, error)
+    assert "titles: Input should be a valid list" in prompt
+    assert '{"titles": "x"}' in prompt
+    assert '"required":["titles"]' in prompt
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    """Scripted core.gemini_generate: answers in order and records (endpoint, prompt)"""
+    calls = []
+    answers = []
+
+    async def generate(endpoint, prompt, user_id=None, generation_config=None):
+        calls.append((endpoint, prompt))
+        return SimpleNamespace(text=answers.pop(0))
+
+    monkeypatch.setattr(core, "gemini_generate", generate)
+    return SimpleNamespace(calls=calls, answers=answers)
+
+
+def test_valid_output_needs_no_repair(gemini):
+    gemini.answers.append('{"titles": ["A"]}')
+    result = asyncio.run(core.gemini_structured("optimize_title", "prompt", Titles))
+    assert result.titles == ["A"]
+    assert [endpoint for endpoint, _ in gemini.calls] == ["optimize_title"]
+
+
+def test_invalid_output_is_repaired_from_the_output_alone(gemini):
+    gemini.answers.extend(['{"titles": "A"}', '{"titles": ["A"]}'])
+    result = asyncio.run(core.gemini_structured("optimize_title", "original prompt", Titles))
+    assert result.titles == ["A"]
+    _, (repair_endpoint, repair) = gemini.calls
+    assert repair_endpoint == "optimize_title_repair"
+    assert "original prompt" not in repair and '{"titles": "A"}' in repair
+
+
+def test_output_still_invalid_after_the_retries_raises(gemini):
+    gemini.answers.extend(["no json"] * 3)
+    with pytest.raises(StructuredOutputError):
+        asyncio.run(core.gemini_structured("optimize_title", "prompt", Titles, retries=2))
+    assert len(gemini.calls) == 3
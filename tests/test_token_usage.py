@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from token_usage import TokenUsageLedger, summarize, usage_tokens
+
+
+def test_usage_tokens_reads_usage_metadata_or_zeros():
+    usage = SimpleNamespace(prompt_token_count=120, candidates_token_count=30, cached_content_token_count=None)
+    assert usage_tokens(SimpleNamespace(usage_metadata=usage)) == (120, 30, 0)
+    assert usage_tokens(SimpleNamespace()) == (0, 0, 0)
+
+
+def test_drain_returns_the_deltas_once_and_restore_merges_them_back():
+    ledger = TokenUsageLedger()
+    ledger.record("ai_chat", "u1", prompt_tokens=100, completion_tokens=20, latency_ms=12.7)
+    ledger.record("ai_chat", "u1", prompt_tokens=50, completion_tokens=10, error=True)
+    ledger.record("get_campaign_analysis", None, cache_hit=True)
+
+    rows = {row["endpoint"]: row for row in ledger.drain()}
+    assert rows["ai_chat"]["calls"] == 2 and rows["ai_chat"]["prompt_tokens"] == 150
+    assert rows["ai_chat"]["errors"] == 1 and rows["ai_chat"]["latency_ms"] == 12
+    assert rows["get_campaign_analysis"]["user_id"] == "" and rows["get_campaign_analysis"]["cache_hits"] == 1
+    assert ledger.drain() == []
+
+    # A failed flush puts its rows back under any calls recorded since
+    ledger.record("ai_chat", "u1", prompt_tokens=5)
+    ledger.restore([rows["ai_chat"]])
+    (row,) = ledger.drain()
+    assert row["calls"] == 3 and row["prompt_tokens"] == 155
+
+
+def test_summarize_groups_and_ranks_by_estimated_cost():
+    rows = [
+        {"day": "2026-03-01", "endpoint": "ai_chat", "user_id": "u1", "calls": 4, "cache_hits": 0,
+         "prompt_tokens": 1000, "completion_tokens": 200, "latency_ms": 400},
+        {"day": "2026-03-02", "endpoint": "ai_chat", "user_id": "u2", "calls": 2, "cache_hits": 0,
+         "prompt_tokens": 1000, "completion_tokens": 200, "latency_ms": 200},
+        {"day": "2026-03-02", "endpoint": "get_campaign_analysis", "user_id": "", "calls": 10, "cache_hits": 9,
+         "prompt_tokens": 100, "completion_tokens": 50, "latency_ms": 10},
+    ]
+    groups = summarize(rows, "endpoint", input_price_per_m=1.0, output_price_per_m=4.0)
+    assert [group["endpoint"] for group in groups] == ["ai_chat", "get_campaign_analysis"]
+    chat, analysis = groups
+    assert chat["calls"] == 6 and chat["total_tokens"] == 2400
+    assert chat["estimated_cost_usd"] == round((2000 * 1.0 + 400 * 4.0) / 1e6, 4)
+    assert chat["avg_latency_ms"] == 100.0
+    assert analysis["cache_hit_ratio"] == 0.9 and analysis["avg_prompt_tokens"] == 100.0
+
+    assert len(summarize(rows, "user_id", 1.0, 4.0, limit=1)) == 1
@@ -0,0 +1,108 @@
+import asyncio
+
+import write_behind
+from write_behind import WriteBehindBuffer
+
+
+class Recorder:
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+
+    async def __call__(self, rows):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.batches.append(list(rows))
+
+
+def rows(n, start=0):
+    return [{"n": i} for i in range(start, start + n)]
+
+
+def test_rows_are_flushed_after_the_interval_in_one_batch():
+    async def scenario():
+        writer = Recorder()
+        buffer = WriteBehindBuffer("test", writer, max_batch=100, flush_interval=0.05)
+        for row in rows(3):
+            await buffer.put(row)
+        assert writer.batches == []
+        await asyncio.sleep(0.2)
+        assert writer.batches == [rows(3)]
+        await buffer.close()
+
+    asyncio.run(scenario())
+
+
+def test_a_full_batch_is_written_without_waiting_for_the_interval():
+    async def scenario():
+        writer = Recorder()
+        buffer = WriteBehindBuffer("test", writer, max_batch=5, flush_interval=10)
+        for row in rows(5):
+            await buffer.put(row)
+        await asyncio.sleep(0.05)
+        assert writer.batches == [rows(5)]
+        await buffer.close()
+
+    asyncio.run(scenario())
+
+
+def test_close_drains_everything_queued():
+    async def scenario():
+        writer = Recorder()
+        buffer = WriteBehindBuffer("test", writer, max_batch=4, flush_interval=10)
+        for row in rows(10):
+            await buffer.put(row)
+        await buffer.close()
+        assert [row for batch in writer.batches for row in batch] == rows(10)
+        assert all(len(batch) <= 4 for batch in writer.batches)
+
+        # After close, rows are written straight through
+        await buffer.put({"n": 10})
+        assert writer.batches[-1] == [{"n": 10}]
+
+    asyncio.run(scenario())
+
+
+def test_put_waits_when_max_pending_rows_are_queued():
+    async def scenario():
+        release = asyncio.Event()
+        written = []
+
+        async def slow_writer(batch):
+            await release.wait()
+            written.extend(batch)
+
+        buffer = WriteBehindBuffer("test", slow_writer, max_batch=1, flush_interval=0, max_pending=2)
+        for row in rows(3):  # one in the writer, two queued
+            await buffer.put(row)
+        await asyncio.sleep(0)
+        blocked = asyncio.create_task(buffer.put({"n": 3}))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+
+        release.set()
+        await asyncio.wait_for(blocked, 1)
+        await buffer.close()
+        assert written == rows(4)
+
+    asyncio.run(scenario())
+
+
+def test_failed_batches_are_retried_then_dropped(monkeypatch):
+    async def no_backoff(seconds):
+        pass
+
+    async def scenario():
+        monkeypatch.setattr(write_behind.asyncio, "sleep", no_backoff)
+        flaky = Recorder(failures=2)
+        buffer = WriteBehindBuffer("test", flaky, retries=3)
+        await buffer._write(rows(2))
+        assert flaky.batches == [rows(2)]
+
+        down = Recorder(failures=3)
+        buffer = WriteBehindBuffer("test", down, retries=3)
+        await buffer._write(rows(2))
+        assert down.batches == [] and down.failures == 0
+
+    asyncio.run(scenario())